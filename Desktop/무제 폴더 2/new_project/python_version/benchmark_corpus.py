@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+🏗️ DSD Breaker 벤치마크 코퍼스 생성기
+테이블 수/행 수/span 밀도/인코딩/파일 크기를 지정하여 DART 형식의 합성 공시 HTML 생성
+"""
+
+import argparse
+import multiprocessing
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from dsd_breaker_io import peak_rss_mb
+
+# 인코딩별 meta charset 선언 (UTF-16은 BOM으로 감지)
+_META_CHARSETS = {'utf-8': 'utf-8', 'cp949': 'euc-kr', 'utf-16': None}
+
+# 재무제표 종류별 제목과 대표 계정 (주석은 일반 항목)
+_STATEMENTS = [
+    ('재무상태표', ['유동자산', '현금및현금성자산', '매출채권', '재고자산', '비유동자산', '유형자산',
+                    '무형자산', '자산총계', '유동부채', '매입채무', '단기차입금', '부채총계',
+                    '자본금', '이익잉여금', '자본총계']),
+    ('포괄손익계산서', ['매출액', '매출원가', '매출총이익', '판매비와관리비', '영업이익', '금융수익',
+                       '금융비용', '법인세비용차감전순이익', '법인세비용', '당기순이익', '주당이익']),
+    ('현금흐름표', ['영업활동현금흐름', '이자의 수취', '법인세 납부', '투자활동현금흐름',
+                   '유형자산의 취득', '재무활동현금흐름', '차입금의 상환', '현금의 증가',
+                   '기말의 현금']),
+    ('주석 - 유형자산', ['토지', '건물', '구축물', '기계장치', '차량운반구', '비품', '건설중인자산',
+                        '감가상각누계액', '정부보조금']),
+]
+
+_UNITS = ['원', '천원', '백만원']
+
+_MB = 1024 * 1024
+
+
+@dataclass
+class CorpusSpec:
+    """합성 공시 파일 사양"""
+    tables: int = 40            # 파일당 재무 테이블 수 (target_mb가 있으면 크기를 채울 때까지 반복)
+    rows: int = 30              # 테이블당 본문 행 수
+    periods: int = 2            # 당기/전기 등 금액 열 수
+    span_density: float = 0.2   # rowspan 구분 그룹/colspan 소계 행이 나올 확률
+    encoding: str = 'utf-8'     # 'utf-8', 'cp949', 'utf-16'
+    target_mb: float = 0.0      # 파일 크기 목표(MB, 0이면 테이블 수 기준)
+    layout_tables: bool = True  # 표지/서명용 배치 표 포함
+
+
+def _amount(rng):
+    """DART 금액 표기 (음수는 괄호, 0은 '-')"""
+    roll = rng.random()
+    if roll < 0.05:
+        return '-'
+    value = rng.randint(1_000, 9_999_999_999)
+    return f'({value:,})' if roll < 0.15 else f'{value:,}'
+
+
+def build_table(rng, title, accounts, spec, number):
+    """재무 테이블 하나 (제목/단위 문단 + 다단 헤더 + span 셀)"""
+    html = [f'<p>{number}. {title}</p>', f'<p>(단위 : {rng.choice(_UNITS)})</p>',
+            '<table border="1"><thead><tr><th rowspan="2">구분</th><th rowspan="2">과목</th>']
+    html.extend(f'<th>제 {54 - p} 기</th>' for p in range(spec.periods))
+    html.append('</tr><tr>')
+    html.extend('<th>금액</th>' for _ in range(spec.periods))
+    html.append('</tr></thead><tbody>')
+
+    group = 0
+    remaining = 0
+    for i in range(spec.rows):
+        html.append('<tr>')
+        if remaining == 0:
+            if rng.random() < spec.span_density / 2:
+                # 구분+과목 두 칸을 합친 소계 행
+                html.append(f'<td colspan="2">소계{i + 1}</td>')
+                html.extend(f'<td>{_amount(rng)}</td>' for _ in range(spec.periods))
+                html.append('</tr>')
+                continue
+            group += 1
+            remaining = 1
+            if rng.random() < spec.span_density:
+                remaining = min(rng.randint(2, 6), spec.rows - i)
+            span = f' rowspan="{remaining}"' if remaining > 1 else ''
+            html.append(f'<td{span}>구분{group}</td>')
+        remaining -= 1
+
+        indent = '&nbsp;' * (2 * rng.randint(0, 2))
+        html.append(f'<td>{indent}{accounts[i % len(accounts)]}{i // len(accounts) or ""}</td>')
+        html.extend(f'<td>{_amount(rng)}</td>' for _ in range(spec.periods))
+        html.append('</tr>')
+
+    html.append('</tbody></table>\n')
+    return ''.join(html)
+
+
+def build_layout_table(company):
+    """표지/서명 블록 배치 표"""
+    return (f'<table><tr><td>회사명</td><td>{company}</td></tr>'
+            f'<tr><td>대표이사</td><td>홍길동</td></tr>'
+            f'<tr><td>본점소재지</td><td>서울특별시</td></tr></table>\n')
+
+
+def generate_filing(path, spec=None, seed=0):
+    """합성 공시 파일 하나를 조각 단위로 기록하고 파일 크기(바이트) 반환
+
+    수백 MB 파일도 문서 전체를 메모리에 만들지 않는다.
+    """
+    spec = spec or CorpusSpec()
+    rng = random.Random(seed)
+    company = f'테스트{seed}주식회사'
+    charset = _META_CHARSETS[spec.encoding]
+    # UTF-16은 BOM 한 번 후 리틀 엔디언으로 기록
+    codec = 'utf-16-le' if spec.encoding == 'utf-16' else spec.encoding
+
+    with open(path, 'wb') as out:
+        if spec.encoding == 'utf-16':
+            out.write(b'\xff\xfe')
+
+        def write(text):
+            out.write(text.encode(codec))
+
+        meta = f'<meta charset="{charset}">' if charset else ''
+        write(f'<html><head>{meta}<title>{company} 감사보고서</title></head><body>\n')
+        if spec.layout_tables:
+            write(build_layout_table(company))
+
+        number = 0
+        target_bytes = spec.target_mb * _MB
+        while number < spec.tables or out.tell() < target_bytes:
+            title, accounts = _STATEMENTS[number % len(_STATEMENTS)]
+            number += 1
+            write(build_table(rng, title, accounts, spec, number))
+
+        if spec.layout_tables:
+            write('<table><tr><td>2024년 3월 15일</td></tr>'
+                  '<tr><td>테스트회계법인 대표이사 김감사</td></tr></table>\n')
+        write('</body></html>\n')
+        return out.tell()
+
+
+def generate_corpus(directory, files=10, spec=None, seed=0):
+    """합성 공시 파일 여러 개 생성 (파일마다 다른 시드)"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(files):
+        path = directory / f'filing_{seed + i:04d}.html'
+        generate_filing(path, spec, seed + i)
+        paths.append(str(path))
+    return paths
+
+
+def _run_and_measure(func, args):
+    """자식 프로세스에서 실행 후 최대 메모리 반환"""
+    func(*args)
+    return peak_rss_mb()
+
+
+def measure_peak_rss(func, *args):
+    """func(*args)를 새 프로세스에서 실행하여 최대 메모리(MB) 측정 (func는 최상위 함수)"""
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(_run_and_measure, (func, args))
+
+
+def main():
+    """명령줄에서 코퍼스 생성"""
+    parser = argparse.ArgumentParser(description="DSD Breaker 벤치마크 코퍼스 생성기")
+    parser.add_argument('directory', help="출력 폴더")
+    parser.add_argument('--files', type=int, default=10, help="파일 수 (기본 10)")
+    parser.add_argument('--tables', type=int, default=40, help="파일당 테이블 수 (기본 40)")
+    parser.add_argument('--rows', type=int, default=30, help="테이블당 행 수 (기본 30)")
+    parser.add_argument('--periods', type=int, default=2, help="금액 열 수 (기본 2)")
+    parser.add_argument('--span-density', type=float, default=0.2,
+                        help="rowspan/colspan 행 비율 0~1 (기본 0.2)")
+    parser.add_argument('--encoding', choices=sorted(_META_CHARSETS), default='utf-8',
+                        help="파일 인코딩 (기본 utf-8)")
+    parser.add_argument('--size-mb', type=float, default=0.0,
+                        help="파일당 목표 크기(MB), 테이블 수보다 우선")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드 (기본 0)")
+    args = parser.parse_args()
+
+    spec = CorpusSpec(tables=args.tables, rows=args.rows, periods=args.periods,
+                      span_density=args.span_density, encoding=args.encoding,
+                      target_mb=args.size_mb)
+
+    start = time.perf_counter()
+    paths = generate_corpus(args.directory, args.files, spec, args.seed)
+    total = sum(Path(path).stat().st_size for path in paths)
+    print(f"🏗️ {len(paths)}개 파일, {total / _MB:,.1f}MB 생성 ({time.perf_counter() - start:.1f}초)"
+          f" → {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+⏱️ DSD Breaker 테이블 추출 벤치마크
+기존 BeautifulSoup + pd.read_html 경로와 lxml 단일 파싱 엔진 비교
+"""
+
+import argparse
+import re
+import time
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from dsd_breaker_extractor import extract_tables
+from test_html_converter import create_sample_dart_html
+
+
+def build_report(table_count):
+    """샘플 감사보고서의 테이블을 반복하여 대용량 보고서 생성"""
+    html = create_sample_dart_html()
+    body_start = html.index('<body>') + len('<body>')
+    body_end = html.index('</body>')
+    body = html[body_start:body_end]
+
+    sample_tables = len(re.findall(r'<table', body))
+    repeat = max(1, -(-table_count // sample_tables))
+
+    return html[:body_start] + body * repeat + html[body_end:]
+
+
+def legacy_extract_tables(html_content):
+    """기존 방식: BeautifulSoup 파싱 후 테이블마다 pd.read_html로 재파싱"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    extracted_tables = []
+
+    for table in soup.find_all('table'):
+        try:
+            df_list = pd.read_html(StringIO(str(table)))
+            if df_list:
+                df = legacy_convert_numbers(legacy_clean_dataframe(df_list[0]))
+                if len(df) > 0 and len(df.columns) > 0:
+                    extracted_tables.append(df)
+        except Exception:
+            try:
+                df = parse_table_manually_bs4(table)
+                if df is not None and len(df) > 0:
+                    extracted_tables.append(df)
+            except Exception:
+                continue
+
+    return extracted_tables
+
+
+def _is_legacy_text_column(series):
+    """기존 코드의 object 열 판별 (pandas 3의 str 열도 포함해야 기존과 같은 열을 처리)"""
+    return series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+
+
+def legacy_clean_dataframe(df):
+    """기존 clean_dataframe 고정 사본 (엔진 쪽 최적화가 기준선에 섞이지 않도록)"""
+    # 문자열 컬럼의 공백 제거
+    for col in [c for c in df.columns if _is_legacy_text_column(df[c])]:
+        df[col] = df[col].astype(str).str.strip()
+        # 'nan' 문자열을 실제 NaN으로 변환
+        df[col] = df[col].replace('nan', np.nan)
+
+    return df
+
+
+def legacy_convert_numbers(df):
+    """기존 convert_numbers 고정 사본"""
+    for col in df.columns:
+        if _is_legacy_text_column(df[col]):
+            try:
+                # 콤마 제거 후 숫자 변환 시도
+                cleaned_series = df[col].astype(str).str.replace(',', '').str.replace(r'\s+', '', regex=True)
+                numeric_series = pd.to_numeric(cleaned_series, errors='coerce')
+
+                # 50% 이상이 숫자로 변환 가능하면 적용
+                if numeric_series.notna().sum() / len(df) > 0.5:
+                    df[col] = numeric_series
+
+            except Exception:
+                continue
+
+    return df
+
+
+def parse_table_manually_bs4(table):
+    """기존 BeautifulSoup 기반 수동 파싱"""
+    data = []
+    for row in table.find_all('tr'):
+        row_data = [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
+        if row_data:
+            data.append(row_data)
+
+    if not data:
+        return None
+
+    max_cols = max(len(row) for row in data)
+    for row in data:
+        row.extend([''] * (max_cols - len(row)))
+
+    return pd.DataFrame(data[1:], columns=data[0] if len(data) > 1 else None)
+
+
+def measure(func, html_content, repeat):
+    """최소 실행 시간(초)과 결과 반환"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(html_content)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description="DSD Breaker 테이블 추출 벤치마크")
+    parser.add_argument('--tables', type=int, default=300, help="보고서 테이블 수 (기본 300)")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 측정 횟수 (기본 3)")
+    args = parser.parse_args()
+
+    html_content = build_report(args.tables)
+
+    print("⏱️ DSD Breaker 테이블 추출 벤치마크")
+    print("=" * 60)
+    print(f"📄 HTML 크기: {len(html_content):,} 문자")
+
+    legacy_time, legacy_tables = measure(legacy_extract_tables, html_content, args.repeat)
+    engine_time, engine_tables = measure(extract_tables, html_content, args.repeat)
+
+    print(f"  기존 (BeautifulSoup + read_html): {legacy_time:8.3f}초  테이블 {len(legacy_tables)}개")
+    print(f"  lxml 단일 파싱 엔진:              {engine_time:8.3f}초  테이블 {len(engine_tables)}개")
+    print(f"🚀 속도 향상: {legacy_time / engine_time:.1f}배")
+
+
+if __name__ == "__main__":
+    main()
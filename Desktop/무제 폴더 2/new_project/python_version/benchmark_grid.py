@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+⏱️ DSD Breaker 테이블 격자 벤치마크
+rowspan/colspan이 많은 합성 테이블에서 pd.read_html과 격자 엔진 비교
+"""
+
+import argparse
+import time
+from io import StringIO
+
+import pandas as pd
+
+from dsd_breaker_extractor import extract_tables, parse_html
+from dsd_breaker_grid import build_grid
+
+
+def build_span_table(groups, items_per_group, periods=3):
+    """다단 헤더 + 구분 열 rowspan + 합계 행 colspan이 있는 합성 재무 테이블"""
+    html = ['<table border="1">', '<thead>',
+            '<tr><th rowspan="2">구분</th><th rowspan="2">과목</th>']
+    html.extend(f'<th colspan="2">제 {50 - p} 기</th>' for p in range(periods))
+    html.append('</tr><tr>')
+    html.extend('<th>금액</th><th>비율</th>' for _ in range(periods))
+    html.append('</tr></thead><tbody>')
+
+    for g in range(groups):
+        for i in range(items_per_group):
+            html.append('<tr>')
+            if i == 0:
+                html.append(f'<td rowspan="{items_per_group}">구분{g + 1}</td>')
+            indent = '&nbsp;' * (2 * (i % 3))
+            html.append(f'<td>{indent}과목{g + 1}-{i + 1}</td>')
+            for p in range(periods):
+                amount = (g + 1) * 1_000_000 + i * 1_000 + p
+                html.append(f'<td>{amount:,}</td><td>{i % 100}%</td>')
+            html.append('</tr>')
+        # 합계 행: 구분+과목 두 칸을 합친 셀
+        html.append(f'<tr><td colspan="2">구분{g + 1} 합계</td>')
+        html.extend('<td>(1,234)</td><td>-</td>' for _ in range(periods))
+        html.append('</tr>')
+
+    html.append('</tbody></table>')
+    return ''.join(html)
+
+
+def build_document(table_count, groups, items_per_group):
+    """span이 많은 테이블 여러 개로 된 HTML 문서"""
+    body = '\n'.join(f'<p>(단위 : 천원)</p>{build_span_table(groups, items_per_group)}'
+                     for _ in range(table_count))
+    return f'<html><head><meta charset="utf-8"></head><body>{body}</body></html>'
+
+
+def read_html_tables(html_content):
+    """기존 방식: pd.read_html로 문서 전체 테이블 파싱"""
+    return pd.read_html(StringIO(html_content), thousands=',')
+
+
+def grid_only(html_content):
+    """격자 구성만 측정 (DataFrame 변환 제외)"""
+    document = parse_html(html_content)
+    return [build_grid(table) for table in document.iter('table')]
+
+
+def measure(func, html_content, repeat):
+    """최소 실행 시간(초)과 결과 반환"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(html_content)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description="DSD Breaker 테이블 격자 벤치마크")
+    parser.add_argument('--tables', type=int, default=50, help="테이블 수 (기본 50)")
+    parser.add_argument('--groups', type=int, default=20, help="테이블당 구분(rowspan 그룹) 수 (기본 20)")
+    parser.add_argument('--items', type=int, default=10, help="구분당 과목 수 (기본 10)")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 측정 횟수 (기본 3)")
+    args = parser.parse_args()
+
+    html_content = build_document(args.tables, args.groups, args.items)
+
+    print("⏱️ DSD Breaker 테이블 격자 벤치마크")
+    print("=" * 60)
+    print(f"📄 HTML 크기: {len(html_content):,} 문자, 테이블 {args.tables}개 "
+          f"({args.groups * (args.items + 1) + 2}행 x 8열)")
+
+    read_html_time, read_html_result = measure(read_html_tables, html_content, args.repeat)
+    grid_time, grids = measure(grid_only, html_content, args.repeat)
+    engine_time, engine_tables = measure(extract_tables, html_content, args.repeat)
+
+    cells = sum(len(grid.rows) * grid.width for grid in grids)
+    print(f"  pd.read_html:                  {read_html_time:8.3f}초  테이블 {len(read_html_result)}개")
+    print(f"  격자 구성 (파싱 포함):           {grid_time:8.3f}초  셀 {cells:,}개")
+    print(f"  격자 엔진 + 숫자 정규화 전체:    {engine_time:8.3f}초  테이블 {len(engine_tables)}개")
+    print(f"🚀 속도 향상 (read_html 대비): {read_html_time / engine_time:.1f}배")
+
+    sample = engine_tables[0]
+    print(f"🧮 헤더 깊이 {sample.attrs['header_depth']}, 컬럼: {list(sample.columns)}")
+
+
+if __name__ == "__main__":
+    main()
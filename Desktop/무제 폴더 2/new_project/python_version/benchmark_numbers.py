@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+⏱️ DSD Breaker 숫자 정규화 벤치마크
+기존 다중 패스 convert_numbers와 컬럼당 1회 패스 정규화 비교
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from dsd_breaker_numbers import normalize_numbers
+
+
+def build_table(rows, columns, seed=0):
+    """DART 표기(콤마, 괄호 음수, △, '-')가 섞인 대용량 문자열 테이블 생성"""
+    rng = np.random.default_rng(seed)
+    data = {'계정과목': [f"계정{i % 500}" for i in range(rows)]}
+
+    for c in range(columns):
+        values = rng.integers(-10**9, 10**9, rows)
+        cells = []
+        for i, value in enumerate(values):
+            if i % 11 == 0:
+                cells.append('-')
+            elif i % 13 == 0:
+                cells.append('')
+            elif value < 0:
+                cells.append(f"({-value:,})" if i % 2 else f"△{-value:,}")
+            else:
+                cells.append(f"{value:,}")
+        data[f"금액{c + 1}"] = cells
+
+    return pd.DataFrame(data, dtype=object)
+
+
+def legacy_convert_numbers(df):
+    """기존 방식: 컬럼마다 astype/replace/replace/to_numeric 다중 패스"""
+    for col in df.columns:
+        if df[col].dtype == 'object':
+            cleaned_series = df[col].astype(str).str.replace(',', '').str.replace(r'\s+', '', regex=True)
+            numeric_series = pd.to_numeric(cleaned_series, errors='coerce')
+            if numeric_series.notna().sum() / len(df) > 0.5:
+                df[col] = numeric_series
+    return df
+
+
+def measure(func, df, repeat):
+    """최소 실행 시간(초)과 결과 반환"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        table = df.copy()
+        start = time.perf_counter()
+        result = func(table)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description="DSD Breaker 숫자 정규화 벤치마크")
+    parser.add_argument('--rows', type=int, default=200_000, help="행 수 (기본 200,000)")
+    parser.add_argument('--columns', type=int, default=4, help="금액 컬럼 수 (기본 4)")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 측정 횟수 (기본 3)")
+    args = parser.parse_args()
+
+    df = build_table(args.rows, args.columns)
+    cells = args.rows * args.columns
+
+    print("⏱️ DSD Breaker 숫자 정규화 벤치마크")
+    print("=" * 60)
+    print(f"📊 테이블: {args.rows:,}행 x {args.columns}개 금액 컬럼")
+
+    legacy_time, legacy_df = measure(legacy_convert_numbers, df, args.repeat)
+    new_time, new_df = measure(normalize_numbers, df, args.repeat)
+
+    legacy_parsed = int(legacy_df.iloc[:, 1:].apply(pd.to_numeric, errors='coerce').notna().sum().sum())
+    new_parsed = int(new_df.iloc[:, 1:].apply(pd.to_numeric, errors='coerce').notna().sum().sum())
+
+    print(f"  기존 다중 패스:   {legacy_time:8.3f}초  숫자 셀 {legacy_parsed:,}/{cells:,}")
+    print(f"  1회 패스 정규화:  {new_time:8.3f}초  숫자 셀 {new_parsed:,}/{cells:,}")
+    print(f"🚀 속도 향상: {legacy_time / new_time:.1f}배")
+    print(f"📋 컬럼별 변환 비율: {new_df.attrs['parse_ratios']}")
+
+
+if __name__ == "__main__":
+    main()
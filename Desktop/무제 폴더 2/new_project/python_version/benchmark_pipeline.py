@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+⏱️ DSD Breaker 변환 파이프라인 회귀 벤치마크
+변환 엔진의 단계별 측정 보고서로 처리량을 기록하고 기준 보고서와 비교
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmark_grid import build_document
+from dsd_breaker_engine import ConversionOptions, convert
+from dsd_breaker_profile import describe_report, load_report, save_report
+
+
+def write_corpus(directory, files, tables, groups, items):
+    """span이 많은 합성 보고서 파일 생성"""
+    html_content = build_document(tables, groups, items)
+    paths = []
+    for i in range(files):
+        path = Path(directory) / f"report_{i:03d}.html"
+        path.write_text(html_content, encoding='utf-8')
+        paths.append(str(path))
+    return paths
+
+
+def best_report(paths, output_file, options, repeat):
+    """repeat회 변환 중 가장 빠른 실행의 측정 보고서"""
+    best = None
+    for _ in range(repeat):
+        report = convert(paths, output_file, options)['profile']
+        if best is None or report['wall_seconds'] < best['wall_seconds']:
+            best = report
+    return best
+
+
+def compare(report, baseline, tolerance):
+    """기준 대비 처리량/단계별 시간 변화 출력, 허용 범위를 넘게 느려졌으면 False"""
+    ratio = report['mb_per_second'] / baseline['mb_per_second'] if baseline['mb_per_second'] else 1.0
+    print(f"📊 기준 대비 처리량: {ratio:.2f}배 "
+          f"({baseline['mb_per_second']:.2f} → {report['mb_per_second']:.2f}MB/s)")
+
+    for stage, seconds in report['stages'].items():
+        before = baseline['stages'].get(stage, 0.0)
+        if before > 0 or seconds > 0:
+            print(f"  {stage:10s} {before:8.3f}초 → {seconds:8.3f}초")
+
+    return ratio >= 1.0 - tolerance
+
+
+def main():
+    """벤치마크 실행 (회귀 발생 시 종료 코드 1)"""
+    parser = argparse.ArgumentParser(description="DSD Breaker 변환 파이프라인 회귀 벤치마크")
+    parser.add_argument('--files', type=int, default=8, help="보고서 파일 수 (기본 8)")
+    parser.add_argument('--tables', type=int, default=30, help="파일당 테이블 수 (기본 30)")
+    parser.add_argument('--groups', type=int, default=10, help="테이블당 구분(rowspan 그룹) 수 (기본 10)")
+    parser.add_argument('--items', type=int, default=8, help="구분당 과목 수 (기본 8)")
+    parser.add_argument('--workers', type=int, default=None, help="병렬 작업 수 (기본: CPU 코어 수)")
+    parser.add_argument('--stream', action='store_true', help="스트리밍 모드로 측정")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 측정 횟수 (기본 3)")
+    parser.add_argument('--baseline', help="비교할 기준 보고서 JSON")
+    parser.add_argument('--save', help="이번 측정 보고서를 JSON으로 저장 (다음 실행의 기준)")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="허용하는 처리량 감소 비율 (기본 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    options = ConversionOptions(workers=args.workers, streaming=args.stream)
+
+    print("⏱️ DSD Breaker 변환 파이프라인 벤치마크")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_corpus(directory, args.files, args.tables, args.groups, args.items)
+        report = best_report(paths, str(Path(directory) / 'out.xlsx'), options, args.repeat)
+
+    print(f"📄 {args.files}개 파일 x 테이블 {args.tables}개")
+    print(f"📈 {describe_report(report)}")
+
+    if args.save:
+        save_report(report, args.save)
+        print(f"🧾 보고서 저장: {args.save}")
+
+    if args.baseline:
+        if not compare(report, load_report(args.baseline), args.tolerance):
+            print(f"❌ 처리량이 기준보다 {args.tolerance:.0%} 넘게 감소했습니다")
+            return 1
+        print("✅ 기준 처리량 유지")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+🏷️ DSD Breaker 계정과목 정규화/유사 매칭
+번호/주석 참조/공백/한자 표기를 정리한 표준 계정 키와 문자 bigram 색인으로 재무제표-주석 계정을 매칭
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+
+# 앞 번호: 'Ⅰ.', 'I.', '1.', '1)', '(1)', '가.', '(가)' (NFKC 후 Ⅰ → I, ⑴ → (1))
+_HANGUL_NUMBERS = '가나다라마바사아자차카타파하'
+_RE_NUMBERING = re.compile(rf'^\s*(?:\(\s*(?:\d{{1,3}}|[{_HANGUL_NUMBERS}])\s*\)'
+                           rf'|(?:[IVX]{{1,5}}|\d{{1,3}}|[{_HANGUL_NUMBERS}])\s*[.)])\s*')
+
+# 원문자 번호 '①', '㉮' (NFKC 후에는 숫자/글자만 남으므로 먼저 제거)
+_RE_CIRCLED_NUMBER = re.compile(r'^\s*[\u2460-\u2473\u326e-\u327b]\s*')
+
+# 주석 참조: '(주석 5)', '(주5,6)', '(註 12)', '(*1)', '*2'
+_RE_NOTE_REFERENCE = re.compile(r'\(\s*(?:주석|주|註)\s*[\d,.\s~\-]+\)|\(\s*\*\s*\d*\s*\)|\*\d*')
+
+# 공백/구분 기호 (가운뎃점, 하이픈, 따옴표)
+_RE_SEPARATORS = re.compile(r'[\s·ㆍ・\-_\'"`]+')
+
+# 감사보고서에 나오는 한자 → 한글 (한 글자 단위)
+_HANJA = str.maketrans({
+    '資': '자', '産': '산', '負': '부', '債': '채', '本': '본', '流': '유', '動': '동',
+    '現': '현', '金': '금', '計': '계', '合': '합', '總': '총', '小': '소', '未': '미',
+    '收': '수', '株': '주', '式': '식', '賣': '매', '出': '출', '入': '입', '原': '원',
+    '價': '가', '利': '이', '益': '익', '損': '손', '純': '순', '營': '영', '業': '업',
+    '外': '외', '費': '비', '用': '용', '稅': '세', '法': '법', '人': '인', '當': '당',
+    '期': '기', '前': '전', '短': '단', '長': '장', '借': '차', '貸': '대', '付': '부',
+    '引': '인', '充': '충', '在': '재', '庫': '고', '土': '토', '地': '지', '建': '건',
+    '物': '물', '機': '기', '械': '계', '投': '투', '有': '유', '形': '형', '無': '무',
+    '剩': '잉', '餘': '여', '額': '액', '減': '감', '增': '증', '性': '성', '及': '및',
+    '受': '수', '取': '취', '得': '득', '償': '상', '却': '각', '累': '누', '處': '처',
+    '分': '분', '配': '배', '與': '여', '給': '급', '料': '료', '手': '수',
+    '數': '수', '品': '품', '製': '제', '商': '상', '貨': '화', '幣': '폐', '證': '증',
+    '券': '권', '權': '권',
+})
+
+# 표준 계정과 같은 뜻의 다른 표기 (정규화한 문자열이 정확히 같을 때만 적용)
+# 부호가 반대인 계정('결손금')이나 여러 계정의 상위 항목('수익', '매출')은 넣지 않음
+CANONICAL_ACCOUNTS = {
+    '현금및현금성자산': ('현금및현금등가물', '현금과현금성자산', '현금및예금'),
+    '단기금융상품': ('단기금융자산', '단기예금'),
+    '매출채권': ('매출채권및기타채권', '외상매출금', '매출채권및기타수취채권'),
+    '재고자산': ('재고자산평가후금액',),
+    '유형자산': ('유형자산순액',),
+    '무형자산': ('무형자산순액',),
+    '사용권자산': ('리스사용권자산',),
+    '매입채무': ('매입채무및기타채무', '외상매입금', '매입채무및기타지급채무'),
+    '단기차입금': ('단기차입부채',),
+    '유동성장기부채': ('유동성장기차입금',),
+    '리스부채': ('리스채무',),
+    '이익잉여금': ('이익잉여금(결손금)', '미처분이익잉여금'),
+    '자산총계': ('자산합계', '총자산'),
+    '부채총계': ('부채합계', '총부채'),
+    '자본총계': ('자본합계', '총자본'),
+    '부채와자본총계': ('부채및자본총계', '부채와자본합계', '부채및자본합계'),
+    '매출액': ('수익(매출액)', '영업수익'),
+    '매출원가': ('영업원가',),
+    '판매비와관리비': ('판매비및관리비', '판매관리비', '판관비'),
+    '영업이익': ('영업이익(손실)', '영업손익'),
+    '법인세비용차감전순이익': ('법인세비용차감전순이익(손실)', '법인세차감전순이익',
+                          '법인세비용차감전계속영업이익'),
+    '법인세비용': ('법인세비용(수익)', '법인세등'),
+    '당기순이익': ('당기순이익(손실)', '당기순손익', '분기순이익', '반기순이익'),
+    '총포괄이익': ('당기총포괄이익', '총포괄손익', '당기총포괄손익'),
+    '감가상각비': ('감가상각비및무형자산상각비',),
+    '대손충당금': ('손실충당금', '대손상각충당금'),
+    '영업활동현금흐름': ('영업활동으로인한현금흐름', '영업활동으로인한순현금흐름'),
+    '투자활동현금흐름': ('투자활동으로인한현금흐름', '투자활동으로인한순현금흐름'),
+    '재무활동현금흐름': ('재무활동으로인한현금흐름', '재무활동으로인한순현금흐름'),
+    '기말현금및현금성자산': ('기말의현금및현금성자산', '기말의현금', '기말현금'),
+}
+
+# 유사 매칭 기본 기준 (bigram Dice 계수)
+DEFAULT_THRESHOLD = 0.6
+
+
+@lru_cache(maxsize=65536)
+def normalize_account(label):
+    """계정과목 비교 키 (NFKC, 앞 번호/주석 참조/공백/구분 기호 제거, 한자 → 한글, 영문 소문자)"""
+    text = _RE_CIRCLED_NUMBER.sub('', str(label))
+    text = unicodedata.normalize('NFKC', text).translate(_HANJA)
+    text = _RE_NOTE_REFERENCE.sub('', text)
+    # '1. (1) 현금' 같은 이중 번호까지 제거
+    for _ in range(2):
+        stripped = _RE_NUMBERING.sub('', text)
+        if stripped == text:
+            break
+        text = stripped
+    return _RE_SEPARATORS.sub('', text).lower()
+
+
+def _build_aliases():
+    """정규화된 다른 표기 → 정규화된 표준 계정"""
+    aliases = {}
+    for canonical, variants in CANONICAL_ACCOUNTS.items():
+        key = normalize_account(canonical)
+        aliases[key] = key
+        for variant in variants:
+            aliases[normalize_account(variant)] = key
+    return aliases
+
+
+_ALIASES = _build_aliases()
+
+
+@lru_cache(maxsize=65536)
+def canonical_account(label):
+    """표준 계정 키 (사전에 있는 다른 표기는 표준 이름으로, 없으면 정규화 키 그대로)"""
+    key = normalize_account(label)
+    return _ALIASES.get(key, key)
+
+
+def bigrams(key):
+    """문자 bigram 집합 (한 글자 키는 그 글자)"""
+    if len(key) < 2:
+        return {key} if key else set()
+    return {key[i:i + 2] for i in range(len(key) - 1)}
+
+
+class AccountMatcher:
+    """계정과목 유사 매칭 색인 (문자 bigram 역색인으로 후보를 좁힌 뒤 Dice 계수로 순위)
+
+    수만 개 라벨도 질의마다 공유 bigram이 있는 후보만 세므로 수 ms 안에 끝난다.
+    """
+
+    def __init__(self, labels=()):
+        self.labels = []
+        self.keys = []
+        self._key_ids = {}
+        self._postings = {}     # bigram → 키 번호 목록 (추가 시 갱신)
+        self._frozen = None      # 질의용 (bigram → 키 번호 배열, 키별 bigram 수), 추가하면 다시 생성
+        for label in labels:
+            self.add(label)
+
+    def add(self, label):
+        """라벨 추가 (같은 표준 키는 한 번만) → 키 번호"""
+        key = canonical_account(label)
+        key_id = self._key_ids.get(key)
+        if key_id is not None:
+            return key_id
+        key_id = len(self.keys)
+        self._key_ids[key] = key_id
+        self.labels.append(str(label))
+        self.keys.append(key)
+        for gram in bigrams(key):
+            self._postings.setdefault(gram, []).append(key_id)
+        self._frozen = None
+        return key_id
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _freeze(self):
+        """질의용 NumPy 배열 (목록은 그대로 두어 질의 후에도 추가 가능)"""
+        if self._frozen is None:
+            postings = {gram: np.asarray(ids, dtype=np.int64) for gram, ids in self._postings.items()}
+            sizes = np.fromiter((len(bigrams(key)) for key in self.keys), dtype=np.int64,
+                                count=len(self.keys))
+            self._frozen = (postings, sizes)
+        return self._frozen
+
+    def match(self, label, limit=5, threshold=DEFAULT_THRESHOLD):
+        """유사도 순 후보 [(라벨, 표준 키, 점수)], 표준 키가 같으면 점수 1.0"""
+        key = canonical_account(label)
+        if not key or not self.keys:
+            return []
+        frozen_postings, sizes = self._freeze()
+
+        grams = bigrams(key)
+        postings = [frozen_postings[gram] for gram in grams if gram in frozen_postings]
+        if not postings:
+            return []
+        ids, shared = np.unique(np.concatenate(postings), return_counts=True)
+        scores = 2.0 * shared / (sizes[ids] + len(grams))
+
+        exact = self._key_ids.get(key)
+        if exact is not None:
+            scores[ids == exact] = 1.0
+
+        keep = scores >= threshold
+        ids, scores = ids[keep], scores[keep]
+        order = np.argsort(-scores, kind='stable')[:limit]
+        return [(self.labels[ids[i]], self.keys[ids[i]], float(scores[i])) for i in order]
+
+    def best(self, label, threshold=DEFAULT_THRESHOLD):
+        """가장 유사한 후보 하나 (없으면 None)"""
+        candidates = self.match(label, 1, threshold)
+        return candidates[0] if candidates else None
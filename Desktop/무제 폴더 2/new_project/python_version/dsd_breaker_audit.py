@@ -8,12 +8,17 @@ import pandas as pd
 import numpy as np
 import re
 from pathlib import Path
-import xml.etree.ElementTree as ET
-from bs4 import BeautifulSoup
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
 
+from dsd_breaker_cache import open_table_cache
+from dsd_breaker_extractor import extract_tables_from_file
+from dsd_breaker_rules import RULE_HIERARCHY, RuleEngine
+from dsd_breaker_verify import (RULE_DUPLICATE, RULE_EMPTY, RULE_IDENTITY, RULE_NEGATIVE, level_sums,
+                                table_levels)
+from dsd_breaker_xref import build_index
+
 class DSDBreakAuditApp:
     """DART 감사보고서 검증용 DSD Breaker"""
     
@@ -24,9 +29,14 @@ class DSDBreakAuditApp:
         
         # 상태 변수
         self.current_file = None
-        self.html_content = None
+        self.html_file = None
+        self.table_cache = open_table_cache()  # 변환기와 같은 파싱 결과 캐시 공유
         self.extracted_tables = []
         self.verification_results = []
+        self.account_index = None  # 교차 참조용 계정 색인
+        # 합계 검증(소계/합계, 회계 등식)과 오류 패턴 규칙
+        self.sum_rules = RuleEngine([RULE_HIERARCHY, RULE_IDENTITY])
+        self.error_rules = RuleEngine([RULE_NEGATIVE, RULE_DUPLICATE, RULE_EMPTY])
         
         self.setup_ui()
     
@@ -149,20 +159,20 @@ class DSDBreakAuditApp:
         """DART HTML 파일 열기"""
         file_path = filedialog.askopenfilename(
             title="DART HTML 파일 선택",
-            filetypes=[("HTML files", "*.html *.htm"), ("All files", "*.*")]
+            filetypes=[("HTML files", "*.html *.htm"), ("DART XML files", "*.xml"), ("All files", "*.*")]
         )
         
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    self.html_content = f.read()
+                # 파싱은 extract_tables에서 (인코딩 감지 + 캐시 조회 포함)
+                self.html_file = file_path
                 
                 self.current_file = file_path
                 file_name = os.path.basename(file_path)
                 self.file_label.config(text=f"📄 {file_name}")
                 
                 self.log_message(f"✅ HTML 파일 로드 성공: {file_name}")
-                self.log_message(f"📊 HTML 내용 크기: {len(self.html_content):,} 문자")
+                self.log_message(f"📊 HTML 파일 크기: {os.path.getsize(file_path):,} 바이트")
                 
                 # 자동으로 테이블 추출 시작
                 self.extract_tables()
@@ -184,6 +194,7 @@ class DSDBreakAuditApp:
                 excel_data = pd.read_excel(file_path, sheet_name=None)  # 모든 시트 읽기
                 
                 self.current_file = file_path
+                self.html_file = None
                 file_name = os.path.basename(file_path)
                 self.file_label.config(text=f"📄 {file_name}")
                 
@@ -210,35 +221,30 @@ class DSDBreakAuditApp:
     
     def extract_tables(self):
         """HTML에서 테이블 추출"""
-        if not self.html_content:
+        if not self.html_file:
             messagebox.showwarning("경고", "먼저 HTML 파일을 열어주세요.")
             return
         
         self.log_message("\\n🔍 HTML 테이블 추출 시작...")
         
         try:
-            soup = BeautifulSoup(self.html_content, 'html.parser')
-            tables = soup.find_all('table')
+            # 변환기와 같은 추출 엔진 사용 (같은 파일/옵션이면 캐시에서 로드)
+            tables, stats = extract_tables_from_file(self.html_file, cache=self.table_cache)
+            if stats.cached:
+                self.log_message(f"  🗄️ 캐시에서 로드: {stats.describe()}")
             
             self.extracted_tables = []
             
-            for i, table in enumerate(tables):
-                # 테이블을 pandas DataFrame으로 변환
-                try:
-                    df = pd.read_html(str(table))[0]
+            for i, df in enumerate(tables):
+                if len(df) > 1 and len(df.columns) > 1:  # 의미있는 크기의 테이블만
+                    self.extracted_tables.append({
+                        'name': f'Table_{i+1}',
+                        'data': df,
+                        'rows': len(df),
+                        'cols': len(df.columns)
+                    })
                     
-                    if len(df) > 1 and len(df.columns) > 1:  # 의미있는 크기의 테이블만
-                        self.extracted_tables.append({
-                            'name': f'Table_{i+1}',
-                            'data': df,
-                            'rows': len(df),
-                            'cols': len(df.columns),
-                            'html_table': table
-                        })
-                        
-                        self.log_message(f"  📊 테이블 {i+1}: {len(df)}행 x {len(df.columns)}열")
-                except:
-                    continue
+                    self.log_message(f"  📊 테이블 {i+1}: {len(df)}행 x {len(df.columns)}열")
             
             self.log_message(f"✅ 총 {len(self.extracted_tables)}개 테이블 추출 완료")
             self.update_table_display()
@@ -296,19 +302,10 @@ class DSDBreakAuditApp:
             
             self.log_message(f"\\n🔍 {table_name} 레벨 분석:")
             
-            # 숫자 컬럼 찾기
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            
             # 각 행의 들여쓰기 레벨 감지 (첫 번째 컬럼 기준)
             if len(df.columns) > 0:
-                first_col = df.iloc[:, 0].astype(str)
-                
-                levels = []
-                for value in first_col:
-                    # 공백 수로 레벨 판단
-                    leading_spaces = len(value) - len(value.lstrip())
-                    level = leading_spaces // 2  # 2칸 단위로 레벨 계산
-                    levels.append(level)
+                # 파싱 시 계산한 레벨(CSS 들여쓰기, &nbsp;, 번호 체계) 우선, 없으면 첫 열 텍스트로 계산
+                levels = table_levels(df)
                 
                 # 레벨 정보 저장
                 table_info['levels'] = levels
@@ -317,26 +314,24 @@ class DSDBreakAuditApp:
                 level_counts = pd.Series(levels).value_counts().sort_index()
                 self.log_message(f"  📈 감지된 레벨: {dict(level_counts)}")
                 
-                # 숫자 데이터가 있는 경우 레벨별 합계 분석
-                if len(numeric_cols) > 0:
-                    for col in numeric_cols[:3]:  # 처음 3개 숫자 컬럼만
-                        self.analyze_level_sums(df, col, levels, table_name)
+                # 모든 숫자 열의 레벨별 합계 분석 (결과 표는 테이블 정보에 보관)
+                table_info['level_sums'] = self.analyze_level_sums(df, levels, table_name)
     
-    def analyze_level_sums(self, df, column, levels, table_name):
-        """레벨별 합계 분석"""
+    def analyze_level_sums(self, df, levels, table_name):
+        """레벨별 합계 분석 (레벨 x 숫자 열 집계 DataFrame 반환)"""
         try:
-            numeric_data = pd.to_numeric(df[column], errors='coerce')
-            
-            for level in range(max(levels) + 1):
-                level_mask = [l == level for l in levels]
-                level_sum = numeric_data[level_mask].sum()
-                level_count = sum(level_mask)
-                
-                if level_count > 0:
-                    self.log_message(f"    Level {level} ({column}): {level_count}개 항목, 합계 {level_sum:,.0f}")
-        
+            sums = level_sums(df, levels)
         except Exception as e:
-            self.log_message(f"    ❌ {column} 레벨 합계 분석 실패: {str(e)}")
+            self.log_message(f"    ❌ {table_name} 레벨 합계 분석 실패: {str(e)}")
+            return None
+        
+        # 레벨마다 한 줄 요약 (열별 값은 반환한 표에)
+        summary = sums.groupby('level').agg(rows=('rows', 'first'), columns=('column', 'size'),
+                                            checked=('checked', 'sum'), mismatches=('mismatches', 'sum'))
+        for level, row in summary.iterrows():
+            self.log_message(f"    Level {level}: {row['rows']}개 항목, 숫자 열 {row['columns']}개, "
+                             f"소계/합계 비교 {row['checked']}셀, 불일치 {row['mismatches']}셀")
+        return sums
     
     def verify_sums(self):
         """합계 검증 수행"""
@@ -354,33 +349,26 @@ class DSDBreakAuditApp:
             
             self.log_message(f"\\n🔍 {table_name} 합계 검증:")
             
-            # 숫자 컬럼 찾기
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            try:
+                # 레벨 감지 결과가 있으면 사용, 없으면 테이블에서 계산
+                levels = table_info.get('levels')
+                result = self.sum_rules.evaluate(df, table_name, levels=levels)
+            except Exception as e:
+                self.log_message(f"    ⚠️ 검증 실패: {str(e)}")
+                continue
             
-            for col in numeric_cols:
-                try:
-                    # 컬럼의 합계 계산
-                    column_sum = df[col].sum()
-                    
-                    # '합계', '총계', 'Total' 등이 포함된 행 찾기
-                    sum_keywords = ['합계', '총계', 'Total', '계', 'Sum']
-                    
-                    first_col = df.iloc[:, 0].astype(str)
-                    
-                    for idx, cell_value in first_col.items():
-                        if any(keyword in str(cell_value) for keyword in sum_keywords):
-                            reported_sum = df.loc[idx, col]
-                            
-                            if pd.notna(reported_sum) and abs(column_sum - reported_sum) > 0.01:
-                                error_msg = f"합계 불일치: {col} 컬럼, 계산값 {column_sum:,.0f} ≠ 보고값 {reported_sum:,.0f}"
-                                verification_errors.append(error_msg)
-                                self.log_message(f"    ❌ {error_msg}")
-                            else:
-                                self.log_message(f"    ✅ {col}: 합계 일치 ({column_sum:,.0f})")
-                            break
-                
-                except Exception as e:
-                    self.log_message(f"    ⚠️ {col} 검증 실패: {str(e)}")
+            table_info['findings'] = result.findings
+            if not result.checked:
+                self.log_message("    ℹ️ 검증할 소계/합계 없음")
+                continue
+            
+            self.log_message(f"    📋 {result.checked}개 셀 검증, 불일치 {len(result.findings)}개")
+            for finding in result.findings:
+                error_msg = f"{'회계 등식' if finding.rule == RULE_IDENTITY else '합계'} 불일치: {finding.describe()}"
+                verification_errors.append(error_msg)
+                self.log_message(f"    ❌ {error_msg}")
+            if not result.findings:
+                self.log_message("    ✅ 소계/합계 일치")
         
         if verification_errors:
             self.verification_results.extend(verification_errors)
@@ -396,70 +384,39 @@ class DSDBreakAuditApp:
         
         self.log_message("\\n🔄 교차 참조 확인 시작...")
         
-        # 테이블 간 공통 항목 찾기
-        if len(self.extracted_tables) >= 2:
-            for i in range(len(self.extracted_tables)):
-                for j in range(i + 1, len(self.extracted_tables)):
-                    table1 = self.extracted_tables[i]
-                    table2 = self.extracted_tables[j]
-                    
-                    self.compare_tables(table1, table2)
-        else:
+        if len(self.extracted_tables) < 2:
             self.log_message("  ⚠️ 교차 참조를 위해 최소 2개 테이블이 필요합니다")
-    
-    def compare_tables(self, table1, table2):
-        """두 테이블 간 비교"""
-        try:
-            df1, df2 = table1['data'], table2['data']
-            name1, name2 = table1['name'], table2['name']
-            
-            self.log_message(f"\\n🔍 {name1} ↔ {name2} 비교:")
-            
-            # 첫 번째 컬럼을 기준으로 공통 항목 찾기
-            if len(df1.columns) > 0 and len(df2.columns) > 0:
-                items1 = set(df1.iloc[:, 0].astype(str).str.strip())
-                items2 = set(df2.iloc[:, 0].astype(str).str.strip())
-                
-                common_items = items1 & items2
-                
-                if common_items:
-                    self.log_message(f"  📋 공통 항목 {len(common_items)}개 발견")
-                    
-                    # 공통 항목의 숫자 값 비교
-                    self.compare_common_values(df1, df2, common_items, name1, name2)
-                else:
-                    self.log_message(f"  ℹ️ 공통 항목 없음")
+            return
         
+        try:
+            # 모든 테이블의 계정을 표준 계정 키로 한 번에 색인하고 계정별로 비교 (테이블 쌍 반복 없음)
+            filing = Path(self.html_file).name if self.html_file else ''
+            index = build_index(((info['name'], info['data']) for info in self.extracted_tables), filing)
+            self.account_index = index
+            shared = index.shared_accounts()
+            checked, findings = index.check_consistency()
+            # 표기가 달라 정확히 매칭되지 않은 주석 계정의 재무제표 본문 후보
+            suggestions = index.suggest_matches()
         except Exception as e:
-            self.log_message(f"  ❌ 테이블 비교 실패: {str(e)}")
-    
-    def compare_common_values(self, df1, df2, common_items, name1, name2):
-        """공통 항목의 값 비교"""
-        for item in list(common_items)[:5]:  # 처음 5개만 비교
-            try:
-                # 각 테이블에서 해당 항목의 행 찾기
-                mask1 = df1.iloc[:, 0].astype(str).str.strip() == item
-                mask2 = df2.iloc[:, 0].astype(str).str.strip() == item
-                
-                if mask1.any() and mask2.any():
-                    row1 = df1[mask1].iloc[0]
-                    row2 = df2[mask2].iloc[0]
-                    
-                    # 숫자 컬럼 비교
-                    numeric_cols1 = df1.select_dtypes(include=[np.number]).columns
-                    numeric_cols2 = df2.select_dtypes(include=[np.number]).columns
-                    
-                    for col1 in numeric_cols1:
-                        for col2 in numeric_cols2:
-                            val1 = row1[col1]
-                            val2 = row2[col2]
-                            
-                            if pd.notna(val1) and pd.notna(val2) and abs(val1 - val2) < 0.01:
-                                self.log_message(f"    ✅ {item}: {val1:,.0f} (일치)")
-                            elif pd.notna(val1) and pd.notna(val2):
-                                self.log_message(f"    ❌ {item}: {name1}={val1:,.0f} ≠ {name2}={val2:,.0f}")
-            except:
-                continue
+            self.log_message(f"  ❌ 교차 참조 실패: {str(e)}")
+            return
+        
+        self.log_message(f"  📋 여러 테이블에 등장하는 계정 {len(shared)}개, {checked}개 값 비교")
+        
+        xref_errors = []
+        for finding in findings:
+            error_msg = f"교차 참조 불일치: {finding.describe()}"
+            xref_errors.append(error_msg)
+            self.log_message(f"    ❌ {error_msg}")
+        
+        for row in suggestions.itertuples(index=False):
+            self.log_message(f"    🔎 유사 계정 후보: {row.table} '{row.label}' ↔ '{row.candidate}' ({row.score:.0%})")
+        
+        if xref_errors:
+            self.verification_results.extend(xref_errors)
+            self.log_message(f"\\n⚠️ 총 {len(xref_errors)}개 교차 참조 불일치 발견")
+        else:
+            self.log_message(f"    ✅ 공통 계정 값 일치 ({checked - len(findings)}개)")
     
     def detect_errors(self):
         """일반적인 오류 패턴 탐지"""
@@ -477,35 +434,20 @@ class DSDBreakAuditApp:
             
             self.log_message(f"\\n🔍 {table_name} 오류 검사:")
             
-            # 1. 비정상적인 음수/양수 패턴
+            # 음수/양수 분포
             numeric_cols = df.select_dtypes(include=[np.number]).columns
-            
             for col in numeric_cols:
                 negative_count = (df[col] < 0).sum()
-                positive_count = (df[col] > 0).sum()
-                
                 if negative_count > 0:
+                    positive_count = (df[col] > 0).sum()
                     self.log_message(f"  📊 {col}: 음수 {negative_count}개, 양수 {positive_count}개")
-                    
-                    # 비정상적으로 많은 음수가 있는 경우
-                    if negative_count > positive_count * 0.5:
-                        error_patterns.append(f"{table_name}.{col}: 비정상적으로 많은 음수 값")
-            
-            # 2. 중복 항목 확인
-            if len(df.columns) > 0:
-                first_col = df.iloc[:, 0].astype(str)
-                duplicates = first_col[first_col.duplicated()].unique()
-                
-                if len(duplicates) > 0:
-                    self.log_message(f"  🔄 중복 항목 {len(duplicates)}개 발견")
-                    for dup in duplicates[:3]:
-                        error_patterns.append(f"{table_name}: 중복 항목 '{dup}'")
             
-            # 3. 빈 셀이 많은 컬럼
-            for col in df.columns:
-                null_ratio = df[col].isnull().sum() / len(df)
-                if null_ratio > 0.5:
-                    error_patterns.append(f"{table_name}.{col}: 빈 셀 비율 {null_ratio:.1%}")
+            # 음수 과다 / 중복 항목 / 빈 셀 과다 (일괄 검증과 같은 규칙)
+            findings = self.error_rules.evaluate(df, table_name).findings
+            duplicates = sum(1 for finding in findings if finding.rule == RULE_DUPLICATE)
+            if duplicates:
+                self.log_message(f"  🔄 중복 항목 {duplicates}개 발견")
+            error_patterns.extend(finding.describe() for finding in findings)
         
         if error_patterns:
             self.verification_results.extend(error_patterns)
@@ -566,7 +508,7 @@ class DSDBreakAuditApp:
         self.verification_results = []
         
         # 순차적으로 모든 검증 실행
-        if self.html_content and not self.extracted_tables:
+        if self.html_file and not self.extracted_tables:
             self.extract_tables()
         
         self.detect_levels()
@@ -657,7 +599,7 @@ DART (Data Analysis, Retrieval and Transfer)
 • 오류 패턴 자동 탐지
 • 상세 검증 리포트 생성
 
-🛠️ 개발: Python 3.x + pandas + BeautifulSoup
+🛠️ 개발: Python 3.x + pandas + lxml
 📅 업데이트: 2025년 6월 23일
         '''
         messagebox.showinfo("정보", about_text)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+🗃️ DSD Breaker 일괄 감사
+여러 공시를 프로세스 풀에서 추출 → 레벨 → 합계 검증 → 교차 참조 → 오류 패턴 순으로 검증하고
+구조화된 검증 결과를 하나의 SQLite(또는 Parquet) 저장소에 기록
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from dsd_breaker_cache import DEFAULT_CACHE_SIZE_MB, open_table_cache
+from dsd_breaker_engine import ProgressEvent, collect_html_files, map_ordered
+from dsd_breaker_export import check_output_format
+from dsd_breaker_extractor import extract_tables_from_file
+from dsd_breaker_periods import RULE_PERIOD, PeriodIndex
+from dsd_breaker_rules import load_rules
+from dsd_breaker_verify import DEFAULT_TOLERANCE
+from dsd_breaker_xref import build_index
+
+# 저장소 스키마 (검증 실행 / 공시별 요약 / 검증 결과)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started TEXT, files INTEGER, tolerance REAL, seconds REAL
+);
+CREATE TABLE IF NOT EXISTS filings (
+    run_id INTEGER, filing TEXT, path TEXT, tables INTEGER, checked INTEGER,
+    findings INTEGER, seconds REAL, error TEXT
+);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER, filing TEXT, "table" TEXT, "row" INTEGER, label TEXT, "column" TEXT,
+    expected REAL, actual REAL, rule TEXT, reference TEXT
+);
+CREATE INDEX IF NOT EXISTS findings_filing ON findings (filing);
+CREATE INDEX IF NOT EXISTS findings_rule ON findings (rule);
+"""
+
+FINDING_COLUMNS = ['filing', 'table', 'row', 'label', 'column', 'expected', 'actual', 'rule',
+                   'reference']
+
+
+@dataclass
+class AuditOptions:
+    """일괄 감사 옵션"""
+    workers: Optional[int] = None   # None이면 CPU 코어 수
+    tolerance: float = DEFAULT_TOLERANCE
+    scale_units: bool = False
+    cache_dir: Optional[str] = None  # 파싱 결과 캐시 폴더 (None이면 캐시 사용 안 함)
+    cache_size_mb: int = DEFAULT_CACHE_SIZE_MB
+    rules_file: Optional[str] = None  # 규칙 파일 (.json/.yaml, None이면 기본 규칙)
+    compare_periods: bool = False    # 같은 폴더(회사) 공시 간 전기/당기 값 비교
+
+
+@dataclass
+class FilingAudit:
+    """공시 하나의 감사 결과 (프로세스 풀 작업 결과)"""
+    filing: str
+    path: str
+    tables: int = 0
+    checked: int = 0           # 합계/교차 참조로 비교한 셀 수
+    findings: list = field(default_factory=list)
+    seconds: float = 0.0
+    error: Optional[str] = None
+    periods: Optional[PeriodIndex] = None   # 기간 비교용 공시 색인 (compare_periods일 때)
+
+
+def audit_tables(tables, filing='', tolerance=DEFAULT_TOLERANCE, engine=None):
+    """추출된 테이블 목록 감사 → (테이블 이름 목록, 비교 셀 수, Finding 목록)"""
+    engine = engine or load_rules(None, tolerance=tolerance)
+    # 감사 앱과 같은 기준: 2행 2열 이상인 표만, 이름은 원래 순번
+    named = [(f'Table_{i + 1}', df) for i, df in enumerate(tables)
+             if len(df) > 1 and len(df.columns) > 1]
+
+    checked = 0
+    findings = []
+    for name, df in named:
+        result = engine.evaluate(df, name, filing)
+        checked += result.checked
+        findings.extend(result.findings)
+
+    # 교차 참조는 테이블 간 규칙이므로 공시 전체 색인으로 한 번에
+    xref_checked, xref_findings = build_index(named, filing).check_consistency(engine.tolerance)
+    checked += xref_checked
+    findings.extend(xref_findings)
+
+    return [name for name, _ in named], checked, findings
+
+
+def audit_file(path, options):
+    """공시 파일 하나 감사 (프로세스 풀 작업 단위, 실패해도 예외 대신 결과에 기록)"""
+    start = time.perf_counter()
+    filing = os.path.basename(path)
+    try:
+        cache = (open_table_cache(options.cache_dir, options.cache_size_mb)
+                 if options.cache_dir is not None else None)
+        engine = load_rules(options.rules_file, tolerance=options.tolerance)
+        tables, _ = extract_tables_from_file(path, scale_units=options.scale_units, cache=cache)
+        names, checked, findings = audit_tables(tables, filing, options.tolerance, engine)
+        periods = None
+        if options.compare_periods:
+            # 같은 폴더의 공시를 한 회사의 연도별 공시로 취급
+            periods = PeriodIndex()
+            periods.add_filing(filing, tables, company=os.path.basename(os.path.dirname(path)))
+        return FilingAudit(filing, path, len(names), checked, findings, time.perf_counter() - start,
+                           periods=periods)
+    except Exception as e:
+        return FilingAudit(filing, path, seconds=time.perf_counter() - start, error=str(e))
+
+
+class FindingStore:
+    """검증 결과 저장소 (.parquet/.pq이면 Parquet, 그 외 SQLite)"""
+
+    def __init__(self, path, files=0, tolerance=DEFAULT_TOLERANCE):
+        self.path = str(path)
+        self.parquet = Path(self.path).suffix.lower() in ('.parquet', '.pq')
+        self.run_id = None
+        self._filings = []
+        self._findings = []
+
+        if self.parquet:
+            check_output_format('parquet')
+            return
+
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(_SCHEMA)
+        cursor = self.connection.execute(
+            "INSERT INTO runs (started, files, tolerance) VALUES (?, ?, ?)",
+            (datetime.now().isoformat(timespec='seconds'), files, tolerance))
+        self.run_id = cursor.lastrowid
+
+    def add(self, audit):
+        """공시 하나의 결과 기록 (SQLite는 공시마다 커밋하여 중단되어도 앞 결과 보존)"""
+        summary = (audit.filing, audit.path, audit.tables, audit.checked, len(audit.findings),
+                   audit.seconds, audit.error)
+        if self.parquet:
+            self._filings.append(summary)
+        else:
+            with self.connection:
+                self.connection.execute("INSERT INTO filings VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                        (self.run_id, *summary))
+        self.add_findings(audit.findings)
+
+    def add_findings(self, findings):
+        """공시 요약 없이 검증 결과만 기록 (여러 공시에 걸친 기간 비교 결과 등)"""
+        rows = [tuple(asdict(finding)[column] for column in FINDING_COLUMNS) for finding in findings]
+        if self.parquet:
+            self._findings.extend(rows)
+            return
+
+        with self.connection:
+            self.connection.executemany("INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                        [(self.run_id, *row) for row in rows])
+
+    def close(self, seconds=0.0):
+        """저장소 닫기 (Parquet은 이때 결과와 공시 요약 파일을 기록)"""
+        if self.parquet:
+            findings = pd.DataFrame(self._findings, columns=FINDING_COLUMNS)
+            findings.to_parquet(self.path, index=False)
+            filings = pd.DataFrame(self._filings, columns=['filing', 'path', 'tables', 'checked',
+                                                           'findings', 'seconds', 'error'])
+            filings.to_parquet(filings_path(self.path), index=False)
+            return
+
+        with self.connection:
+            self.connection.execute("UPDATE runs SET seconds = ? WHERE run_id = ?",
+                                    (seconds, self.run_id))
+        self.connection.close()
+
+
+def filings_path(path):
+    """Parquet 저장소의 공시 요약 파일 경로 (findings.parquet → findings_filings.parquet)"""
+    path = Path(path)
+    return str(path.with_name(f"{path.stem}_filings{path.suffix}"))
+
+
+def load_findings(path, run_id=None):
+    """저장소의 검증 결과를 DataFrame으로 읽기 (SQLite는 run_id가 없으면 마지막 실행)"""
+    if Path(path).suffix.lower() in ('.parquet', '.pq'):
+        return pd.read_parquet(path)
+
+    with closing(sqlite3.connect(str(path))) as connection:
+        if run_id is None:
+            run_id = connection.execute("SELECT MAX(run_id) FROM runs").fetchone()[0]
+        return pd.read_sql_query("SELECT * FROM findings WHERE run_id = ?", connection,
+                                 params=(run_id,))
+
+
+def run_batch_audit(paths, store_path, options=None, on_event=None):
+    """공시 파일/폴더를 병렬로 감사하여 저장소에 기록하고 요약 반환
+
+    폴더는 바로 아래 HTML/XML 파일만 모으고 하위 폴더는 찾지 않는다. 기간 비교의 회사는 파일의 상위
+    폴더 이름이므로 회사별 하위 폴더를 가진 최상위 폴더 대신 회사 폴더들을 넘긴다 (회사A/ 회사B/).
+    """
+    options = options or AuditOptions()
+    notify = on_event or (lambda event: None)
+    files = collect_html_files(paths)
+    if not files:
+        raise ValueError("감사할 HTML/XML 파일이 없습니다.")
+    # 규칙 파일 오류는 작업자마다 실패하기 전에 먼저 확인
+    load_rules(options.rules_file, tolerance=options.tolerance)
+
+    start = time.perf_counter()
+    store = FindingStore(store_path, len(files), options.tolerance)
+    summary = {'files': len(files), 'audited': 0, 'failed': 0, 'tables': 0, 'checked': 0,
+               'findings': 0, 'rules': {}, 'store': str(store_path), 'run_id': store.run_id}
+
+    notify(ProgressEvent('start', f"🗃️ 일괄 감사 시작: {len(files)}개 파일", 0))
+    workers = min(options.workers or os.cpu_count() or 1, len(files))
+    results = map_ordered(audit_file, files, [options] * len(files), workers=workers)
+    periods = PeriodIndex()
+    try:
+        for i, audit in enumerate(results):
+            progress = (i + 1) / len(files) * 100
+            store.add(audit)
+            if audit.periods is not None:
+                periods.extend(audit.periods)
+            if audit.error:
+                summary['failed'] += 1
+                notify(ProgressEvent('error', f"  ❌ {audit.filing} 감사 실패: {audit.error}",
+                                     progress, audit.filing))
+                continue
+
+            summary['audited'] += 1
+            summary['tables'] += audit.tables
+            summary['checked'] += audit.checked
+            summary['findings'] += len(audit.findings)
+            for finding in audit.findings:
+                summary['rules'][finding.rule] = summary['rules'].get(finding.rule, 0) + 1
+            notify(ProgressEvent('file', f"📄 {audit.filing}: 테이블 {audit.tables}개, "
+                                         f"{audit.checked}개 셀 비교, 발견 {len(audit.findings)}건 "
+                                         f"({audit.seconds:.1f}초)", progress, audit.filing))
+
+        if options.compare_periods:
+            # 모든 공시의 기간 값을 한 번의 조인으로 비교
+            checked, findings = periods.compare(options.tolerance)
+            store.add_findings(findings)
+            summary['checked'] += checked
+            summary['findings'] += len(findings)
+            if findings:
+                summary['rules'][RULE_PERIOD] = len(findings)
+            notify(ProgressEvent('stats', f"📅 기간 비교: 공시 {len(periods.filings)}개, "
+                                           f"{checked}개 값 비교, 발견 {len(findings)}건", 100))
+    finally:
+        results.close()
+        summary['seconds'] = time.perf_counter() - start
+        store.close(summary['seconds'])
+
+    notify(ProgressEvent('done', f"🎉 일괄 감사 완료: {summary['audited']}개 공시, "
+                                 f"발견 {summary['findings']}건 → {store_path}", 100))
+    return summary
+
+
+def main():
+    """명령줄에서 일괄 감사 실행 (실패한 공시가 있으면 종료 코드 1)"""
+    parser = argparse.ArgumentParser(description="DSD Breaker 일괄 감사")
+    parser.add_argument('paths', nargs='+', help="공시 HTML/XML 파일 또는 폴더 (하위 폴더는 찾지 않음)")
+    parser.add_argument('-o', '--output', default='findings.sqlite',
+                        help="결과 저장소 (.sqlite 또는 .parquet, 기본 findings.sqlite)")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="병렬 작업 수 (기본: CPU 코어 수)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f"허용 오차 (기본 {DEFAULT_TOLERANCE:g})")
+    parser.add_argument('--scale-units', action='store_true', help="캡션 단위로 금액 환산")
+    parser.add_argument('--cache-dir', help="파싱 결과 캐시 폴더")
+    parser.add_argument('--rules', help="규칙 파일 (.json/.yaml: 회계 등식 추가, 기준값 변경, 규칙 끄기)")
+    parser.add_argument('--compare-periods', action='store_true',
+                        help="같은 폴더(회사) 공시 간 전기 값 = 이전 공시 당기 값 비교 (회사 폴더마다 경로로 지정)")
+    args = parser.parse_args()
+
+    options = AuditOptions(workers=args.workers, tolerance=args.tolerance,
+                           scale_units=args.scale_units, cache_dir=args.cache_dir,
+                           rules_file=args.rules, compare_periods=args.compare_periods)
+    try:
+        summary = run_batch_audit(args.paths, args.output, options,
+                                  on_event=lambda event: print(event.message))
+    except (ValueError, ImportError, OSError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    for rule, count in sorted(summary['rules'].items()):
+        print(f"  {rule:10s} {count:,}건")
+    print(f"⏱️ {summary['seconds']:.1f}초")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
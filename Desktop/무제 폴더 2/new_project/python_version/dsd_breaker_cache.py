@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+🗄️ DSD Breaker 파싱 결과 캐시
+파일 내용 해시 + 파싱 옵션을 키로 추출된 테이블을 디스크에 저장 (미리보기/변환/검증 공유)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# pyarrow가 있으면 Arrow IPC(Feather)로 컬럼 단위 저장, 없으면 pickle 사용
+try:
+    import pyarrow
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# 추출 결과 형식이 바뀌면 올려서 이전 캐시를 무효화
+CACHE_VERSION = 5
+
+DEFAULT_CACHE_SIZE_MB = 512
+
+_META_FILE = 'meta.pkl'
+
+# 저장 중인 항목의 임시 폴더 접두사와, 중단된 프로세스가 남긴 것으로 보고 삭제할 경과 시간 (초)
+_TEMP_PREFIX = '.tmp-'
+STALE_TEMP_SECONDS = 24 * 60 * 60
+
+
+def default_cache_dir():
+    """기본 캐시 폴더 (DSD_BREAKER_CACHE_DIR 환경 변수로 변경 가능)"""
+    configured = os.environ.get('DSD_BREAKER_CACHE_DIR')
+    if configured:
+        return Path(configured)
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'dsd_breaker'
+
+
+def file_digest(source):
+    """열린 HTMLSource의 내용 해시 (mmap 버퍼를 복사 없이 해시)"""
+    digest = hashlib.sha256()
+    if source.buffer is not None:
+        digest.update(source.buffer)
+    return digest.hexdigest()
+
+
+def cache_key(source, **options):
+    """파일 내용 해시와 파싱 옵션으로 캐시 키 생성"""
+    key = hashlib.sha256()
+    key.update(json.dumps({'version': CACHE_VERSION, 'options': options}, sort_keys=True).encode())
+    key.update(file_digest(source).encode())
+    return key.hexdigest()
+
+
+def _write_table(df, path_stem):
+    """테이블 하나를 저장하고 (파일명, 형식) 반환"""
+    if HAS_PYARROW:
+        # Arrow는 문자열 컬럼명만 허용하므로 위치 이름으로 저장하고 원래 라벨은 메타에 보관
+        positional = df.set_axis([f'c{i}' for i in range(len(df.columns))], axis=1)
+        try:
+            path = path_stem.with_suffix('.arrow')
+            positional.to_feather(path, compression='zstd')
+            return path.name, 'arrow'
+        except (pyarrow.ArrowException, TypeError, ValueError):
+            # 숫자/문자열이 섞인 컬럼 등 Arrow로 표현할 수 없는 테이블은 pickle로 저장
+            pass
+
+    path = path_stem.with_suffix('.pkl')
+    df.to_pickle(path)
+    return path.name, 'pickle'
+
+
+def _read_table(entry_dir, info):
+    """저장된 테이블 하나 읽기"""
+    path = entry_dir / info['file']
+    if info['format'] == 'arrow':
+        df = pd.read_feather(path)
+        df.columns = info['columns']
+    else:
+        df = pd.read_pickle(path)
+    df.attrs = info['attrs']
+    return df
+
+
+class CachedTables:
+    """캐시에 저장된 파일 하나의 테이블 목록 (순회 시 하나씩 읽음)"""
+
+    def __init__(self, entry_dir, infos):
+        self.entry_dir = entry_dir
+        self.infos = infos
+
+    def __len__(self):
+        return len(self.infos)
+
+    def __iter__(self):
+        for info in self.infos:
+            yield _read_table(self.entry_dir, info)
+
+
+class CacheEntryWriter:
+    """테이블을 하나씩 임시 폴더에 저장하고 commit 시 캐시 항목으로 등록"""
+
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.key = key
+        self.temp_dir = Path(tempfile.mkdtemp(prefix=_TEMP_PREFIX, dir=cache.directory))
+        self.infos = []
+        self.closed = False
+
+    def add(self, df):
+        """테이블 하나 저장"""
+        file_name, fmt = _write_table(df, self.temp_dir / f'table_{len(self.infos):05d}')
+        self.infos.append({'file': file_name, 'format': fmt,
+                           'columns': df.columns, 'attrs': dict(df.attrs)})
+
+    def commit(self):
+        """임시 폴더를 캐시 항목으로 이동 (다른 프로세스가 먼저 저장했으면 버림)"""
+        if self.closed:
+            return
+        self.closed = True
+
+        with open(self.temp_dir / _META_FILE, 'wb') as f:
+            pickle.dump(self.infos, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        try:
+            os.rename(self.temp_dir, self.cache.entry_dir(self.key))
+        except OSError:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            return
+
+        self.cache.evict()
+
+    def abort(self):
+        """저장 중단 (중간까지 쓴 파일 삭제)"""
+        if self.closed:
+            return
+        self.closed = True
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+class TableCache:
+    """내용 해시 기반 테이블 캐시 (전체 크기 기준 LRU 삭제)"""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_CACHE_SIZE_MB * 1024 * 1024):
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def key_for(self, source, **options):
+        """HTMLSource와 추출 옵션(clean_data, detect_numbers 등)의 캐시 키"""
+        return cache_key(source, **options)
+
+    def entry_dir(self, key):
+        """캐시 항목 폴더 경로"""
+        return self.directory / key
+
+    def load(self, key):
+        """캐시된 테이블 목록 (없으면 None), 조회 시 최근 사용 시각 갱신"""
+        entry_dir = self.entry_dir(key)
+        try:
+            with open(entry_dir / _META_FILE, 'rb') as f:
+                infos = pickle.load(f)
+            os.utime(entry_dir)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        return CachedTables(entry_dir, infos)
+
+    def writer(self, key):
+        """테이블을 하나씩 저장할 writer (스트리밍 추출용)"""
+        return CacheEntryWriter(self, key)
+
+    def store(self, key, tables):
+        """테이블 목록 저장"""
+        writer = self.writer(key)
+        try:
+            for df in tables:
+                writer.add(df)
+            writer.commit()
+        finally:
+            writer.abort()
+
+    def entries(self):
+        """(최근 사용 시각, 크기, 폴더) 목록"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith('.') or not entry.is_dir():
+                continue
+            try:
+                size = sum(f.stat().st_size for f in os.scandir(entry.path))
+                entries.append((entry.stat().st_mtime, size, Path(entry.path)))
+            except FileNotFoundError:
+                # 다른 프로세스가 동시에 삭제한 항목
+                continue
+        return entries
+
+    def size(self):
+        """캐시 전체 크기(바이트)"""
+        return sum(size for _, size, _ in self.entries())
+
+    def remove_stale_temp(self, max_age=STALE_TEMP_SECONDS):
+        """max_age초 넘게 수정되지 않은 임시 폴더(강제 종료된 프로세스가 남긴 저장 중 항목) 삭제"""
+        cutoff = time.time() - max_age
+        removed = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.startswith(_TEMP_PREFIX):
+                continue
+            try:
+                if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                    removed += 1
+            except FileNotFoundError:
+                # 다른 프로세스가 저장을 마치고 이동한 폴더
+                continue
+        return removed
+
+    def evict(self):
+        """오래된 임시 폴더를 지우고, 전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 항목 삭제"""
+        self.remove_stale_temp()
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        for _, _, path in self.entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def open_table_cache(directory=None, size_mb=DEFAULT_CACHE_SIZE_MB):
+    """캐시 열기 (directory가 None이면 기본 폴더)"""
+    return TableCache(directory, size_mb * 1024 * 1024)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+🏷️ DSD Breaker 테이블 분류기
+DataFrame을 만들기 전에 격자의 숫자 비율/키워드/행 수로 재무제표 종류를 판별하고 레이아웃 표를 걸러냄
+"""
+
+from dataclasses import dataclass
+
+from dsd_breaker_numbers import is_amount
+
+# 재무제표 종류
+BALANCE_SHEET = 'BS'
+INCOME_STATEMENT = 'IS'
+CASH_FLOW = 'CF'
+NOTES = 'notes'
+LAYOUT = 'layout'   # 표지/서명/페이지 배치용 표 (추출하지 않음)
+
+# 표 제목(캡션/바로 앞 문단)에 나오는 재무제표 이름
+_TITLE_KEYWORDS = {
+    BALANCE_SHEET: ('재무상태표', '대차대조표'),
+    INCOME_STATEMENT: ('손익계산서', '포괄손익계산서'),
+    CASH_FLOW: ('현금흐름표',),
+}
+
+# 계정과목 열/헤더에 나오는 대표 계정 (주석에도 흔한 '자산', '비용' 같은 단어는 제외)
+_ACCOUNT_KEYWORDS = {
+    BALANCE_SHEET: ('자산총계', '부채총계', '자본총계', '유동자산', '유동부채', '이익잉여금',
+                    '자본잉여금', '부채와자본'),
+    INCOME_STATEMENT: ('매출액', '매출원가', '매출총이익', '판매비와관리비', '영업이익',
+                       '법인세비용', '당기순이익', '주당이익', '영업수익', '영업비용'),
+    CASH_FLOW: ('영업활동', '투자활동', '재무활동', '현금흐름', '현금의 증가', '기말의 현금'),
+}
+
+# 표지/서명 블록에 나오는 항목 (숫자가 거의 없을 때만 레이아웃으로 판단)
+_LAYOUT_KEYWORDS = ('대표이사', '회계법인', '감사인', '작성책임자', '본점소재지', '주소',
+                    '전화번호', '제출일', '귀중')
+
+# 제목 키워드는 계정 키워드보다 강한 근거
+_TITLE_WEIGHT = 5
+
+# 재무제표로 판단할 최소 점수와 숫자 셀 비율
+MIN_STATEMENT_SCORE = 3
+MIN_NUMERIC_RATIO = 0.2
+
+# 분류에 사용할 최대 행 수 (큰 표도 앞부분만 보면 충분)
+SAMPLE_ROWS = 60
+
+
+@dataclass
+class TableClass:
+    """테이블 분류 결과"""
+    statement_type: str    # 'BS', 'IS', 'CF', 'notes', 'layout'
+    score: int = 0         # 선택된 종류의 키워드 점수
+    numeric_ratio: float = 0.0
+    body_rows: int = 0
+
+    @property
+    def is_layout(self):
+        return self.statement_type == LAYOUT
+
+
+def _keyword_scores(texts, keywords, weight):
+    """종류별 키워드 등장 점수"""
+    scores = {}
+    for statement_type, words in keywords.items():
+        scores[statement_type] = weight * sum(1 for text in texts for word in words if word in text)
+    return scores
+
+
+def classify_grid(grid, context=''):
+    """span을 펼친 격자와 표 제목 텍스트로 테이블 종류 판별 (DataFrame 생성 전 단계)"""
+    body = [row for row in grid.rows[grid.header_depth:grid.header_depth + SAMPLE_ROWS] if any(row)]
+    if not body:
+        return TableClass(LAYOUT)
+
+    # 계정과목 열을 제외한 값 셀 중 금액 표기 비율
+    values = [text for row in body for text in row[1:] if text]
+    numeric_ratio = sum(1 for text in values if is_amount(text)) / len(values) if values else 0.0
+
+    labels = [row[0] for row in body if row[0]]
+    headers = [text for row in grid.rows[:grid.header_depth] for text in row if text]
+
+    # 단일 열 표는 값 셀이 없으므로 문장형 주석과 같이 키워드/행 수로만 판단
+    if numeric_ratio < MIN_NUMERIC_RATIO:
+        first_cells = ' '.join(labels[:10])
+        if len(body) < 2 or any(word in first_cells for word in _LAYOUT_KEYWORDS):
+            return TableClass(LAYOUT, numeric_ratio=numeric_ratio, body_rows=len(body))
+        return TableClass(NOTES, numeric_ratio=numeric_ratio, body_rows=len(body))
+
+    scores = _keyword_scores([context], _TITLE_KEYWORDS, _TITLE_WEIGHT)
+    for statement_type, score in _keyword_scores(labels + headers, _ACCOUNT_KEYWORDS, 1).items():
+        scores[statement_type] += score
+
+    statement_type, score = max(scores.items(), key=lambda item: item[1])
+    if score < MIN_STATEMENT_SCORE:
+        statement_type = NOTES
+
+    return TableClass(statement_type, score, numeric_ratio, len(body))
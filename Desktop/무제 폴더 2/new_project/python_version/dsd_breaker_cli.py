@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+🖥️ DSD Breaker 명령줄 변환기 (dsd-convert)
+GUI 없이 DART HTML 감사보고서를 Excel 파일로 변환
+"""
+
+import argparse
+import sys
+import time
+
+from dsd_breaker_cache import DEFAULT_CACHE_SIZE_MB, default_cache_dir
+from dsd_breaker_engine import ConversionOptions, convert
+from dsd_breaker_export import OUTPUT_FORMATS
+from dsd_breaker_watch import DEFAULT_INTERVAL, convert_incremental, watch
+
+
+def build_parser():
+    """명령줄 인자 정의"""
+    parser = argparse.ArgumentParser(
+        prog='dsd-convert',
+        description="DART HTML 감사보고서를 Excel 파일로 변환합니다 (GUI 불필요)"
+    )
+    parser.add_argument('inputs', nargs='+', help="HTML 파일 또는 HTML 파일이 있는 폴더")
+    parser.add_argument('-o', '--output', required=True,
+                        help="출력 Excel 파일 경로 (.xlsx), --per-file/--incremental/--watch 또는 "
+                             "열 형식(--format parquet/arrow/csv)에서는 출력 폴더")
+    parser.add_argument('-f', '--format', choices=OUTPUT_FORMATS, default='xlsx',
+                        help="출력 형식: xlsx(기본) 또는 테이블별 parquet/arrow/csv.gz 파일 "
+                             "(parquet/arrow는 pyarrow 필요)")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="병렬 파싱 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument('--single-sheet', action='store_true',
+                        help="파일별로 하나의 시트에 모든 테이블 기록 (기본: 테이블별 시트 분리)")
+    parser.add_argument('--no-clean', action='store_true', help="데이터 정리(공백 제거) 생략")
+    parser.add_argument('--no-numbers', action='store_true', help="숫자 자동 인식 생략")
+    parser.add_argument('--scale-units', action='store_true',
+                        help="표 캡션의 단위(천원/백만원 등)에 따라 금액을 원 단위로 환산")
+    parser.add_argument('--keep-layout', action='store_true',
+                        help="표지/서명/페이지 배치용 표도 추출 (기본: 재무 데이터가 없는 배치용 표 제외)")
+    parser.add_argument('--stream', action='store_true',
+                        help="대용량 파일 스트리밍 모드 (테이블을 하나씩 파싱/기록하여 메모리 절약)")
+    parser.add_argument('--cache', nargs='?', const=str(default_cache_dir()), default=None,
+                        metavar='DIR',
+                        help=f"파싱 결과 캐시 사용 (같은 파일 재변환 시 파싱 생략, 기본 폴더: {default_cache_dir()})")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE_MB, metavar='MB',
+                        help=f"캐시 최대 크기, 초과 시 오래된 항목부터 삭제 (기본 {DEFAULT_CACHE_SIZE_MB}MB)")
+    parser.add_argument('--per-file', action='store_true',
+                        help="파일(공시)별 Excel로 나누어 병렬 기록하고 출력 폴더에 index.json 저장")
+    parser.add_argument('--max-tables', type=int, default=None, metavar='N',
+                        help="워크북당 최대 테이블 수 (초과 시 이름_002.xlsx 등으로 분할)")
+    parser.add_argument('--index', action='store_true',
+                        help="시트 ↔ 원본 파일/테이블 번호 색인(JSON) 저장")
+    parser.add_argument('--report', metavar='FILE', default=None,
+                        help="단계별 시간(읽기/파싱/격자/분류/숫자/기록)과 처리량 보고서를 JSON으로 저장")
+    parser.add_argument('--profile', metavar='FILE', default=None,
+                        help="cProfile 결과(.prof) 저장, .html이면 pyinstrument 사용 "
+                             "(작업자 프로세스까지 보려면 -j 1)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="새 파일/변경된 파일만 파일별 Excel로 변환 (출력 폴더의 매니페스트로 처리 이력 관리)")
+    parser.add_argument('--watch', action='store_true',
+                        help="입력 폴더를 주기적으로 확인하여 새로 받은 파일을 자동 변환 (Ctrl+C로 종료)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, metavar='SEC',
+                        help=f"--watch 확인 주기(초, 기본 {DEFAULT_INTERVAL:g})")
+    parser.add_argument('-q', '--quiet', action='store_true', help="진행 메시지 출력 안 함")
+    return parser
+
+
+def main(argv=None):
+    """명령줄 진입점"""
+    args = build_parser().parse_args(argv)
+
+    options = ConversionOptions(
+        split_by_table=not args.single_sheet,
+        clean_data=not args.no_clean,
+        detect_numbers=not args.no_numbers,
+        scale_units=args.scale_units,
+        skip_layout=not args.keep_layout,
+        streaming=args.stream,
+        workers=args.workers,
+        cache_dir=args.cache,
+        cache_size_mb=args.cache_size,
+        per_file=args.per_file,
+        max_tables=args.max_tables,
+        write_index=args.index,
+        output_format=args.format,
+        report_file=args.report,
+        profile_file=args.profile
+    )
+
+    def print_event(event):
+        if not args.quiet:
+            print(event.message, flush=True)
+
+    if args.watch:
+        try:
+            watch(args.inputs, args.output, options, on_event=print_event, interval=args.interval)
+        except KeyboardInterrupt:
+            if not args.quiet:
+                print("⏹️ 폴더 감시 종료")
+        return 0
+
+    start = time.perf_counter()
+    if args.incremental:
+        try:
+            summary = convert_incremental(args.inputs, args.output, options, on_event=print_event)
+        except Exception as e:
+            print(f"❌ 변환 실패: {e}", file=sys.stderr)
+            return 1
+
+        if not args.quiet:
+            print(f"📋 전체 {summary['scanned']}개 중 새 파일/변경 {summary['changed']}개: "
+                  f"변환 {summary['converted']}개 / 실패 {summary['failed']}개 "
+                  f"({time.perf_counter() - start:.2f}초)")
+        return 0 if summary['failed'] == 0 else 2
+
+    try:
+        summary = convert(args.inputs, args.output, options, on_event=print_event)
+    except Exception as e:
+        print(f"❌ 변환 실패: {e}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        print(f"📋 변환 {summary['converted']}개 / 실패 {summary['failed']}개 파일, "
+              f"시트 {len(summary['sheets'])}개 ({elapsed:.2f}초)")
+        if args.format != 'xlsx':
+            print(f"💾 테이블 파일 {len(summary['outputs'])}개 저장")
+        elif len(summary['outputs']) > 1:
+            print(f"💾 워크북 {len(summary['outputs'])}개 저장")
+        if summary['index']:
+            print(f"🗂️ 색인: {summary['index']}")
+
+    return 0 if summary['failed'] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,16 +4,30 @@
 DART HTML 감사보고서를 Excel 파일로 변환하는 핵심 기능
 """
 
-import pandas as pd
-import numpy as np
-from bs4 import BeautifulSoup
-import re
 import os
-from pathlib import Path
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from datetime import datetime
-import xlsxwriter
+
+from dsd_breaker_cache import default_cache_dir, open_table_cache
+from dsd_breaker_extractor import (extract_tables, iter_tables_from_file, clean_dataframe,
+                                   convert_numbers, parse_table_manually)
+from dsd_breaker_export import COLUMNAR_FORMATS, OUTPUT_FORMATS
+from dsd_breaker_engine import (ConversionOptions, ProgressEvent, collect_html_files, convert,
+                                write_table_to_worksheet)
+
+# 작업 스레드 이벤트 확인 / 로그 화면 갱신 주기 (밀리초)
+EVENT_POLL_MS = 100
+LOG_FLUSH_MS = 100
+
+
+def output_folder(output_path):
+    """결과가 있는 폴더 (파일별 변환/열 형식은 선택한 출력 폴더, 통합 변환은 Excel 파일의 폴더)"""
+    if os.path.isdir(output_path):
+        return output_path
+    return os.path.dirname(output_path)
 
 class DSDHTMLToExcelConverter:
     """DART HTML을 Excel로 변환하는 DSD Breaker 핵심 기능"""
@@ -28,7 +42,18 @@ class DSDHTMLToExcelConverter:
         self.converted_tables = []
         self.output_path = None
         
+        # 변환은 작업 스레드에서 실행하고 진행 이벤트는 큐로 받아 Tk 타이머에서 표시
+        self.event_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.worker = None
+        self.close_requested = False
+        
+        # 로그는 모아서 한 번에 화면에 추가
+        self.log_buffer = []
+        self.log_flush_pending = False
+        
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
     
     def setup_ui(self):
         """사용자 인터페이스 설정"""
@@ -103,17 +128,59 @@ class DSDHTMLToExcelConverter:
         ttk.Checkbutton(options_frame, text="숫자 자동 인식", 
                        variable=self.detect_numbers).grid(row=1, column=1, sticky=tk.W, padx=(20, 0), pady=(5, 0))
         
+        self.scale_units = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="단위 환산 (천원/백만원 → 원)", 
+                       variable=self.scale_units).grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
+        
+        self.streaming = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="대용량 파일 스트리밍", 
+                       variable=self.streaming).grid(row=2, column=1, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        
+        # 병렬 파싱 프로세스 수
+        worker_frame = ttk.Frame(options_frame)
+        worker_frame.grid(row=3, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Label(worker_frame, text="병렬 작업 수:").grid(row=0, column=0, sticky=tk.W)
+        self.worker_count = tk.IntVar(value=os.cpu_count() or 1)
+        ttk.Spinbox(worker_frame, from_=1, to=max(os.cpu_count() or 1, 1), width=5,
+                   textvariable=self.worker_count).grid(row=0, column=1, padx=(5, 0))
+        
+        # 미리보기/변환/검증이 같은 파일을 다시 파싱하지 않도록 추출 결과 캐시
+        self.use_cache = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options_frame, text="파싱 결과 캐시 사용", 
+                       variable=self.use_cache).grid(row=3, column=1, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        
+        self.skip_layout = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options_frame, text="표지/서명 등 배치용 표 제외", 
+                       variable=self.skip_layout).grid(row=4, column=0, sticky=tk.W, pady=(5, 0))
+        
+        # 공시별 워크북으로 나누면 파싱과 기록을 함께 병렬 처리
+        self.per_file = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="파일별 Excel로 나누기", 
+                       variable=self.per_file).grid(row=4, column=1, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+        
+        # 분석용 열 형식은 테이블별 파일로 출력 폴더에 저장
+        format_frame = ttk.Frame(options_frame)
+        format_frame.grid(row=5, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Label(format_frame, text="출력 형식:").grid(row=0, column=0, sticky=tk.W)
+        self.output_format = tk.StringVar(value='xlsx')
+        ttk.Combobox(format_frame, textvariable=self.output_format, values=OUTPUT_FORMATS,
+                    state='readonly', width=8).grid(row=0, column=1, padx=(5, 0))
+        
         # 변환 실행 버튼
         convert_frame = ttk.Frame(main_frame)
         convert_frame.grid(row=4, column=0, columnspan=3, pady=(10, 0))
         
-        ttk.Button(convert_frame, text="🔄 Excel로 변환", 
-                  command=self.convert_to_excel,
-                  style="Accent.TButton").grid(row=0, column=0, padx=(0, 10))
+        self.convert_button = ttk.Button(convert_frame, text="🔄 Excel로 변환", 
+                                         command=self.convert_to_excel,
+                                         style="Accent.TButton")
+        self.convert_button.grid(row=0, column=0, padx=(0, 10))
+        self.cancel_button = ttk.Button(convert_frame, text="⏹️ 취소", 
+                                        command=self.cancel_conversion, state=tk.DISABLED)
+        self.cancel_button.grid(row=0, column=1, padx=(0, 10))
         ttk.Button(convert_frame, text="📊 미리보기", 
-                  command=self.preview_conversion).grid(row=0, column=1, padx=(0, 10))
+                  command=self.preview_conversion).grid(row=0, column=2, padx=(0, 10))
         ttk.Button(convert_frame, text="📂 출력 폴더 열기", 
-                  command=self.open_output_folder).grid(row=0, column=2)
+                  command=self.open_output_folder).grid(row=0, column=3)
         
         # 진행 상황 표시
         progress_frame = ttk.LabelFrame(main_frame, text="📋 변환 진행 상황", padding="10")
@@ -170,30 +237,40 @@ class DSDHTMLToExcelConverter:
         """HTML 파일들 선택"""
         files = filedialog.askopenfilenames(
             title="DART HTML 파일 선택",
-            filetypes=[("HTML files", "*.html *.htm"), ("All files", "*.*")]
+            filetypes=[("HTML files", "*.html *.htm"), ("DART XML files", "*.xml"), ("All files", "*.*")]
         )
         
         if files:
-            self.html_files.extend(files)
-            self.update_file_list()
-            self.log_message(f"✅ {len(files)}개 HTML 파일 추가됨")
+            added = self.add_html_files(files)
+            self.log_message(f"✅ {added}개 HTML 파일 추가됨")
     
     def select_html_folder(self):
         """HTML 파일이 있는 폴더 선택"""
         folder = filedialog.askdirectory(title="DART HTML 파일 폴더 선택")
         
         if folder:
-            html_files = []
-            for ext in ['*.html', '*.htm']:
-                html_files.extend(Path(folder).glob(ext))
+            html_files = collect_html_files(folder)
             
             if html_files:
-                self.html_files.extend([str(f) for f in html_files])
-                self.update_file_list()
-                self.log_message(f"✅ 폴더에서 {len(html_files)}개 HTML 파일 발견")
+                added = self.add_html_files(html_files)
+                self.log_message(f"✅ 폴더에서 {len(html_files)}개 HTML 파일 발견 "
+                                 f"(새로 추가 {added}개)")
             else:
                 messagebox.showwarning("경고", "선택한 폴더에 HTML 파일이 없습니다.")
     
+    def add_html_files(self, files):
+        """목록에 없는 파일만 추가하고 추가한 개수 반환 (같은 폴더를 다시 선택해도 중복 없음)"""
+        existing = {os.path.abspath(f) for f in self.html_files}
+        added = 0
+        for f in files:
+            path = os.path.abspath(f)
+            if path not in existing:
+                existing.add(path)
+                self.html_files.append(str(f))
+                added += 1
+        self.update_file_list()
+        return added
+    
     def clear_file_list(self):
         """파일 목록 지우기"""
         self.html_files = []
@@ -208,252 +285,184 @@ class DSDHTMLToExcelConverter:
             self.file_listbox.insert(tk.END, file_name)
     
     def convert_to_excel(self):
-        """HTML을 Excel로 변환"""
+        """HTML을 Excel로 변환 (작업 스레드에서 실행)"""
+        if self.is_converting():
+            messagebox.showwarning("경고", "이미 변환이 진행 중입니다.")
+            return
+        
         if not self.html_files:
             messagebox.showwarning("경고", "변환할 HTML 파일을 선택해주세요.")
             return
         
-        # 출력 파일 경로 선택
-        output_file = filedialog.asksaveasfilename(
-            title="Excel 파일 저장",
-            defaultextension=".xlsx",
-            filetypes=[("Excel files", "*.xlsx")]
-        )
+        # 출력 파일 경로 선택 (파일별 변환과 열 형식은 출력 폴더 선택)
+        if self.per_file.get() or self.output_format.get() in COLUMNAR_FORMATS:
+            output_file = filedialog.askdirectory(title="변환 결과를 저장할 폴더 선택")
+        else:
+            output_file = filedialog.asksaveasfilename(
+                title="Excel 파일 저장",
+                defaultextension=".xlsx",
+                filetypes=[("Excel files", "*.xlsx")]
+            )
         
         if not output_file:
             return
         
         self.output_path = output_file
         
-        self.log_message(f"\\n🔄 변환 시작: {len(self.html_files)}개 파일")
-        self.log_message(f"📂 출력 파일: {os.path.basename(output_file)}")
+        # Tk 변수는 UI 스레드에서만 읽으므로 옵션과 파일 목록을 미리 복사
+        options = self.get_conversion_options()
+        html_files = list(self.html_files)
         
+        self.cancel_event.clear()
+        self.progress_var.set(0)
+        self.set_converting(True)
+        
+        self.worker = threading.Thread(target=self.run_conversion,
+                                       args=(html_files, output_file, options), daemon=True)
+        self.worker.start()
+        self.root.after(EVENT_POLL_MS, self.poll_events)
+    
+    def run_conversion(self, html_files, output_file, options):
+        """작업 스레드: 변환 실행 (Tk를 직접 호출하지 않고 이벤트 큐로만 전달)"""
         try:
-            # Excel 워크북 생성
-            workbook = xlsxwriter.Workbook(output_file)
-            
-            # 스타일 정의
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#D9E1F2',
-                'border': 1,
-                'align': 'center'
-            })
-            
-            data_format = workbook.add_format({
-                'border': 1,
-                'align': 'left'
-            })
-            
-            number_format = workbook.add_format({
-                'border': 1,
-                'align': 'right',
-                'num_format': '#,##0'
-            })
-            
-            total_files = len(self.html_files)
-            
-            for i, html_file in enumerate(self.html_files):
-                self.progress_var.set((i / total_files) * 100)
-                self.root.update()
-                
-                file_name = os.path.basename(html_file)
-                self.log_message(f"\\n📄 처리 중: {file_name}")
-                
-                try:
-                    # HTML 파일 읽기
-                    with open(html_file, 'r', encoding='utf-8') as f:
-                        html_content = f.read()
-                    
-                    # HTML 파싱 및 테이블 추출
-                    tables = self.extract_tables_from_html(html_content)
-                    
-                    if not tables:
-                        self.log_message(f"  ⚠️ {file_name}에서 테이블을 찾을 수 없습니다")
-                        continue
-                    
-                    self.log_message(f"  📊 {len(tables)}개 테이블 발견")
-                    
-                    # 테이블을 Excel 시트로 변환
-                    if self.split_by_table.get():
-                        # 테이블별로 별도 시트 생성
-                        for j, table in enumerate(tables):
-                            sheet_name = f"{file_name[:20]}_Table{j+1}"
-                            # Excel 시트명 규칙에 맞게 조정
-                            sheet_name = re.sub(r'[\\\\/*?:\\\\[\\\\]\\n]', '_', sheet_name)[:31]
-                            
-                            worksheet = workbook.add_worksheet(sheet_name)
-                            self.write_table_to_worksheet(worksheet, table, header_format, data_format, number_format)
-                            
-                            self.log_message(f"    ✅ 시트 생성: {sheet_name}")
-                    else:
-                        # 파일별로 하나의 시트에 모든 테이블
-                        sheet_name = file_name[:31].replace('.html', '').replace('.htm', '')
-                        sheet_name = re.sub(r'[\\\\/*?:\\\\[\\\\]\\n]', '_', sheet_name)
-                        
-                        worksheet = workbook.add_worksheet(sheet_name)
-                        
-                        row_offset = 0
-                        for j, table in enumerate(tables):
-                            if j > 0:
-                                row_offset += 2  # 테이블 사이 간격
-                            
-                            rows_written = self.write_table_to_worksheet(
-                                worksheet, table, header_format, data_format, number_format, row_offset)
-                            row_offset += rows_written
-                        
-                        self.log_message(f"    ✅ 시트 생성: {sheet_name}")
-                    
-                except Exception as e:
-                    self.log_message(f"  ❌ {file_name} 처리 실패: {str(e)}")
-                    continue
-            
-            # 워크북 저장
-            workbook.close()
-            
-            self.progress_var.set(100)
-            self.log_message(f"\\n🎉 변환 완료!")
-            self.log_message(f"📂 저장 위치: {output_file}")
-            
-            # 변환 완료 다이얼로그
-            result = messagebox.askyesno("변환 완료", 
-                f"Excel 파일 변환이 완료되었습니다!\\n\\n파일을 열어보시겠습니까?\\n\\n{os.path.basename(output_file)}")
-            
-            if result:
-                self.open_output_file()
-                
+            # 파싱은 프로세스 풀에서, 기록은 하나의 워크북으로
+            summary = convert(html_files, output_file, options,
+                              on_event=self.event_queue.put, cancel=self.cancel_event)
+            self.event_queue.put(('finished', output_file, summary, None))
         except Exception as e:
-            self.log_message(f"❌ 변환 실패: {str(e)}")
-            messagebox.showerror("오류", f"변환 중 오류가 발생했습니다:\\n{str(e)}")
+            self.event_queue.put(('finished', output_file, None, e))
     
-    def extract_tables_from_html(self, html_content):
-        """HTML에서 테이블 추출"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        tables = soup.find_all('table')
+    def poll_events(self):
+        """쌓인 진행 이벤트를 한 번에 처리 (Tk 타이머에서 주기적으로 호출)"""
+        finished = None
+        try:
+            while True:
+                item = self.event_queue.get_nowait()
+                if isinstance(item, ProgressEvent):
+                    self.handle_progress_event(item)
+                else:
+                    finished = item
+        except queue.Empty:
+            pass
         
-        extracted_tables = []
+        if finished is None:
+            self.root.after(EVENT_POLL_MS, self.poll_events)
+        else:
+            self.finish_conversion(*finished[1:])
+    
+    def finish_conversion(self, output_file, summary, error):
+        """변환 종료 처리 (UI 스레드)"""
+        self.set_converting(False)
         
-        for table in tables:
-            try:
-                # pandas read_html 사용
-                df_list = pd.read_html(str(table))
-                
-                if df_list:
-                    df = df_list[0]
-                    
-                    # 데이터 정리 옵션 적용
-                    if self.clean_data.get():
-                        df = self.clean_dataframe(df)
-                    
-                    # 숫자 인식 옵션 적용
-                    if self.detect_numbers.get():
-                        df = self.convert_numbers(df)
-                    
-                    # 의미있는 크기의 테이블만 추가
-                    if len(df) > 0 and len(df.columns) > 0:
-                        extracted_tables.append(df)
-                        
-            except Exception as e:
-                # pandas로 읽기 실패시 직접 파싱 시도
-                try:
-                    df = self.parse_table_manually(table)
-                    if df is not None and len(df) > 0:
-                        extracted_tables.append(df)
-                except:
-                    continue
-        
-        return extracted_tables
+        if self.close_requested:
+            self.root.destroy()
+            return
+        
+        if error is not None:
+            self.log_message(f"❌ 변환 실패: {str(error)}")
+            self.flush_log()
+            messagebox.showerror("오류", f"변환 중 오류가 발생했습니다:\n{str(error)}")
+            return
+        
+        self.log_message(f"📂 저장 위치: {output_file}")
+        self.log_message(f"📋 변환 {summary['converted']}개 / 실패 {summary['failed']}개 파일, "
+                         f"시트 {len(summary['sheets'])}개")
+        to_folder = os.path.isdir(output_file)
+        if to_folder and not all(path.endswith('.xlsx') for path in summary['outputs']):
+            self.log_message(f"💾 테이블 파일 {len(summary['outputs'])}개 저장")
+        elif len(summary['outputs']) > 1:
+            self.log_message(f"💾 워크북 {len(summary['outputs'])}개 저장")
+        if summary['index']:
+            self.log_message(f"🗂️ 색인: {os.path.basename(summary['index'])}")
+        self.flush_log()
+        
+        if summary['cancelled']:
+            messagebox.showinfo("변환 취소", 
+                f"변환이 취소되었습니다.\n처리한 파일까지 저장했습니다.\n\n{os.path.basename(output_file)}")
+            return
+        
+        # 변환 완료 다이얼로그
+        target = "출력 폴더를" if to_folder else "파일을"
+        result = messagebox.askyesno("변환 완료", 
+            f"변환이 완료되었습니다!\n\n{target} 열어보시겠습니까?\n\n{os.path.basename(output_file)}")
+        
+        if result:
+            self.open_output_file()
+    
+    def cancel_conversion(self):
+        """진행 중인 변환 취소 요청 (현재 테이블까지 기록 후 중단)"""
+        if self.is_converting():
+            self.cancel_event.set()
+            self.cancel_button.config(state=tk.DISABLED)
+            self.log_message("⏹️ 취소 요청됨 - 현재 작업을 마무리하는 중...")
+    
+    def is_converting(self):
+        """작업 스레드가 실행 중인지 여부"""
+        return self.worker is not None and self.worker.is_alive()
+    
+    def set_converting(self, converting):
+        """변환 중 버튼 상태 전환"""
+        self.convert_button.config(state=tk.DISABLED if converting else tk.NORMAL)
+        self.cancel_button.config(state=tk.NORMAL if converting else tk.DISABLED)
+    
+    def on_close(self):
+        """창 닫기: 변환 중이면 취소하고 워크북 저장이 끝난 뒤 종료"""
+        if self.is_converting():
+            if not messagebox.askyesno("종료", "변환이 진행 중입니다. 취소하고 종료하시겠습니까?"):
+                return
+            self.close_requested = True
+            self.cancel_conversion()
+            return
+        self.root.destroy()
+    
+    def get_conversion_options(self):
+        """GUI 옵션을 변환 엔진 옵션으로 변환"""
+        return ConversionOptions(
+            preserve_formatting=self.preserve_formatting.get(),
+            split_by_table=self.split_by_table.get(),
+            clean_data=self.clean_data.get(),
+            detect_numbers=self.detect_numbers.get(),
+            scale_units=self.scale_units.get(),
+            skip_layout=self.skip_layout.get(),
+            streaming=self.streaming.get(),
+            workers=self.worker_count.get(),
+            cache_dir=str(default_cache_dir()) if self.use_cache.get() else None,
+            per_file=self.per_file.get(),
+            output_format=self.output_format.get()
+        )
+    
+    def handle_progress_event(self, event):
+        """변환 엔진의 진행 이벤트 표시"""
+        self.progress_var.set(event.progress)
+        if event.kind in ('file', 'done'):
+            self.log_message(f"\n{event.message}")
+        else:
+            self.log_message(event.message)
+    
+    def extract_tables_from_html(self, html_content):
+        """HTML에서 테이블 추출"""
+        return extract_tables(html_content,
+                              clean_data=self.clean_data.get(),
+                              detect_numbers=self.detect_numbers.get(),
+                              scale_units=self.scale_units.get(),
+                              skip_layout=self.skip_layout.get())
     
     def clean_dataframe(self, df):
         """데이터프레임 정리"""
-        # 문자열 컬럼의 공백 제거
-        for col in df.select_dtypes(include=['object']).columns:
-            df[col] = df[col].astype(str).str.strip()
-            # 'nan' 문자열을 실제 NaN으로 변환
-            df[col] = df[col].replace('nan', np.nan)
-        
-        return df
+        return clean_dataframe(df)
     
     def convert_numbers(self, df):
         """숫자 자동 인식 및 변환"""
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                # 숫자 패턴 확인 (콤마 포함)
-                try:
-                    # 콤마 제거 후 숫자 변환 시도
-                    cleaned_series = df[col].astype(str).str.replace(',', '').str.replace('\\s+', '', regex=True)
-                    
-                    # 숫자로 변환 가능한지 확인
-                    numeric_series = pd.to_numeric(cleaned_series, errors='coerce')
-                    
-                    # 50% 이상이 숫자로 변환 가능하면 적용
-                    if numeric_series.notna().sum() / len(df) > 0.5:
-                        df[col] = numeric_series
-                        
-                except:
-                    continue
-        
-        return df
+        return convert_numbers(df)
     
     def parse_table_manually(self, table):
         """수동으로 테이블 파싱"""
-        rows = table.find_all('tr')
-        if not rows:
-            return None
-        
-        data = []
-        for row in rows:
-            cells = row.find_all(['td', 'th'])
-            row_data = [cell.get_text(strip=True) for cell in cells]
-            if row_data:  # 빈 행 제외
-                data.append(row_data)
-        
-        if not data:
-            return None
-        
-        # 최대 컬럼 수 찾기
-        max_cols = max(len(row) for row in data)
-        
-        # 모든 행을 같은 길이로 맞추기
-        for row in data:
-            while len(row) < max_cols:
-                row.append('')
-        
-        # DataFrame 생성
-        df = pd.DataFrame(data[1:], columns=data[0] if len(data) > 1 else None)
-        
-        return df
+        return parse_table_manually(table)
     
     def write_table_to_worksheet(self, worksheet, df, header_format, data_format, number_format, start_row=0):
         """테이블을 워크시트에 쓰기"""
-        current_row = start_row
-        
-        # 헤더 쓰기
-        for col_idx, col_name in enumerate(df.columns):
-            worksheet.write(current_row, col_idx, str(col_name), header_format)
-        
-        current_row += 1
-        
-        # 데이터 쓰기
-        for row_idx, row in df.iterrows():
-            for col_idx, value in enumerate(row):
-                # 숫자인지 확인하여 적절한 형식 적용
-                if pd.notna(value) and isinstance(value, (int, float)):
-                    worksheet.write(current_row, col_idx, value, number_format)
-                else:
-                    worksheet.write(current_row, col_idx, str(value) if pd.notna(value) else '', data_format)
-            
-            current_row += 1
-        
-        # 컬럼 너비 자동 조정
-        for col_idx, col_name in enumerate(df.columns):
-            max_width = max(
-                len(str(col_name)),
-                df.iloc[:, col_idx].astype(str).str.len().max() if len(df) > 0 else 0
-            )
-            worksheet.set_column(col_idx, col_idx, min(max_width + 2, 50))
-        
-        return current_row - start_row
+        return write_table_to_worksheet(worksheet, df, header_format, data_format,
+                                        number_format, start_row)
     
     def preview_conversion(self):
         """변환 미리보기"""
@@ -465,10 +474,22 @@ class DSDHTMLToExcelConverter:
         first_file = self.html_files[0]
         
         try:
-            with open(first_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            tables = self.extract_tables_from_html(html_content)
+            # 스트리밍 파싱하며 처음 5개 테이블만 보관
+            # (캐시 사용 시 끝까지 파싱해 두어 이후 변환은 캐시에서 읽음)
+            cache = open_table_cache() if self.use_cache.get() else None
+            stream = iter_tables_from_file(first_file,
+                                           clean_data=self.clean_data.get(),
+                                           detect_numbers=self.detect_numbers.get(),
+                                           scale_units=self.scale_units.get(),
+                                           skip_layout=self.skip_layout.get(),
+                                           cache=cache)
+            tables = []
+            for table in stream:
+                if len(tables) < 5:
+                    tables.append(table)
+                elif cache is None:
+                    break
+            stream.close()
             
             if not tables:
                 messagebox.showinfo("미리보기", "선택한 파일에서 테이블을 찾을 수 없습니다.")
@@ -483,9 +504,11 @@ class DSDHTMLToExcelConverter:
             notebook = ttk.Notebook(preview_window)
             notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
             
-            for i, table in enumerate(tables[:5]):  # 처음 5개 테이블만 미리보기
+            for i, table in enumerate(tables):  # 처음 5개 테이블만 미리보기
                 tab_frame = ttk.Frame(notebook)
-                notebook.add(tab_frame, text=f"테이블 {i+1}")
+                statement_type = table.attrs.get('statement_type')
+                notebook.add(tab_frame, text=f"테이블 {i+1} ({statement_type})" if statement_type
+                             else f"테이블 {i+1}")
                 
                 # 테이블 표시용 텍스트 위젯
                 text_widget = scrolledtext.ScrolledText(tab_frame, wrap=tk.NONE, font=("Courier", 9))
@@ -499,12 +522,12 @@ class DSDHTMLToExcelConverter:
             self.log_message(f"📊 미리보기 표시: {len(tables)}개 테이블 (최대 5개)")
             
         except Exception as e:
-            messagebox.showerror("오류", f"미리보기 실패:\\n{str(e)}")
+            messagebox.showerror("오류", f"미리보기 실패:\n{str(e)}")
     
     def open_output_folder(self):
         """출력 폴더 열기"""
         if self.output_path and os.path.exists(self.output_path):
-            folder_path = os.path.dirname(self.output_path)
+            folder_path = output_folder(self.output_path)
             
             # 운영체제별로 폴더 열기
             import subprocess
@@ -527,6 +550,10 @@ class DSDHTMLToExcelConverter:
     
     def open_output_file(self):
         """출력 파일 열기"""
+        if self.output_path and os.path.isdir(self.output_path):
+            # 파일별 변환/열 형식은 결과 파일이 여러 개이므로 폴더를 엶
+            self.open_output_folder()
+            return
         if self.output_path and os.path.exists(self.output_path):
             import subprocess
             import platform
@@ -542,7 +569,7 @@ class DSDHTMLToExcelConverter:
                     
                 self.log_message(f"📂 Excel 파일 열기: {os.path.basename(self.output_path)}")
             except Exception as e:
-                messagebox.showerror("오류", f"파일 열기 실패:\\n{str(e)}")
+                messagebox.showerror("오류", f"파일 열기 실패:\n{str(e)}")
     
     def show_help(self):
         """도움말 표시"""
@@ -586,7 +613,7 @@ HTML 감사보고서를 Excel 파일로 변환하는 핵심 도구
 • 다양한 변환 옵션 제공
 • 실시간 진행 상황 표시
 
-🛠️ 개발: Python 3.x + BeautifulSoup + pandas + xlsxwriter
+🛠️ 개발: Python 3.x + lxml + pandas + xlsxwriter
 📅 업데이트: 2025년 6월 23일
 
 💡 원본 Excel Add-in의 핵심 기능을 Python으로 재구현
@@ -594,13 +621,23 @@ HTML 감사보고서를 Excel 파일로 변환하는 핵심 도구
         messagebox.showinfo("정보", about_text)
     
     def log_message(self, message):
-        """로그 메시지 추가"""
+        """로그 메시지 추가 (UI 스레드 전용, 화면 갱신은 모아서 한 번에)"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\\n"
+        self.log_buffer.append(f"[{timestamp}] {message}\n")
+        
+        if not self.log_flush_pending:
+            self.log_flush_pending = True
+            self.root.after(LOG_FLUSH_MS, self.flush_log)
+    
+    def flush_log(self):
+        """모아둔 로그를 한 번에 화면에 추가"""
+        self.log_flush_pending = False
+        if not self.log_buffer:
+            return
         
-        self.log_text.insert(tk.END, log_entry)
+        self.log_text.insert(tk.END, ''.join(self.log_buffer))
+        self.log_buffer.clear()
         self.log_text.see(tk.END)
-        self.root.update()
     
     def run(self):
         """애플리케이션 실행"""
@@ -0,0 +1,707 @@
+#!/usr/bin/env python3
+"""
+🏭 DSD Breaker 일괄 변환 엔진
+여러 DART HTML 파일을 프로세스 풀에서 병렬 파싱하고 하나의 Excel 파일(또는 파일별 Excel)로 기록
+"""
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import xlsxwriter
+from xlsxwriter.worksheet import Worksheet
+
+from dsd_breaker_cache import DEFAULT_CACHE_SIZE_MB, open_table_cache
+from dsd_breaker_export import (COLUMNAR_FORMATS, INDEX_NAME, TableFileWriter, check_output_format,
+                                column_parse_ratios)
+from dsd_breaker_extractor import extract_tables_from_file, iter_tables_from_source
+from dsd_breaker_io import open_html_source
+from dsd_breaker_numbers import partial_columns
+from dsd_breaker_profile import add_stage, describe_report, profiled, run_report, save_report
+
+# Excel 시트명에 사용할 수 없는 문자
+_RE_INVALID_SHEET_CHARS = re.compile(r'[\\/*?:\[\]\n]')
+
+
+@dataclass
+class ConversionOptions:
+    """HTML → Excel 변환 옵션"""
+    preserve_formatting: bool = True
+    split_by_table: bool = True
+    clean_data: bool = True
+    detect_numbers: bool = True
+    scale_units: bool = False      # 캡션의 단위(천원/백만원)로 금액 환산
+    skip_layout: bool = True       # 표지/서명/페이지 배치용 표 제외
+    streaming: bool = False        # 대용량 파일: 테이블을 하나씩 파싱/기록 후 해제
+    workers: Optional[int] = None  # None이면 CPU 코어 수
+    cache_dir: Optional[str] = None  # 파싱 결과 캐시 폴더 (None이면 캐시 사용 안 함)
+    cache_size_mb: int = DEFAULT_CACHE_SIZE_MB
+    per_file: bool = False           # 파일(공시)별 워크북으로 나누어 병렬 기록 (출력은 폴더)
+    max_tables: Optional[int] = None  # 워크북당 최대 테이블 수 (초과 시 이름_002.xlsx로 분할)
+    write_index: bool = False        # 시트 ↔ 원본 테이블 색인 JSON 저장 (분할 시 항상 저장)
+    output_format: str = 'xlsx'      # 'xlsx' 또는 테이블별 파일 'parquet', 'arrow', 'csv' (출력은 폴더)
+    report_file: Optional[str] = None   # 단계별 시간/처리량 보고서 JSON 경로
+    profile_file: Optional[str] = None  # cProfile(.prof) 또는 pyinstrument(.html) 결과 경로
+
+    @classmethod
+    def from_dict(cls, values):
+        """dict에서 옵션 생성 (알 수 없는 키는 오류)"""
+        names = {f.name for f in fields(cls)}
+        unknown = set(values) - names
+        if unknown:
+            raise ValueError(f"알 수 없는 변환 옵션: {', '.join(sorted(unknown))}")
+        return cls(**values)
+
+
+@dataclass
+class ProgressEvent:
+    """변환 진행 이벤트 (GUI/CLI 표시용)"""
+    kind: str          # 'start', 'file', 'stats', 'tables', 'sheet', 'warning', 'error', 'cancelled', 'done'
+    message: str
+    progress: float    # 0 ~ 100
+    file_name: str = ''
+
+
+def open_options_cache(options):
+    """옵션에 캐시 폴더가 지정된 경우 캐시 열기"""
+    if options.cache_dir is None:
+        return None
+    return open_table_cache(options.cache_dir, options.cache_size_mb)
+
+
+def parse_file(html_file, options):
+    """HTML 파일 하나를 읽고 테이블 추출 (프로세스 풀 작업 단위)"""
+    try:
+        tables, stats = extract_tables_from_file(html_file,
+                                                 clean_data=options.clean_data,
+                                                 detect_numbers=options.detect_numbers,
+                                                 scale_units=options.scale_units,
+                                                 skip_layout=options.skip_layout,
+                                                 cache=open_options_cache(options))
+        return html_file, tables, None, stats
+
+    except Exception as e:
+        return html_file, [], str(e), None
+
+
+def iter_streamed_files(html_files, options):
+    """파일별 테이블 생성기를 순서대로 반환 (테이블은 기록 시점에 하나씩 파싱)"""
+    cache = open_options_cache(options)
+    for html_file in html_files:
+        try:
+            source = open_html_source(html_file)
+        except Exception as e:
+            yield html_file, [], str(e), None
+            continue
+
+        # 측정값(source.stats)은 생성기를 끝까지 소비한 뒤 채워짐
+        tables = iter_tables_from_source(source,
+                                         clean_data=options.clean_data,
+                                         detect_numbers=options.detect_numbers,
+                                         scale_units=options.scale_units,
+                                         skip_layout=options.skip_layout,
+                                         cache=cache)
+        yield html_file, tables, None, source.stats
+
+
+def iter_parsed_files(html_files, options):
+    """파일별 추출 결과를 입력 순서대로 반환 (완료되는 대로 스트리밍)"""
+    if options.streaming:
+        # 테이블을 기록 직후 해제해야 하므로 프로세스 풀 없이 순차 처리
+        yield from iter_streamed_files(html_files, options)
+        return
+
+    yield from map_ordered(parse_file, html_files, [options] * len(html_files),
+                           workers=_worker_count(options, len(html_files)))
+
+
+def _worker_count(options, task_count):
+    """실제 사용할 프로세스 수"""
+    workers = options.workers or os.cpu_count() or 1
+    return min(workers, task_count)
+
+
+def map_ordered(func, *arg_lists, workers=1):
+    """작업을 프로세스 풀에서 실행하고 결과를 입력 순서대로 반환 (작업자 1개면 현재 프로세스)"""
+    if workers <= 1:
+        yield from map(func, *arg_lists)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # map은 입력 순서를 유지하므로 시트/워크북 순서가 항상 동일
+        yield from executor.map(func, *arg_lists)
+    finally:
+        # 취소로 중간에 닫히면 아직 시작하지 않은 파일은 처리하지 않음
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def sanitize_sheet_name(sheet_name):
+    """Excel 시트명 규칙에 맞게 조정"""
+    return _RE_INVALID_SHEET_CHARS.sub('_', sheet_name)[:31]
+
+
+def table_sheet_name(file_name, table_number, df):
+    """테이블별 시트명 (재무제표 종류 태그가 잘리지 않도록 파일명 부분을 줄임)"""
+    suffix = f"_Table{table_number}"
+    statement_type = df.attrs.get('statement_type')
+    if statement_type:
+        suffix += f"_{statement_type}"
+    return sanitize_sheet_name(file_name[:min(20, 31 - len(suffix))] + suffix)
+
+
+def _number_width(series):
+    """숫자 컬럼의 표시 너비 (#,##0 서식 기준, 최솟값/최댓값으로 계산)"""
+    values = series.dropna()
+    if values.empty:
+        return 0
+    return max(len(f"{values.min():,.0f}"), len(f"{values.max():,.0f}"))
+
+
+def _is_number_value(value):
+    """셀 값이 숫자인지 (numpy.int64/float64 포함, bool 제외)"""
+    return pd.api.types.is_number(value) and not pd.api.types.is_bool(value)
+
+
+def classify_columns(df):
+    """컬럼 단위로 한 번만 분류하여 (종류, 값 목록, 너비) 목록 반환"""
+    columns = []
+
+    for col_idx in range(len(df.columns)):
+        series = df.iloc[:, col_idx]
+        is_number = (pd.api.types.is_numeric_dtype(series.dtype)
+                     and not pd.api.types.is_bool_dtype(series.dtype))
+
+        if is_number:
+            # NaN은 None으로 바꿔 빈 셀로 기록
+            values = series.astype(object).where(series.notna(), None).tolist()
+            columns.append(('number', values, _number_width(series)))
+            continue
+
+        non_null = series.dropna()
+        if series.dtype == object and non_null.map(_is_number_value).any():
+            # 숫자와 문자열이 섞인 컬럼은 셀 단위로 서식 결정
+            values = series.astype(object).where(series.notna(), None).tolist()
+            width = int(non_null.astype(str).str.len().max())
+            columns.append(('mixed', values, width))
+            continue
+
+        text = series.astype(object).where(series.notna(), '').astype(str)
+        width = int(text.str.len().max()) if len(text) > 0 else 0
+        columns.append(('text', text.tolist(), width))
+
+    return columns
+
+
+def write_table_to_worksheet(worksheet, df, header_format, data_format, number_format, start_row=0):
+    """테이블을 워크시트에 쓰기 (컬럼 단위 분류 후 행 단위 일괄 기록)"""
+    columns = classify_columns(df)
+    formats = {'number': number_format, 'text': data_format}
+
+    # 같은 서식의 연속 컬럼을 묶어 write_row 한 번으로 기록
+    runs = []
+    for col_idx, (kind, _, _) in enumerate(columns):
+        if kind != 'mixed' and runs and runs[-1][2] == kind:
+            runs[-1][1] = col_idx + 1
+        else:
+            runs.append([col_idx, col_idx + 1, kind])
+
+    # 헤더 쓰기
+    worksheet.write_row(start_row, 0, [str(col_name) for col_name in df.columns], header_format)
+
+    # 데이터 쓰기 (constant_memory 모드를 위해 행 순서대로 기록)
+    current_row = start_row + 1
+    for row in zip(*(values for _, values, _ in columns)):
+        for first, last, kind in runs:
+            if kind == 'mixed':
+                value = row[first]
+                if _is_number_value(value):
+                    worksheet.write_number(current_row, first, value, number_format)
+                else:
+                    worksheet.write(current_row, first, '' if value is None else str(value), data_format)
+            else:
+                worksheet.write_row(current_row, first, row[first:last], formats[kind])
+        current_row += 1
+
+    # 컬럼 너비 자동 조정 (분류 단계에서 계산한 너비 사용)
+    for col_idx, (col_name, (_, _, width)) in enumerate(zip(df.columns, columns)):
+        max_width = max(len(str(col_name)), width)
+        worksheet.set_column(col_idx, col_idx, min(max_width + 2, 50))
+
+    return current_row - start_row
+
+
+# constant_memory 시트의 임시 파일을 기록 직후 닫을 수 있는지 (xlsxwriter 내부 API 기능 감지)
+CAN_RELEASE_WORKSHEETS = hasattr(Worksheet, '_opt_close') and hasattr(Worksheet, '_opt_reopen')
+
+
+class ExcelBookWriter:
+    """추출된 테이블을 xlsxwriter 워크북에 기록 (max_tables마다 다음 워크북으로 분할 가능)"""
+
+    def __init__(self, output_file, max_tables=None):
+        self.output_file = str(output_file)
+        self.max_tables = max_tables
+        self.paths = []       # 생성한 워크북 경로 (분할 시 여러 개)
+        self.records = []     # 시트 ↔ 원본 테이블 대응 (색인용)
+        self.workbook = None
+        self._open_workbook()
+
+    def _open_workbook(self):
+        """다음 워크북 열기 (두 번째부터 이름_002.xlsx)"""
+        if self.workbook is not None:
+            self.workbook.close()
+
+        path = self.output_file
+        if self.paths:
+            stem, ext = os.path.splitext(self.output_file)
+            path = f"{stem}_{len(self.paths) + 1:03d}{ext or '.xlsx'}"
+        self.paths.append(path)
+
+        # 행 단위로 임시 파일에 기록하여 메모리 사용량을 일정하게 유지
+        self.workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        self.sheet_names = set()  # Excel 시트명은 대소문자 구분 없음
+        self.book_tables = 0
+
+        # 스타일 정의
+        self.header_format = self.workbook.add_format({
+            'bold': True,
+            'bg_color': '#D9E1F2',
+            'border': 1,
+            'align': 'center'
+        })
+
+        self.data_format = self.workbook.add_format({
+            'border': 1,
+            'align': 'left'
+        })
+
+        self.number_format = self.workbook.add_format({
+            'border': 1,
+            'align': 'right',
+            'num_format': '#,##0'
+        })
+
+    @property
+    def current_path(self):
+        """현재 기록 중인 워크북 경로"""
+        return self.paths[-1]
+
+    def unique_sheet_name(self, sheet_name):
+        """31자 제한으로 잘린 이름이 겹치지 않도록 ~2, ~3 접미사 추가"""
+        name = sanitize_sheet_name(sheet_name)
+        candidate = name
+        number = 1
+        while candidate.lower() in self.sheet_names:
+            number += 1
+            suffix = f"~{number}"
+            candidate = name[:31 - len(suffix)] + suffix
+        self.sheet_names.add(candidate.lower())
+        return candidate
+
+    def add_worksheet(self, sheet_name):
+        """시트 추가 (워크북당 테이블 수가 max_tables에 도달하면 다음 워크북으로 넘어감)"""
+        if self.max_tables and self.book_tables >= self.max_tables:
+            self._open_workbook()
+        sheet_name = self.unique_sheet_name(sheet_name)
+        return self.workbook.add_worksheet(sheet_name), sheet_name
+
+    def write_table(self, worksheet, df, start_row=0):
+        """워크시트에 테이블 하나 기록"""
+        self.book_tables += 1
+        return write_table_to_worksheet(worksheet, df, self.header_format,
+                                        self.data_format, self.number_format, start_row)
+
+    def _record(self, source, table_number, sheet_name, df, start_row):
+        """색인에 테이블 위치 기록"""
+        self.records.append({
+            'workbook': self.current_path,
+            'sheet': sheet_name,
+            'start_row': start_row,
+            'source': source,
+            'table': table_number,
+            'statement_type': df.attrs.get('statement_type'),
+            'rows': len(df),
+            'columns': len(df.columns),
+            'parse_ratios': column_parse_ratios(df),
+        })
+
+    def write_file_tables(self, file_name, tables, split_by_table, source=None):
+        """파일 하나의 테이블을 시트로 기록하고 (생성된 시트명, 테이블 수) 반환
+
+        tables는 리스트 또는 생성기이며, 기록한 테이블은 바로 참조를 놓아 해제한다.
+        """
+        source = source or file_name
+        sheet_names = []
+        table_count = 0
+
+        if split_by_table:
+            # 테이블별로 별도 시트 생성
+            for table in tables:
+                table_count += 1
+                worksheet, sheet_name = self.add_worksheet(
+                    table_sheet_name(file_name, table_count, table))
+                self.write_table(worksheet, table)
+                self.release_worksheet(worksheet)
+                self._record(source, table_count, sheet_name, table, 0)
+                sheet_names.append(sheet_name)
+                del table  # 다음 테이블 파싱 전에 해제 (스트리밍 시 최대 1개만 메모리에 유지)
+            return sheet_names, table_count
+
+        # 파일별로 하나의 시트에 모든 테이블 (첫 테이블이 나올 때 시트 생성)
+        worksheet = None
+        row_offset = 0
+        for table in tables:
+            if worksheet is None:
+                worksheet, sheet_name = self.add_worksheet(
+                    file_name[:31].replace('.html', '').replace('.htm', ''))
+                sheet_names.append(sheet_name)
+            else:
+                row_offset += 2  # 테이블 사이 간격
+            table_count += 1
+            self._record(source, table_count, sheet_name, table, row_offset)
+            row_offset += self.write_table(worksheet, table, row_offset)
+            del table  # 다음 테이블 파싱 전에 해제
+
+        if worksheet is not None:
+            self.release_worksheet(worksheet)
+
+        return sheet_names, table_count
+
+    def release_worksheet(self, worksheet):
+        """다 쓴 시트의 임시 파일 핸들 닫기 (시트가 많아도 파일 핸들이 고갈되지 않도록)"""
+        # xlsxwriter에는 공개 API가 없어 내부 메서드를 기능 감지로 사용 (저장 시 _opt_reopen으로 다시 엶)
+        # 둘 중 하나라도 없는 버전에서는 닫지 않음: 결과는 같고, 임시 파일 핸들이 저장 때까지 시트 수만큼 열려 있음
+        if CAN_RELEASE_WORKSHEETS:
+            worksheet._opt_close()
+
+    def close(self):
+        """워크북 저장"""
+        self.workbook.close()
+
+
+def open_table_writer(output, options):
+    """출력 형식에 맞는 writer (xlsx는 워크북, 열 형식은 출력 폴더에 테이블별 파일)"""
+    if options.output_format in COLUMNAR_FORMATS:
+        return TableFileWriter(output, options.output_format)
+    return ExcelBookWriter(output, options.max_tables)
+
+
+def write_file_timed(writer, file_name, tables, split_by_table, source, stats):
+    """파일 하나의 테이블을 기록하고 기록 시간을 stats에 누적
+
+    스트리밍 시에는 기록 중에 파싱이 일어나므로 그 사이 늘어난 파싱 시간을 제외한다.
+    """
+    parse_before = stats.parse_seconds if stats is not None else 0.0
+    start = time.perf_counter()
+    try:
+        return writer.write_file_tables(file_name, tables, split_by_table, source=source)
+    finally:
+        if stats is not None:
+            elapsed = time.perf_counter() - start
+            add_stage(stats, 'write', max(elapsed - (stats.parse_seconds - parse_before), 0.0))
+
+
+def finish_summary(summary, options, wall_seconds, notify):
+    """실행 보고서를 요약에 추가하고 로그/파일로 출력"""
+    summary['profile'] = run_report(summary['file_stats'], wall_seconds)
+    if summary['file_stats']:
+        notify(ProgressEvent('stats', f"📈 처리량: {describe_report(summary['profile'])}", 100))
+    if options.report_file:
+        save_report(summary['profile'], options.report_file)
+        notify(ProgressEvent('stats', f"🧾 측정 보고서 저장: {options.report_file}", 100))
+
+
+def write_index(index_file, records):
+    """시트 ↔ 원본 테이블 색인을 JSON으로 저장"""
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump({'tables': records}, f, ensure_ascii=False, indent=2)
+
+
+def parse_ratio_warnings(records):
+    """색인 기록 중 숫자로 변환했지만 일부 셀을 읽지 못한 열 (읽지 못한 셀은 빈 값으로 기록됨)"""
+    messages = []
+    for record in records:
+        partial = partial_columns(record.get('parse_ratios') or {})
+        if partial:
+            columns = ', '.join(f"{column} {ratio:.0%}" for column, ratio in partial.items())
+            messages.append(f"  🔢 Table{record['table']} 숫자 변환 비율: {columns} (나머지 셀은 빈 값)")
+    return messages
+
+
+def _stop_on_cancel(tables, cancel):
+    """취소가 요청되면 남은 테이블을 생략"""
+    for table in tables:
+        if cancel.is_set():
+            break
+        yield table
+
+
+def convert_batch(html_files, output_file, options=None, on_event=None, cancel=None):
+    """HTML 파일들을 병렬로 파싱하여 하나의 Excel 파일로 변환
+
+    cancel(threading.Event 등)이 설정되면 현재 파일까지 기록하고 중단한다.
+    """
+    options = options or ConversionOptions()
+    notify = on_event or (lambda event: None)
+    check_output_format(options.output_format)
+    run_start = time.perf_counter()
+    columnar = options.output_format in COLUMNAR_FORMATS
+    if options.per_file and not columnar:
+        # 열 형식은 이미 테이블별 파일이므로 파일별 분할이 필요 없음
+        return convert_per_file(html_files, output_file, options, notify, cancel)
+
+    total_files = len(html_files)
+
+    summary = {'files': total_files, 'converted': 0, 'failed': 0, 'sheets': [], 'file_stats': [],
+               'cancelled': False, 'outputs': [], 'index': None}
+
+    notify(ProgressEvent('start', f"🔄 변환 시작: {total_files}개 파일", 0))
+    if columnar:
+        notify(ProgressEvent('start', f"📂 출력 폴더: {output_file} ({options.output_format})", 0))
+    else:
+        notify(ProgressEvent('start', f"📂 출력 파일: {os.path.basename(output_file)}", 0))
+
+    writer = open_table_writer(output_file, options)
+    results = iter_parsed_files(html_files, options)
+
+    try:
+        for i, (html_file, tables, error, stats) in enumerate(results):
+            file_name = os.path.basename(html_file)
+            progress = (i / total_files) * 100
+
+            if cancel is not None and cancel.is_set():
+                summary['cancelled'] = True
+                notify(ProgressEvent('cancelled', f"⏹️ 변환 취소: {i}/{total_files}개 파일 처리됨",
+                                     progress))
+                break
+
+            notify(ProgressEvent('file', f"📄 처리 중: {file_name}", progress, file_name))
+
+            if error:
+                summary['failed'] += 1
+                notify(ProgressEvent('error', f"  ❌ {file_name} 처리 실패: {error}", progress, file_name))
+                continue
+
+            if cancel is not None:
+                # 대용량 파일도 테이블 단위로 취소에 응답
+                tables = _stop_on_cancel(tables, cancel)
+
+            first_record = len(writer.records)
+            try:
+                sheet_names, table_count = write_file_timed(writer, file_name, tables,
+                                                            options.split_by_table, html_file, stats)
+            except Exception as e:
+                summary['failed'] += 1
+                notify(ProgressEvent('error', f"  ❌ {file_name} 처리 실패: {str(e)}", progress, file_name))
+                continue
+            finally:
+                del tables
+
+            if stats is not None:
+                summary['file_stats'].append(asdict(stats))
+                notify(ProgressEvent('stats', f"  ⏱️ {stats.describe()}", progress, file_name))
+                for message in stats.warnings:
+                    notify(ProgressEvent('warning', f"  ⚠️ {message}", progress, file_name))
+
+            if table_count == 0:
+                notify(ProgressEvent('warning', f"  ⚠️ {file_name}에서 테이블을 찾을 수 없습니다",
+                                     progress, file_name))
+                continue
+
+            notify(ProgressEvent('tables', f"  📊 {table_count}개 테이블 발견", progress, file_name))
+            for message in parse_ratio_warnings(writer.records[first_record:]):
+                notify(ProgressEvent('warning', message, progress, file_name))
+
+            summary['converted'] += 1
+            summary['sheets'].extend(sheet_names)
+            for sheet_name in sheet_names:
+                label = "파일 생성" if columnar else "시트 생성"
+                notify(ProgressEvent('sheet', f"    ✅ {label}: {sheet_name}", progress, file_name))
+
+    finally:
+        # 남은 파싱 작업 정리 후 워크북 저장 (취소 시 처리한 파일까지 저장)
+        results.close()
+        writer.close()
+
+    summary['outputs'] = writer.paths
+    if columnar:
+        # 테이블별 파일을 찾을 수 있도록 색인은 항상 저장
+        summary['index'] = str(Path(output_file) / INDEX_NAME)
+        write_index(summary['index'], writer.records)
+        notify(ProgressEvent('sheet', f"🗂️ 색인 저장: {summary['index']}", 100))
+    elif len(writer.paths) > 1:
+        notify(ProgressEvent('sheet', f"💾 워크북 {len(writer.paths)}개로 분할 저장 "
+                                      f"(워크북당 최대 {options.max_tables}개 테이블)", 100))
+
+    if not columnar and (options.write_index or len(writer.paths) > 1):
+        summary['index'] = f"{os.path.splitext(output_file)[0]}_index.json"
+        write_index(summary['index'], writer.records)
+        notify(ProgressEvent('sheet', f"🗂️ 색인 저장: {os.path.basename(summary['index'])}", 100))
+
+    finish_summary(summary, options, time.perf_counter() - run_start, notify)
+    if not summary['cancelled']:
+        notify(ProgressEvent('done', "🎉 변환 완료!", 100))
+    return summary
+
+
+def write_file_workbook(html_file, output_file, options):
+    """HTML 파일 하나를 파싱하여 자체 워크북으로 기록 (프로세스 풀 작업 단위)"""
+    result = {'file': html_file, 'error': None, 'sheets': [], 'tables': 0, 'paths': [],
+              'records': [], 'stats': None}
+    try:
+        if options.streaming:
+            # 작업자마다 테이블을 하나씩 파싱/기록하므로 병렬이어도 메모리 사용량이 작음
+            source = open_html_source(html_file)
+            stats = source.stats
+            tables = iter_tables_from_source(source,
+                                             clean_data=options.clean_data,
+                                             detect_numbers=options.detect_numbers,
+                                             scale_units=options.scale_units,
+                                             skip_layout=options.skip_layout,
+                                             cache=open_options_cache(options))
+        else:
+            _, tables, error, stats = parse_file(html_file, options)
+            if error:
+                result['error'] = error
+                return result
+
+        writer = ExcelBookWriter(output_file, options.max_tables)
+        try:
+            result['sheets'], result['tables'] = write_file_timed(
+                writer, os.path.basename(html_file), tables, options.split_by_table, html_file, stats)
+        finally:
+            writer.close()
+
+        result['paths'] = writer.paths
+        result['records'] = writer.records
+        result['stats'] = stats
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+
+def per_file_outputs(html_files, output_dir):
+    """파일별 출력 워크북 경로 (같은 이름의 파일은 _2, _3 접미사)"""
+    outputs = []
+    used = set()
+    for html_file in html_files:
+        stem = Path(html_file).stem
+        name = stem
+        number = 1
+        while name.lower() in used:
+            number += 1
+            name = f"{stem}_{number}"
+        used.add(name.lower())
+        outputs.append(str(Path(output_dir) / f"{name}.xlsx"))
+    return outputs
+
+
+def convert_per_file(html_files, output_dir, options, notify, cancel=None):
+    """파일(공시)별 워크북으로 나누어 프로세스 풀에서 파싱과 기록을 함께 수행"""
+    run_start = time.perf_counter()
+    total_files = len(html_files)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    outputs = per_file_outputs(html_files, output_dir)
+
+    summary = {'files': total_files, 'converted': 0, 'failed': 0, 'sheets': [], 'file_stats': [],
+               'cancelled': False, 'outputs': [], 'index': None}
+    records = []
+
+    notify(ProgressEvent('start', f"🔄 파일별 변환 시작: {total_files}개 파일", 0))
+    notify(ProgressEvent('start', f"📂 출력 폴더: {output_dir}", 0))
+
+    results = map_ordered(write_file_workbook, html_files, outputs,
+                          [options] * total_files,
+                          workers=_worker_count(options, total_files))
+    try:
+        for i, result in enumerate(results):
+            file_name = os.path.basename(result['file'])
+            progress = ((i + 1) / total_files) * 100
+
+            if cancel is not None and cancel.is_set():
+                summary['cancelled'] = True
+                notify(ProgressEvent('cancelled', f"⏹️ 변환 취소: {i}/{total_files}개 파일 처리됨",
+                                     progress))
+                break
+
+            notify(ProgressEvent('file', f"📄 처리 완료: {file_name}", progress, file_name))
+
+            if result['error']:
+                summary['failed'] += 1
+                notify(ProgressEvent('error', f"  ❌ {file_name} 처리 실패: {result['error']}",
+                                     progress, file_name))
+                continue
+
+            stats = result['stats']
+            if stats is not None:
+                summary['file_stats'].append(asdict(stats))
+                notify(ProgressEvent('stats', f"  ⏱️ {stats.describe()}", progress, file_name))
+                for message in stats.warnings:
+                    notify(ProgressEvent('warning', f"  ⚠️ {message}", progress, file_name))
+
+            summary['outputs'].extend(result['paths'])
+            records.extend(result['records'])
+
+            if result['tables'] == 0:
+                notify(ProgressEvent('warning', f"  ⚠️ {file_name}에서 테이블을 찾을 수 없습니다",
+                                     progress, file_name))
+                continue
+
+            summary['converted'] += 1
+            summary['sheets'].extend(result['sheets'])
+            notify(ProgressEvent('tables', f"  📊 {result['tables']}개 테이블", progress, file_name))
+            for message in parse_ratio_warnings(result['records']):
+                notify(ProgressEvent('warning', message, progress, file_name))
+            for path in result['paths']:
+                notify(ProgressEvent('sheet', f"    💾 {os.path.basename(path)}", progress, file_name))
+
+    finally:
+        results.close()
+
+    summary['index'] = str(Path(output_dir) / INDEX_NAME)
+    write_index(summary['index'], records)
+    notify(ProgressEvent('sheet', f"🗂️ 색인 저장: {summary['index']}", 100))
+
+    finish_summary(summary, options, time.perf_counter() - run_start, notify)
+    if not summary['cancelled']:
+        notify(ProgressEvent('done', "🎉 변환 완료!", 100))
+    return summary
+
+
+def collect_html_files(paths):
+    """파일/폴더 경로 목록을 HTML/DART XML 파일 목록으로 확장"""
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    html_files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            found = []
+            for ext in ['*.html', '*.htm', '*.xml']:
+                found.extend(path.glob(ext))
+            html_files.extend(str(f) for f in sorted(found))
+        else:
+            html_files.append(str(path))
+
+    return html_files
+
+
+def convert(paths, output, options=None, on_event=None, cancel=None):
+    """HTML 파일/폴더를 Excel 파일로 변환 (GUI 없이 사용하는 라이브러리 진입점)"""
+    if isinstance(options, dict):
+        options = ConversionOptions.from_dict(options)
+
+    html_files = collect_html_files(paths)
+    if not html_files:
+        raise ValueError("변환할 HTML 파일이 없습니다.")
+
+    with profiled(options.profile_file if options is not None else None):
+        return convert_batch(html_files, str(output), options, on_event=on_event, cancel=cancel)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+📦 DSD Breaker 열 형식 내보내기
+추출된 테이블을 Parquet / Arrow IPC / 압축 CSV 파일로 하나씩 저장 (분석 도구에서 빠르게 일괄 로드)
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+import pandas as pd
+
+# Parquet/Arrow 저장에는 pyarrow 필요 (CSV는 pandas만으로 저장)
+try:
+    import pyarrow
+    import pyarrow.feather as feather
+    import pyarrow.parquet as parquet
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# 지원하는 출력 형식과 확장자
+OUTPUT_FORMATS = ('xlsx', 'parquet', 'arrow', 'csv')
+COLUMNAR_FORMATS = ('parquet', 'arrow', 'csv')
+_SUFFIXES = {'parquet': '.parquet', 'arrow': '.arrow', 'csv': '.csv.gz'}
+
+# Parquet/Arrow 스키마 메타데이터 키
+METADATA_KEY = b'dsd_breaker'
+
+INDEX_NAME = 'index.json'
+
+# 파일명에 사용할 수 없는 문자
+_RE_INVALID_FILE_CHARS = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+def column_parse_ratios(df):
+    """열별 숫자 변환 비율 (JSON으로 저장할 수 있도록 열 이름은 문자열)"""
+    return {str(column): round(float(ratio), 4) for column, ratio in df.attrs.get('parse_ratios', {}).items()}
+
+
+def table_metadata(df, source, table_number):
+    """테이블 메타데이터 (원본 파일, 테이블 번호, 재무제표 종류, 단위, 헤더 구조, 열별 숫자 변환 비율)"""
+    return {
+        'source': source,
+        'table': table_number,
+        'statement_type': df.attrs.get('statement_type'),
+        'unit': df.attrs.get('unit'),
+        'header_depth': df.attrs.get('header_depth', 0),
+        'header_rows': [list(row) for row in df.attrs.get('header_rows', ())],
+        'columns': [str(column) for column in df.columns],
+        'parse_ratios': column_parse_ratios(df),
+    }
+
+
+def _arrow_ready(df):
+    """Arrow로 표현 가능한 DataFrame (컬럼명은 문자열, 숫자/문자가 섞인 열은 문자열로 통일)"""
+    df = df.set_axis([str(column) for column in df.columns], axis=1)
+    for column in df.columns[df.dtypes == object]:
+        values = df[column]
+        df[column] = values.where(values.isna(), values.astype(str))
+    return df
+
+
+def _arrow_table(df, metadata):
+    """메타데이터를 스키마에 담은 pyarrow Table"""
+    table = pyarrow.Table.from_pandas(_arrow_ready(df), preserve_index=False)
+    schema_metadata = dict(table.schema.metadata or {})
+    schema_metadata[METADATA_KEY] = json.dumps(metadata, ensure_ascii=False).encode('utf-8')
+    return table.replace_schema_metadata(schema_metadata)
+
+
+def write_table_file(df, path, fmt, metadata):
+    """테이블 하나를 지정 형식 파일로 저장"""
+    if fmt == 'csv':
+        # 메타데이터는 색인(index.json)에만 기록
+        df.to_csv(path, index=False, encoding='utf-8', compression='gzip')
+    elif fmt == 'parquet':
+        parquet.write_table(_arrow_table(df, metadata), path, compression='zstd')
+    elif fmt == 'arrow':
+        feather.write_feather(_arrow_table(df, metadata), path, compression='zstd')
+    else:
+        raise ValueError(f"지원하지 않는 출력 형식: {fmt}")
+
+
+def read_table_file(path):
+    """저장된 테이블 파일 읽기 (Parquet/Arrow는 메타데이터를 df.attrs로 복원)"""
+    path = str(path)
+    if path.endswith(_SUFFIXES['csv']):
+        return pd.read_csv(path, compression='gzip')
+
+    if not HAS_PYARROW:
+        raise ImportError("Parquet/Arrow 파일을 읽으려면 pyarrow가 필요합니다: pip install pyarrow")
+
+    if path.endswith(_SUFFIXES['parquet']):
+        table = parquet.read_table(path)
+    else:
+        table = feather.read_table(path)
+
+    df = table.to_pandas()
+    metadata = (table.schema.metadata or {}).get(METADATA_KEY)
+    if metadata:
+        df.attrs.update(json.loads(metadata))
+    return df
+
+
+def check_output_format(fmt):
+    """출력 형식 확인 (Parquet/Arrow는 pyarrow 설치 여부도 확인)"""
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"지원하지 않는 출력 형식: {fmt} (가능: {', '.join(OUTPUT_FORMATS)})")
+    if fmt in ('parquet', 'arrow') and not HAS_PYARROW:
+        raise ImportError(f"{fmt} 형식으로 저장하려면 pyarrow가 필요합니다: pip install pyarrow")
+
+
+class TableFileWriter:
+    """테이블을 출력 폴더에 형식별 파일로 하나씩 기록 (ExcelBookWriter와 같은 인터페이스)"""
+
+    def __init__(self, output_dir, fmt):
+        check_output_format(fmt)
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.paths = []       # 생성한 테이블 파일 경로
+        self.records = []     # 파일 ↔ 원본 테이블 대응 (색인용)
+        self.file_names = set()
+
+    def unique_file_name(self, file_name, table_number, df):
+        """테이블 파일명 (원본 파일명_Table번호_종류, 겹치면 ~2 접미사)"""
+        stem = _RE_INVALID_FILE_CHARS.sub('_', Path(file_name).stem)
+        name = f"{stem}_Table{table_number}"
+        statement_type = df.attrs.get('statement_type')
+        if statement_type:
+            name = f"{name}_{statement_type}"
+
+        candidate = name
+        number = 1
+        # 대소문자를 구분하지 않는 파일 시스템에서도 겹치지 않도록 비교
+        while candidate.lower() in self.file_names:
+            number += 1
+            candidate = f"{name}~{number}"
+        self.file_names.add(candidate.lower())
+        return candidate + _SUFFIXES[self.fmt]
+
+    def write_file_tables(self, file_name, tables, split_by_table=True, source=None):
+        """파일 하나의 테이블을 파일로 기록하고 (생성된 파일명, 테이블 수) 반환
+
+        열 형식은 항상 테이블별 파일이므로 split_by_table은 사용하지 않는다.
+        """
+        source = source or file_name
+        names = []
+        table_count = 0
+
+        for table in tables:
+            table_count += 1
+            metadata = table_metadata(table, source, table_count)
+            name = self.unique_file_name(file_name, table_count, table)
+            path = self.output_dir / name
+            write_table_file(table, path, self.fmt, metadata)
+
+            self.paths.append(str(path))
+            self.records.append({'file': str(path), 'format': self.fmt,
+                                 'rows': len(table), **metadata})
+            names.append(name)
+            del table  # 다음 테이블 파싱 전에 해제
+
+        return names, table_count
+
+    def close(self):
+        """파일은 테이블마다 바로 저장하므로 정리할 것 없음"""
+
+
+def load_index(output_dir):
+    """출력 폴더의 색인 읽기 (테이블별 파일 경로와 메타데이터 목록)"""
+    with open(os.path.join(output_dir, INDEX_NAME), encoding='utf-8') as f:
+        return json.load(f)['tables']
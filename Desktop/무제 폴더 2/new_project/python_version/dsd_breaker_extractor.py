@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+⚡ DSD Breaker 테이블 추출 엔진
+DART HTML 문서를 lxml로 한 번만 파싱하여 테이블별 DataFrame을 생성
+"""
+
+import time
+import warnings
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+import lxml.html
+from lxml import etree
+
+from dsd_breaker_classify import classify_grid
+from dsd_breaker_grid import build_grid, element_text, grid_to_dataframe
+from dsd_breaker_io import file_memory_mb, open_html_source
+from dsd_breaker_levels import document_class_indents
+from dsd_breaker_numbers import detect_unit, normalize_numbers
+from dsd_breaker_profile import StageClock, add_stage, finish_parse_stage
+from dsd_breaker_xml import TABLE_TAGS, is_dart_xml, iter_xml_tables, parse_xml_source
+
+
+def table_to_dataframe(table, clean_data=True):
+    """lxml 테이블 요소를 DataFrame으로 변환 (span을 펼친 격자 기반, 재파싱 없음)"""
+    return grid_to_dataframe(build_grid(table, clean_text=clean_data))
+
+
+def parse_table_manually(table):
+    """수동으로 테이블 파싱 (격자 변환에 실패한 테이블의 대체 경로: span 없이 행별 셀 텍스트, 첫 행을 헤더로 사용)"""
+    data = []
+    for row in table.iter('tr'):
+        row_data = [element_text(cell).strip() for cell in row.iterchildren('td', 'th')]
+        if row_data:  # 빈 행 제외
+            data.append(row_data)
+
+    if not data:
+        return None
+
+    # 모든 행을 같은 길이로 맞추기
+    max_cols = max(len(row) for row in data)
+    for row in data:
+        row.extend([''] * (max_cols - len(row)))
+
+    return pd.DataFrame(data[1:], columns=data[0] if len(data) > 1 else None)
+
+
+def _report_table_error(stats, table, message):
+    """테이블 처리 문제를 파일 측정값(변환 로그에 경고로 표시)에 기록, 측정값이 없으면 경고 발생"""
+    message = f"{table.sourceline or '?'}행 테이블: {message}"
+    if stats is not None:
+        stats.warnings.append(message)
+    else:
+        warnings.warn(message, RuntimeWarning, stacklevel=3)
+
+
+def is_text_column(series):
+    """문자열(object/str) 컬럼 여부 (pandas 버전별 문자열 dtype 대응)"""
+    return series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+
+
+def clean_dataframe(df):
+    """데이터프레임 정리"""
+    # 문자열 컬럼의 공백 제거 (NaN은 그대로 유지)
+    for col_idx in range(len(df.columns)):
+        series = df.iloc[:, col_idx]
+        if is_text_column(series):
+            df.isetitem(col_idx, series.astype(str).str.strip().where(series.notna(), np.nan))
+
+    return df
+
+
+def convert_numbers(df, unit=None, scale_units=False):
+    """숫자 자동 인식 및 변환 (DART 금액 표기 정규화)"""
+    return normalize_numbers(df, unit=unit, scale_units=scale_units)
+
+
+def table_context(table):
+    """테이블 캡션과 바로 앞 요소들의 텍스트 목록 (표 제목/단위 선언 탐색용)"""
+    texts = []
+    caption = table.find('caption')
+    if caption is not None:
+        texts.append(element_text(caption))
+
+    # DART는 보통 표 바로 앞 제목/문단/작은 표에 재무제표 이름과 '(단위 : 원)'을 표기
+    previous = table.getprevious()
+    for _ in range(3):
+        if previous is None:
+            break
+        texts.append(''.join(islice(previous.itertext(), 50))[:300])
+        previous = previous.getprevious()
+
+    return texts
+
+
+def detect_table_unit(table, context=None):
+    """테이블 캡션 또는 바로 앞 요소에서 단위 선언 찾기"""
+    for text in (context if context is not None else table_context(table)):
+        unit = detect_unit(text)
+        if unit:
+            return unit
+    return None
+
+
+def parse_html(html_content, encoding=None):
+    """HTML 문서를 한 번 파싱하여 lxml 트리 반환"""
+    if isinstance(html_content, str):
+        # 인코딩 선언이 포함된 문자열은 lxml이 거부하므로 바이트로 전달
+        html_content = html_content.encode('utf-8')
+        encoding = 'utf-8'
+    parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+
+    try:
+        return lxml.html.document_fromstring(html_content, parser=parser)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def process_table(table, clean_data=True, detect_numbers=True, scale_units=False, skip_layout=True,
+                  stats=None, classes=None):
+    """lxml 테이블 요소 하나를 정리된 DataFrame으로 변환 (의미 없는 테이블은 None)
+
+    skip_layout이면 표지/서명/페이지 배치용 표를 DataFrame을 만들기 전에 제외한다.
+    stats(SourceStats)가 주어지면 단계별 시간과 테이블/셀 수를 누적한다.
+    classes는 문서 <style>의 클래스별 들여쓰기로 레벨 감지에 사용한다.
+    """
+    clock = StageClock(stats)
+    # 다른 표를 감싸는 페이지 배치용 표는 격자도 만들지 않음
+    if skip_layout and next(table.iterdescendants('table'), None) is not None:
+        if stats is not None:
+            stats.skipped_layout += 1
+        return None
+
+    try:
+        df = _grid_dataframe(table, clean_data, detect_numbers, scale_units, skip_layout, stats, classes,
+                             clock)
+    except Exception as e:
+        # 격자로 변환할 수 없는 비정상 테이블은 기존처럼 단순 행/열 파싱으로 대체 (숫자 변환 없음)
+        error = f"{type(e).__name__}: {e}"
+        try:
+            df = parse_table_manually(table)
+        except Exception as fallback_error:
+            _report_table_error(stats, table, f"변환 실패로 제외 ({error}, 대체 파싱 "
+                                              f"{type(fallback_error).__name__}: {fallback_error})")
+            return None
+        if df is None or not len(df):
+            _report_table_error(stats, table, f"변환 실패로 제외 ({error})")
+            return None
+        _report_table_error(stats, table, f"격자 변환 실패 ({error}), 단순 행/열 파싱으로 대체")
+        if stats is not None:
+            stats.tables += 1
+        return df
+
+    if df is not None and stats is not None:
+        stats.tables += 1
+    return df
+
+
+def _grid_dataframe(table, clean_data, detect_numbers, scale_units, skip_layout, stats, classes, clock):
+    """span을 펼친 격자로 테이블 분류/DataFrame 생성/숫자 변환 (제외할 테이블은 None)"""
+    # 데이터 정리 옵션(공백 제거)은 격자를 만들 때 셀 단위로 적용
+    grid = build_grid(table, clean_text=clean_data, classes=classes)
+    clock.lap('grid')
+    context = table_context(table)
+
+    # 격자 단계에서 재무제표 종류 판별 (레이아웃 표는 여기서 제외)
+    table_class = classify_grid(grid, ' '.join(context))
+    clock.lap('classify')
+    if skip_layout and table_class.is_layout:
+        if stats is not None:
+            stats.skipped_layout += 1
+        return None
+
+    df = grid_to_dataframe(grid)
+    clock.lap('dataframe')
+    if df is None:
+        return None
+    df.attrs['statement_type'] = table_class.statement_type
+
+    # 숫자 인식 옵션 적용 (캡션의 단위 선언에 따라 환산 가능)
+    if detect_numbers:
+        df = convert_numbers(df, detect_table_unit(table, context), scale_units)
+        clock.lap('numbers')
+
+    # 의미있는 크기의 테이블만 추가
+    if not len(df) or not len(df.columns):
+        return None
+    if stats is not None:
+        stats.cells += len(grid.rows) * grid.width
+    return df
+
+
+def parse_html_source(source):
+    """mmap 바이트를 조각 단위로 파서에 전달 (문서 전체 str 복사 없음)"""
+    if not source.size:
+        return None
+
+    parser = lxml.html.HTMLParser(encoding=source.parser_encoding)
+    try:
+        for chunk in source.chunks():
+            parser.feed(chunk)
+        return parser.close()
+    except (etree.ParserError, etree.XMLSyntaxError, ValueError):
+        return None
+
+
+def parse_source(source):
+    """파일 형식에 맞게 문서 전체 파싱 (DART XML은 TABLE을 HTML 이름으로 변환한 트리)"""
+    if is_dart_xml(source.head()):
+        return parse_xml_source(source)
+    return parse_html_source(source)
+
+
+def iter_table_elements(source):
+    """파일 형식에 맞게 스트리밍 파싱하여 테이블 요소를 닫히는 순서대로 반환"""
+    if is_dart_xml(source.head()):
+        return iter_xml_tables(source)
+    context = etree.iterparse(source.reader(), events=('end',), tag='table', html=True,
+                              encoding=source.parser_encoding, huge_tree=True)
+    return (table for _, table in context)
+
+
+def extract_tables(html_content, clean_data=True, detect_numbers=True, scale_units=False,
+                   skip_layout=True):
+    """HTML에서 테이블 추출 (문서 1회 파싱)"""
+    return extract_tables_from_document(parse_html(html_content),
+                                        clean_data, detect_numbers, scale_units, skip_layout)
+
+
+def extract_tables_from_file(html_file, clean_data=True, detect_numbers=True, scale_units=False,
+                             skip_layout=True, cache=None):
+    """HTML 또는 DART XML 파일에서 테이블 추출 (형식/인코딩 자동 감지, 파일별 측정값 함께 반환)
+
+    cache(TableCache)가 주어지면 같은 내용/옵션의 파일은 다시 파싱하지 않고 캐시에서 읽는다.
+    """
+    with open_html_source(html_file) as source:
+        key = None
+        if cache is not None:
+            key = cache.key_for(source, clean_data=clean_data, detect_numbers=detect_numbers,
+                                scale_units=scale_units, skip_layout=skip_layout)
+            with source.measure():
+                cached = cache.load(key)
+                tables = list(cached) if cached is not None else None
+            if tables is not None:
+                source.stats.cached = True
+                source.stats.tables = len(tables)
+                source.stats.stages['cache'] = source.stats.parse_seconds
+                return tables, source.stats
+
+        with source.measure():
+            tables = extract_tables_from_document(parse_source(source),
+                                                  clean_data, detect_numbers, scale_units,
+                                                  skip_layout, source.stats)
+
+        if key is not None:
+            start = time.perf_counter()
+            with source.measure():
+                cache.store(key, tables)
+            add_stage(source.stats, 'cache', time.perf_counter() - start)
+
+        finish_parse_stage(source.stats)
+        return tables, source.stats
+
+
+def extract_tables_from_document(document, clean_data=True, detect_numbers=True, scale_units=False,
+                                 skip_layout=True, stats=None):
+    """파싱된 lxml 문서에서 테이블 추출"""
+    if document is None:
+        return []
+
+    extracted_tables = []
+    # 클래스 들여쓰기 규칙(<style>)은 문서마다 한 번만 해석
+    classes = document_class_indents(document)
+
+    for table in document.iter('table'):
+        df = process_table(table, clean_data, detect_numbers, scale_units, skip_layout, stats, classes)
+        if df is not None:
+            extracted_tables.append(df)
+
+    return extracted_tables
+
+
+def _release_parsed(element):
+    """처리가 끝난 요소와 그 앞의 형제 요소를 트리에서 제거하여 메모리 반환"""
+    element.clear(keep_tail=True)
+    node = element
+    while node is not None:
+        parent = node.getparent()
+        if parent is None:
+            break
+        while node.getprevious() is not None:
+            del parent[0]
+        node = parent
+
+
+def iter_tables_from_file(html_file, clean_data=True, detect_numbers=True, scale_units=False,
+                          skip_layout=True, cache=None):
+    """HTML 또는 DART XML 파일을 스트리밍 파싱하여 테이블을 하나씩 반환 (메모리 사용량은 가장 큰 테이블 기준)"""
+    yield from iter_tables_from_source(open_html_source(html_file),
+                                       clean_data, detect_numbers, scale_units, skip_layout, cache)
+
+
+def _iter_cached_tables(source, cached):
+    """캐시된 테이블을 하나씩 읽어 반환 (읽기 시간만 측정)"""
+    stats = source.stats
+    stats.cached = True
+    start = time.perf_counter()
+    for df in cached:
+        stats.parse_seconds += time.perf_counter() - start
+        stats.tables += 1
+        yield df
+        start = time.perf_counter()
+    stats.parse_seconds += time.perf_counter() - start
+    stats.stages['cache'] = stats.parse_seconds
+
+
+def iter_tables_from_source(source, clean_data=True, detect_numbers=True, scale_units=False,
+                            skip_layout=True, cache=None):
+    """열린 HTMLSource를 스트리밍 파싱 (완료 시 source를 닫고 source.stats에 측정값 기록)
+
+    cache가 주어지면 캐시된 테이블을 읽고, 없으면 파싱하면서 하나씩 캐시에 저장한다
+    (끝까지 소비하지 않은 경우 저장하지 않음).
+    """
+    stats = source.stats
+    writer = None
+    try:
+        if cache is not None:
+            key = cache.key_for(source, clean_data=clean_data, detect_numbers=detect_numbers,
+                                scale_units=scale_units, skip_layout=skip_layout)
+            cached = cache.load(key)
+            if cached is not None:
+                yield from _iter_cached_tables(source, cached)
+                return
+            writer = cache.writer(key)
+
+        if not source.size:
+            if writer is not None:
+                writer.commit()
+            return
+
+        elements = iter_table_elements(source)
+
+        # 파싱 시간만 측정 (yield 이후 호출자의 기록 시간은 제외)
+        start = time.perf_counter()
+        classes = None
+        for table in elements:
+            if classes is None:
+                # <head>의 <style>은 첫 테이블을 해제하면 함께 사라지므로 그 전에 한 번 해석
+                classes = document_class_indents(table.getroottree().getroot())
+            df = process_table(table, clean_data, detect_numbers, scale_units, skip_layout, stats, classes)
+
+            # 중첩 테이블은 바깥 테이블의 셀 텍스트에 필요하므로 최상위 테이블이 끝날 때 해제
+            if not any(True for _ in table.iterancestors(*TABLE_TAGS)):
+                _release_parsed(table)
+
+            if df is not None:
+                if writer is not None:
+                    cache_start = time.perf_counter()
+                    writer.add(df)
+                    add_stage(stats, 'cache', time.perf_counter() - cache_start)
+                stats.parse_seconds += time.perf_counter() - start
+                yield df
+                start = time.perf_counter()
+
+        stats.parse_seconds += time.perf_counter() - start
+        finish_parse_stage(stats)
+        del elements
+
+        if writer is not None:
+            writer.commit()
+
+    finally:
+        if writer is not None:
+            writer.abort()
+        stats.file_memory_mb = file_memory_mb(source.memory_baseline)
+        source.close()
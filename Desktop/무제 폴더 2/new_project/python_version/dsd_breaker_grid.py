@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+🧮 DSD Breaker 테이블 격자 엔진
+rowspan/colspan을 한 번의 순회로 펼쳐 2차원 셀 격자를 만들고 헤더 깊이와 들여쓰기/계정 레벨을 보존
+"""
+
+import re
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from dsd_breaker_levels import row_levels, style_indent, whitespace_width
+
+# pandas.read_html과 동일한 공백 정리 규칙
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+# 비정상적으로 큰 colspan으로 격자가 폭주하지 않도록 제한
+MAX_COLSPAN = 1000
+
+
+class RowValues(tuple):
+    """df.attrs에 저장하는 행별 값 (불변이므로 pandas가 attrs를 deepcopy할 때 복사하지 않음)"""
+    __slots__ = ()
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+@dataclass
+class TableGrid:
+    """span을 펼친 테이블 격자"""
+    rows: list                    # 행별 셀 텍스트 (모든 행이 width 길이)
+    header_depth: int = 0         # 상단 헤더 행 수 (thead 또는 th 전용 행)
+    indents: list = field(default_factory=list)  # 행별 첫 열 셀의 들여쓰기 폭 (CSS + 앞쪽 공백)
+    width: int = 0
+
+
+def element_text(element):
+    """요소의 전체 텍스트 (lxml.html/etree 요소 모두 지원)"""
+    return ''.join(element.itertext())
+
+
+def _cells(row):
+    """행의 직계 td/th 셀 목록"""
+    return list(row.iterchildren('td', 'th'))
+
+
+def _section_rows(table, section):
+    """thead/tbody/tfoot 섹션의 직계 tr 목록"""
+    rows = []
+    for child in table:
+        if child.tag == section:
+            rows.extend(tr for tr in child if tr.tag == 'tr')
+    return rows
+
+
+def _span(value):
+    """rowspan/colspan 속성 값 (없거나 잘못된 값은 1로 처리)"""
+    if not value:
+        return 1
+    try:
+        return max(int(value), 1)
+    except ValueError:
+        return 1
+
+
+def _place_rows(rows, grid_rows, indents, clean_text=True, classes=None):
+    """행 그룹 하나의 셀을 격자에 배치 (rowspan은 행 그룹 밖으로 넘어가지 않음)"""
+    # 열 번호 → (텍스트, 남은 행 수, 들여쓰기): 이전 행의 rowspan이 차지한 칸
+    carry = {}
+
+    for tr in rows:
+        texts = []
+        next_carry = {}
+        indent = 0
+        col = 0
+
+        for cell in tr.iterchildren('td', 'th'):
+            # rowspan으로 이미 차지된 칸은 건너뛰며 위 셀 텍스트로 채움
+            while col in carry:
+                text, remaining, carried_indent = carry[col]
+                texts.append(text)
+                if col == 0:
+                    indent = carried_indent
+                if remaining > 1:
+                    next_carry[col] = (text, remaining - 1, carried_indent)
+                col += 1
+
+            # 자식 요소가 없는 셀(대부분)은 itertext 없이 바로 텍스트 사용
+            raw = (cell.text or '') if len(cell) == 0 else element_text(cell)
+            text = _RE_WHITESPACE.sub(' ', raw.strip()) if clean_text else raw
+            cell_indent = style_indent(cell, classes) + whitespace_width(raw) if col == 0 else 0
+            if col == 0:
+                indent = cell_indent
+
+            rowspan = _span(cell.get('rowspan'))
+            for _ in range(min(_span(cell.get('colspan')), MAX_COLSPAN)):
+                texts.append(text)
+                if rowspan > 1:
+                    next_carry[col] = (text, rowspan - 1, cell_indent)
+                elif col in carry and carry[col][1] > 1:
+                    # colspan이 위 셀의 rowspan 칸과 겹치면 이 행은 이 셀이 차지하고 아래 행은 계속 위 셀이 차지
+                    text_above, remaining, carried_indent = carry[col]
+                    next_carry[col] = (text_above, remaining - 1, carried_indent)
+                col += 1
+
+        # 행 끝 뒤쪽에 남은 rowspan 칸 채움 (사이의 빈 칸은 '')
+        for carried_col in sorted(c for c in carry if c >= col):
+            text, remaining, carried_indent = carry[carried_col]
+            texts.extend([''] * (carried_col - len(texts)))
+            texts.append(text)
+            if carried_col == 0:
+                indent = carried_indent
+            if remaining > 1:
+                next_carry[carried_col] = (text, remaining - 1, carried_indent)
+
+        grid_rows.append(texts)
+        indents.append(indent)
+        carry = next_carry
+
+
+def build_grid(table, clean_text=True, classes=None):
+    """lxml 테이블 요소를 span이 펼쳐진 격자로 변환 (셀 수에 비례하는 1회 순회)
+
+    clean_text가 True이면 셀 텍스트의 앞뒤 공백을 제거하고 연속 공백/줄바꿈을 한 칸으로 합친다.
+    classes는 문서 <style>의 클래스별 들여쓰기(document_class_indents)로, 첫 열 들여쓰기에 반영한다.
+    """
+    header_rows = _section_rows(table, 'thead')
+    body_rows = _section_rows(table, 'tbody') + [child for child in table if child.tag == 'tr']
+    footer_rows = _section_rows(table, 'tfoot')
+
+    if not header_rows:
+        # thead가 없으면 상단의 th 전용 행을 헤더로 사용
+        while body_rows and all(cell.tag == 'th' for cell in _cells(body_rows[0])):
+            header_rows.append(body_rows.pop(0))
+
+    rows, indents = [], []
+    _place_rows(header_rows, rows, indents, clean_text, classes)
+    header_depth = len(rows)
+    _place_rows(body_rows, rows, indents, clean_text, classes)
+    _place_rows(footer_rows, rows, indents, clean_text, classes)
+
+    width = max((len(row) for row in rows), default=0)
+    for row in rows:
+        if len(row) < width:
+            row.extend([''] * (width - len(row)))
+
+    return TableGrid(rows, header_depth, indents, width)
+
+
+def flatten_header(header_rows, width):
+    """다단 헤더를 열별 단일 라벨로 합침 ('당기' + '금액' → '당기 금액', 중복 라벨은 .1 접미사)"""
+    labels = []
+    seen = {}
+
+    for col in range(width):
+        parts = []
+        for row in header_rows:
+            text = row[col]
+            # colspan/rowspan으로 반복된 같은 텍스트는 한 번만 사용
+            if text and text not in parts:
+                parts.append(text)
+        label = ' '.join(parts) or f'Unnamed: {col}'
+
+        if label in seen:
+            seen[label] += 1
+            label = f'{label}.{seen[label]}'
+        else:
+            seen[label] = 0
+        labels.append(label)
+
+    return labels
+
+
+def grid_to_dataframe(grid):
+    """격자를 DataFrame으로 변환 (헤더는 단일 라벨로 합치고 빈 행 제외, 빈 셀은 NaN)"""
+    if not grid.width or not any(any(row) for row in grid.rows):
+        return None
+
+    header = grid.rows[:grid.header_depth]
+    body, indents = [], []
+    for row, indent in zip(grid.rows[grid.header_depth:], grid.indents[grid.header_depth:]):
+        if any(row):
+            body.append([text or None for text in row])
+            indents.append(indent)
+
+    columns = flatten_header(header, grid.width) if header else None
+    df = pd.DataFrame(body, columns=columns if columns is not None else range(grid.width))
+
+    df.attrs['header_depth'] = grid.header_depth
+    df.attrs['header_rows'] = RowValues(tuple(row) for row in header)
+    df.attrs['indents'] = RowValues(indents)
+    df.attrs['levels'] = RowValues(row_levels(indents, [row[0] for row in body]).tolist())
+    return df
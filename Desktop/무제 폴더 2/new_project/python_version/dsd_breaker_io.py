@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+📥 DSD Breaker HTML 입력 계층
+BOM/meta charset으로 인코딩을 감지하고 mmap으로 파일 바이트를 파서에 직접 전달
+"""
+
+import codecs
+import mmap
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+# resource 모듈은 Windows에 없음
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+# 인코딩 감지에 사용할 파일 앞부분 크기
+SNIFF_BYTES = 8192
+
+_BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+
+_RE_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+
+# 구형 DART 공시에서 쓰이는 한글 인코딩 이름은 모두 CP949(EUC-KR 상위 집합)로 처리
+_KOREAN_ALIASES = {'euc-kr', 'euckr', 'ks_c_5601-1987', 'ksc5601', 'x-windows-949', 'windows-949',
+                   'cp949', 'ms949', 'uhc'}
+
+
+@dataclass
+class SourceStats:
+    """파일별 입력/파싱 측정값"""
+    path: str
+    bytes: int = 0
+    encoding: str = 'utf-8'
+    parse_seconds: float = 0.0
+    file_memory_mb: float = 0.0  # 이 파일을 처리하는 동안 늘어난 최대 메모리 (처리 시작 시점 대비)
+    cached: bool = False  # 파싱 대신 캐시에서 읽음
+    tables: int = 0
+    cells: int = 0        # 추출한 테이블 격자의 셀 수
+    skipped_layout: int = 0  # 레이아웃 표로 판단해 제외한 테이블 수
+    stages: dict = field(default_factory=dict)  # 단계명 → 누적 시간(초)
+    warnings: list = field(default_factory=list)  # 대체 파싱/제외한 테이블 설명
+
+    def describe(self):
+        """로그 표시용 요약 문자열"""
+        if self.cached:
+            return (f"{self.bytes / 1024:,.0f}KB 캐시에서 로드 {self.parse_seconds:.2f}초, "
+                    f"테이블 {self.tables}개")
+        rate = self.bytes / 1_048_576 / self.parse_seconds if self.parse_seconds > 0 else 0.0
+        return (f"{self.bytes / 1024:,.0f}KB ({self.encoding}) "
+                f"파싱 {self.parse_seconds:.2f}초 ({rate:.1f}MB/s, 테이블 {self.tables}개, "
+                f"셀 {self.cells:,}개{self._skipped_text()}), 파일 처리 메모리 +{self.file_memory_mb:.0f}MB")
+
+    def _skipped_text(self):
+        """제외한 레이아웃 표 수 (없으면 빈 문자열)"""
+        return f", 레이아웃 표 {self.skipped_layout}개 제외" if self.skipped_layout else ''
+
+
+def normalize_encoding(name):
+    """감지된 인코딩 이름을 Python 코덱 이름으로 정리"""
+    name = name.strip().lower()
+    if name in _KOREAN_ALIASES:
+        return 'cp949'
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def sniff_encoding(head, chunks=None):
+    """파일 앞부분 바이트에서 인코딩 감지 (BOM → meta charset → UTF-8 검사 → CP949)
+
+    BOM/meta charset 없이 앞부분만 보고 UTF-8로 추정한 경우 chunks(파일 전체 바이트 조각)가 주어지면
+    끝까지 UTF-8로 읽히는지 확인하고, 실패하면 CP949로 처리 (앞부분은 ASCII뿐인 구형 공시).
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+
+    match = _RE_META_CHARSET.search(head)
+    if match:
+        encoding = normalize_encoding(match.group(1).decode('ascii', 'ignore'))
+        if encoding:
+            return encoding
+
+    try:
+        # 잘린 멀티바이트 문자는 무시하고 UTF-8로 해석 가능한지 확인
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+    except UnicodeDecodeError:
+        return 'cp949'
+
+    if chunks is not None:
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            for chunk in chunks:
+                decoder.decode(chunk)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return 'cp949'
+    return 'utf-8'
+
+
+def _proc_status_kb(key):
+    """/proc/self/status 값(KB, Linux 외에는 None)"""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith(key):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def peak_rss_mb():
+    """현재 프로세스 시작 이후 최대 메모리 사용량(MB, 측정 불가 시 0)"""
+    if not HAS_RESOURCE:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return peak / 1_048_576 if sys.platform == 'darwin' else peak / 1024
+
+
+def _recent_peak_mb():
+    """마지막 reset_peak_rss 이후 최대 메모리 (Linux VmHWM, 그 외에는 프로세스 최대값)"""
+    peak_kb = _proc_status_kb('VmHWM:')
+    return peak_kb / 1024 if peak_kb is not None else peak_rss_mb()
+
+
+def reset_peak_rss():
+    """최대 메모리 기록을 현재 사용량으로 초기화 (Linux만 가능, 성공 여부 반환)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def memory_baseline():
+    """파일별 메모리 측정 기준 (MB): 최대 기록을 초기화할 수 있으면 현재 사용량, 아니면 지금까지의 최대값"""
+    if reset_peak_rss():
+        rss_kb = _proc_status_kb('VmRSS:')
+        if rss_kb is not None:
+            return rss_kb / 1024
+    return _recent_peak_mb()
+
+
+def file_memory_mb(baseline):
+    """기준 이후 늘어난 최대 메모리 (MB)
+
+    최대 기록을 초기화할 수 없는 플랫폼에서는 프로세스 최대값이 늘어난 만큼만 잡히므로 하한값.
+    """
+    return max(_recent_peak_mb() - baseline, 0.0)
+
+
+class HTMLSource:
+    """mmap으로 연 HTML 파일 (파일 전체를 str로 복사하지 않음)"""
+
+    def __init__(self, path):
+        start = time.perf_counter()
+        self.memory_baseline = memory_baseline()
+        self.path = str(path)
+        self._file = open(self.path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        self.buffer = (mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                       if self.size else None)
+        self.encoding = sniff_encoding(self.head(), self.chunks())
+        self.stats = SourceStats(self.path, self.size, self.encoding)
+        self.stats.stages['read'] = time.perf_counter() - start
+
+    @property
+    def parser_encoding(self):
+        """libxml2 파서에 전달할 인코딩 이름 (BOM은 파서가 처리)"""
+        return {'utf-8-sig': 'utf-8', 'utf-16-le': 'UTF-16LE', 'utf-16-be': 'UTF-16BE'}.get(
+            self.encoding, self.encoding)
+
+    def head(self, size=SNIFF_BYTES):
+        """파일 앞부분 바이트"""
+        return self.buffer[:size] if self.buffer is not None else b''
+
+    def chunks(self, chunk_size=1_048_576):
+        """파서에 전달할 바이트 조각 (최대 chunk_size만 복사)"""
+        for offset in range(0, self.size, chunk_size):
+            yield self.buffer[offset:offset + chunk_size]
+
+    def reader(self):
+        """iterparse 등에 전달할 파일 객체 (처음 위치로 되돌림)"""
+        self.buffer.seek(0)
+        return self.buffer
+
+    def text(self):
+        """디코딩된 문자열 (문자열이 꼭 필요한 기존 경로용)"""
+        return self.buffer[:].decode(self.encoding, errors='replace') if self.buffer is not None else ''
+
+    @contextmanager
+    def measure(self):
+        """블록 실행 시간과 이 파일을 여는 시점 대비 최대 메모리를 stats에 기록"""
+        start = time.perf_counter()
+        try:
+            yield self.stats
+        finally:
+            self.stats.parse_seconds += time.perf_counter() - start
+            self.stats.file_memory_mb = file_memory_mb(self.memory_baseline)
+
+    def close(self):
+        """mmap과 파일 닫기"""
+        if self.buffer is not None:
+            self.buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_html_source(path):
+    """HTML 파일을 mmap으로 열고 인코딩 감지"""
+    return HTMLSource(path)
+
+
+def read_html_text(path):
+    """인코딩을 감지하여 HTML 파일을 한 번만 디코딩"""
+    with open_html_source(path) as source:
+        return source.text()
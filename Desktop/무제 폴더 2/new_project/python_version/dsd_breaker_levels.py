@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+🪜 DSD Breaker 계정 레벨 감지
+파싱 단계에서 첫 열 셀의 CSS 들여쓰기(style 속성과 <style> 클래스 규칙의 padding-left/text-indent), &nbsp; 공백 폭, 번호 체계(Ⅰ., 1., (1), 가.)로
+행별 계층 레벨을 계산 (테이블마다 int8 배열, df.attrs에는 정수 튜플로 보관)
+"""
+
+import re
+
+import numpy as np
+
+# 들여쓰기로 취급하는 공백 문자와 폭 (전각 공백은 2칸)
+_INDENT_WIDTHS = {' ': 1, '\xa0': 1, '\t': 4, '　': 2}
+
+# CSS 왼쪽 들여쓰기 ('padding-left: 20px', 'text-indent:1.5em', 'margin-left: 10pt')
+_RE_CSS_INDENT = re.compile(r'(?:padding-left|margin-left|text-indent)\s*:\s*(-?\d*\.?\d+)\s*([a-z]*)',
+                            re.IGNORECASE)
+
+# CSS 길이 단위 → px (%, vw 등 상대 단위는 무시)
+_CSS_UNIT_PX = {'': 1.0, 'px': 1.0, 'pt': 4 / 3, 'pc': 16.0, 'em': 16.0, 'rem': 16.0, 'ex': 8.0,
+                'ch': 8.0, 'in': 96.0, 'cm': 96 / 2.54, 'mm': 96 / 25.4}
+
+# <style> 규칙: 주석, '선택자 { 선언 }', 클래스 선택자 하나('.indent1', 'td.indent1')
+_RE_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_RE_CSS_RULE = re.compile(r'([^{}]+)\{([^}]*)\}')
+_RE_CLASS_SELECTOR = re.compile(r'^[a-z0-9]*\.([\w-]+)$', re.IGNORECASE)
+
+# 공백 한 칸에 해당하는 px (CSS 들여쓰기를 공백 폭과 같은 단위로 환산)
+PX_PER_SPACE = 4
+
+# 번호 체계 (Ⅰ. → 1. → (1) → 가. → (가) → ① 순이 일반적이지만 레벨은 표 안에서 먼저 나온 순서로 결정)
+_HANGUL_NUMBERS = '가나다라마바사아자차카타파하'
+# 종류마다 그룹 하나인 정규식 하나로 매칭 (match.lastindex = 종류 번호 + 1)
+_RE_NUMBERING = re.compile(r'^\s*(?:' + '|'.join(f'({pattern})' for pattern in (
+    r'[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩⅪⅫ]+|[IVX]{1,5}\s*\.',     # Ⅰ. / I.
+    r'\d{1,3}\s*\.(?!\d)',                       # 1.
+    r'[(（]\s*\d{1,3}\s*[)）]',                   # (1)
+    rf'[{_HANGUL_NUMBERS}]\s*\.',                # 가.
+    rf'[(（]\s*[{_HANGUL_NUMBERS}]\s*[)）]',      # (가)
+    r'[①-⑳⑴-⒇]',                                  # ①, ⑴
+    r'\d{1,3}\s*\)',                             # 1)
+    rf'[{_HANGUL_NUMBERS}]\s*\)',                # 가)
+)) + ')')
+
+
+def whitespace_width(text):
+    """문자열 앞쪽 공백 폭 (&nbsp; 포함)"""
+    width = 0
+    for char in text:
+        char_width = _INDENT_WIDTHS.get(char)
+        if char_width is None:
+            break
+        width += char_width
+    return width
+
+
+def _css_indent_px(declarations):
+    """CSS 선언의 왼쪽 들여쓰기 합 (px)"""
+    px = 0.0
+    for value, unit in _RE_CSS_INDENT.findall(declarations):
+        scale = _CSS_UNIT_PX.get(unit.lower())
+        if scale is not None:
+            px += float(value) * scale
+    return px
+
+
+def class_indents(css):
+    """CSS 텍스트의 클래스 선택자별 왼쪽 들여쓰기 (px, 들여쓰기가 없는 클래스는 제외)
+
+    '.indent1'과 'td.indent1' 같은 단순 클래스 선택자만 해석한다 (자손/속성 선택자는 무시).
+    """
+    indents = {}
+    for selectors, declarations in _RE_CSS_RULE.findall(_RE_CSS_COMMENT.sub('', css)):
+        px = _css_indent_px(declarations)
+        if not px:
+            continue
+        for selector in selectors.split(','):
+            match = _RE_CLASS_SELECTOR.match(selector.strip())
+            if match:
+                # 같은 클래스 규칙이 여러 번 나오면 CSS처럼 뒤의 규칙 적용
+                indents[match.group(1)] = px
+    return indents
+
+
+def document_class_indents(root):
+    """문서(또는 지금까지 파싱된 부분)의 모든 <style> 블록에서 클래스별 들여쓰기 (px)"""
+    css = '\n'.join(''.join(style.itertext()) for style in root.iter('style'))
+    return class_indents(css) if css else {}
+
+
+def style_indent(element, classes=None):
+    """셀과 텍스트 앞의 첫 자식 요소(<p>, <span> 등)의 왼쪽 들여쓰기 (공백 폭 단위)
+
+    style 속성과, classes(document_class_indents 결과)가 주어지면 class 속성의 <style> 규칙을 합산한다.
+    """
+    px = 0.0
+    while element is not None and isinstance(element.tag, str):
+        style = element.get('style')
+        if style:
+            px += _css_indent_px(style)
+        if classes:
+            for name in (element.get('class') or '').split():
+                px += classes.get(name, 0.0)
+        # 텍스트가 자식 요소보다 앞에 있으면 자식의 스타일은 첫 글자 위치와 무관
+        if (element.text or '').strip() or not len(element):
+            break
+        element = element[0]
+    return max(round(px / PX_PER_SPACE), 0)
+
+
+def numbering_kind(label):
+    """계정과목 앞 번호 체계 종류 (번호가 없으면 -1)"""
+    match = _RE_NUMBERING.match(label)
+    return match.lastindex - 1 if match else -1
+
+
+def numbering_depths(labels):
+    """행별 번호 체계 깊이 (번호 없음 0, 번호 종류는 표 안에서 처음 나온 순서대로 1, 2, ...)"""
+    order = {}
+    depths = np.zeros(len(labels), dtype=np.int64)
+    for row, label in enumerate(labels):
+        kind = numbering_kind(label) if label else -1
+        if kind >= 0:
+            depths[row] = order.setdefault(kind, len(order) + 1)
+    return depths
+
+
+def row_levels(indents, labels):
+    """행별 레벨: 들여쓰기 폭이 두 가지 이상이면 들여쓰기 순위, 아니면 번호 체계 깊이 순위"""
+    indents = np.asarray(indents, dtype=np.int64)
+    if not len(indents):
+        return np.zeros(0, dtype=np.int8)
+    keys = indents if len(np.unique(indents)) > 1 else numbering_depths(labels)
+    _, levels = np.unique(keys, return_inverse=True)
+    return levels.astype(np.int8)
+
+
+def label_levels(labels):
+    """파싱 정보 없이 라벨 텍스트만으로 레벨 계산 (앞쪽 공백 폭 → 번호 체계)"""
+    labels = ['' if label is None or label != label else str(label) for label in labels]
+    return row_levels([whitespace_width(label) for label in labels], labels)
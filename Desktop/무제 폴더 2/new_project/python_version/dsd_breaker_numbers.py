@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+🔢 DSD Breaker 재무 숫자 정규화
+DART 표기법((1,234), △/▲ 음수, '-' = 0, 천원/백만원 단위)을 컬럼당 한 번에 숫자로 변환
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# 단위별 배율
+UNIT_MULTIPLIERS = {
+    '원': 1,
+    '천원': 1_000,
+    '만원': 10_000,
+    '백만원': 1_000_000,
+    '억원': 100_000_000,
+    '십억원': 1_000_000_000,
+}
+
+_UNIT_PATTERN = '|'.join(sorted(map(re.escape, UNIT_MULTIPLIERS), key=len, reverse=True))
+
+# 셀 하나의 금액 표기: '-' 단독, (1,234), △1,234 / ▲1,234 / -1,234, 단위 접미사
+_RE_AMOUNT = re.compile(
+    r'\s*(?:'
+    r'(?P<dash>[-–—－])'
+    r'|\(\s*(?P<paren>\d[\d,]*(?:\.\d+)?)\s*\)'
+    r'|(?P<sign>[△▲\-−])?\s*(?P<number>\d[\d,]*(?:\.\d+)?)'
+    r')\s*(?P<unit>' + _UNIT_PATTERN + r')?\s*'
+)
+
+# 문자열 컬럼을 숫자로 바꾸는 최소 변환 비율 (초과 시 변환, 읽지 못한 셀은 빈 값이 됨)
+NUMERIC_THRESHOLD = 0.5
+
+# 표 제목/캡션의 단위 선언: (단위 : 백만원), 단위: 천원
+_RE_UNIT_DECLARATION = re.compile(r'단위\s*[:：]?\s*(?P<unit>' + _UNIT_PATTERN + r')')
+
+
+def detect_unit(text):
+    """캡션/제목 텍스트에서 단위 선언 찾기 (없으면 None)"""
+    if not text:
+        return None
+    match = _RE_UNIT_DECLARATION.search(text)
+    return match.group('unit') if match else None
+
+
+def is_amount(text):
+    """셀 텍스트가 금액 표기인지 여부 ('-' 단독 포함)"""
+    return _RE_AMOUNT.fullmatch(text) is not None
+
+
+def parse_amounts(values):
+    """고유 값 목록을 금액(float)과 셀 단위 배율 배열로 변환 (실패는 NaN)
+
+    고유 값마다 정규식 한 번씩 적용하는 파이썬 반복 (벡터화가 아님). Series.str.extract로 그룹을
+    뽑아 열 단위로 계산하는 방식은 그룹별 문자열 처리가 더해져 이보다 느렸다.
+    """
+    amounts = np.full(len(values), np.nan)
+    multipliers = np.zeros(len(values))  # 0 = 셀에 단위 표기 없음
+    blank = np.zeros(len(values), dtype=bool)
+    fullmatch = _RE_AMOUNT.fullmatch
+
+    for i, value in enumerate(values):
+        if value.__class__ is not str:
+            if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+                amounts[i] = value
+            continue
+
+        match = fullmatch(value)
+        if match is None:
+            blank[i] = not value.strip()
+            continue
+
+        dash, paren, sign, number, unit = match.groups()
+        if dash:
+            amounts[i] = 0.0
+        elif paren:
+            amounts[i] = -float(paren.replace(',', ''))
+        else:
+            amount = float(number.replace(',', ''))
+            amounts[i] = -amount if sign else amount
+
+        if unit:
+            multipliers[i] = UNIT_MULTIPLIERS[unit]
+
+    return amounts, multipliers, blank
+
+
+def partial_columns(parse_ratios, threshold=NUMERIC_THRESHOLD):
+    """숫자로 변환했지만 일부 셀을 읽지 못한 열 → {열 이름: 변환 비율}"""
+    return {column: ratio for column, ratio in parse_ratios.items() if threshold < ratio < 1.0}
+
+
+def normalize_series(series, multiplier=1, scale_units=False):
+    """컬럼 하나를 숫자로 변환하고 (숫자 Series, 변환 비율) 반환"""
+    # 고유 값만 파싱하고 결과를 인덱스로 펼침 (반복 값이 많은 재무제표에 유리)
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    amounts, cell_multipliers, blank = parse_amounts(list(uniques))
+
+    if scale_units:
+        amounts = amounts * np.where(cell_multipliers > 0, cell_multipliers, multiplier)
+
+    missing = codes < 0
+    values = np.take(amounts, codes)
+    values[missing] = np.nan
+
+    filled = ~missing & ~np.take(blank, codes)
+    filled_count = int(filled.sum())
+    parsed_count = int((~np.isnan(values)).sum())
+    ratio = parsed_count / filled_count if filled_count else 0.0
+
+    numeric = pd.Series(values, index=series.index, name=series.name)
+    if parsed_count == len(values) and np.array_equal(values, np.round(values)):
+        numeric = numeric.astype('int64')
+
+    return numeric, ratio
+
+
+def normalize_numbers(df, unit=None, scale_units=False, threshold=NUMERIC_THRESHOLD):
+    """숫자 자동 인식: 변환 비율이 threshold를 넘는 문자열 컬럼을 숫자로 변환
+
+    변환 비율은 빈 셀을 제외한 셀 중 숫자로 읽은 셀의 비율 (기존 convert_numbers는 전체 행 수 기준).
+    """
+    multiplier = UNIT_MULTIPLIERS.get(unit, 1)
+    parse_ratios = {}
+
+    for col_idx in range(len(df.columns)):
+        series = df.iloc[:, col_idx]
+        if not (series.dtype == object or isinstance(series.dtype, pd.StringDtype)):
+            if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+                # 이미 숫자로 읽힌 컬럼
+                parse_ratios[df.columns[col_idx]] = 1.0
+                if scale_units and multiplier != 1:
+                    df.isetitem(col_idx, series * multiplier)
+            continue
+
+        numeric, ratio = normalize_series(series, multiplier, scale_units)
+        parse_ratios[df.columns[col_idx]] = ratio
+
+        if ratio > threshold:
+            df.isetitem(col_idx, numeric)
+
+    df.attrs['parse_ratios'] = parse_ratios
+    df.attrs['unit'] = unit
+    return df
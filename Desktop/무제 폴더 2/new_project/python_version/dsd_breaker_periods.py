@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+📅 DSD Breaker 기간 비교 엔진
+같은 회사의 여러 공시를 표준 계정 키 + 회계 기간으로 정렬하여 올해 전기 값 = 작년 당기 값을 한 번의 조인으로 검증
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from dsd_breaker_accounts import canonical_account
+from dsd_breaker_classify import BALANCE_SHEET, CASH_FLOW, INCOME_STATEMENT
+from dsd_breaker_verify import DEFAULT_TOLERANCE, Finding, numeric_matrix
+
+# 비교할 재무제표 종류 (주석은 같은 계정이 여러 표에 나와 기본 제외)
+DEFAULT_STATEMENTS = (BALANCE_SHEET, INCOME_STATEMENT, CASH_FLOW)
+
+RULE_PERIOD = 'period'   # 올해 공시의 전기 값 = 이전 공시의 당기 값
+
+# 열 이름의 기간: '제 54 기', '제 54(당) 기', '제 12 분기' / '당기', '전기말', '전전기', '당반기'
+_RE_FISCAL = re.compile(r'제\s*(\d+)\s*(?:\(\s*[당전]\s*\)\s*)?(?:기|분기|반기)')
+_RELATIVE_PERIODS = (
+    (re.compile(r'전\s*전\s*(?:기|분기|반기|년)'), 2),
+    (re.compile(r'당\s*(?:기|분기|반기|년)'), 0),
+    (re.compile(r'전\s*(?:기|분기|반기|년)'), 1),
+)
+
+# 파일 이름의 사업연도 ('감사보고서_2023.html', '2023.12')
+_RE_YEAR = re.compile(r'(?<!\d)((?:19|20)\d{2})(?!\d)')
+
+PERIOD_COLUMNS = ['company', 'filing', 'statement', 'table', 'row', 'column', 'label', 'account',
+                  'fiscal', 'offset', 'value']
+
+
+def column_period(column):
+    """열 이름 → ('fiscal', 기수) 또는 ('offset', 당기로부터 몇 기 전), 기간 열이 아니면 None"""
+    text = str(column)
+    match = _RE_FISCAL.search(text)
+    if match:
+        return 'fiscal', int(match.group(1))
+    for pattern, offset in _RELATIVE_PERIODS:
+        if pattern.search(text):
+            return 'offset', offset
+    return None
+
+
+def filing_year(filing):
+    """파일 이름의 사업연도 (없으면 None)"""
+    years = _RE_YEAR.findall(str(filing))
+    return int(years[-1]) if years else None
+
+
+class PeriodIndex:
+    """회사/재무제표/계정/기간별 보고 값 색인 (공시 여러 개)"""
+
+    def __init__(self, statements=DEFAULT_STATEMENTS):
+        self.statements = None if statements is None else set(statements)
+        self._parts = []
+        self._filings = []
+        self._frame = None
+
+    def add_filing(self, filing, tables, company='', year=None):
+        """공시 하나의 테이블 목록 추가 (year가 없으면 파일 이름에서 사업연도 추출)"""
+        parts = []
+        for number, df in enumerate(tables):
+            statement = df.attrs.get('statement_type')
+            if self.statements is not None and statement not in self.statements:
+                continue
+            part = self._table_part(df, f'Table_{number + 1}', statement)
+            if part is not None:
+                parts.append(part)
+
+        columns = ['statement', 'table', 'row', 'column', 'label', 'account', 'fiscal', 'offset', 'value']
+        part = pd.DataFrame({column: np.concatenate([p[column] for p in parts]) if parts else []
+                             for column in columns}, columns=columns)
+        # 같은 재무제표에 같은 계정/기간이 여러 번 나오면 첫 값 (금액|합계 2열 배치 포함)
+        part = part.drop_duplicates(['statement', 'account', 'fiscal', 'offset'])
+
+        # 기수 열은 이 공시의 당기 기수(가장 큰 기수) 기준 몇 기 전인지로 변환
+        fiscal = part['fiscal'].dropna()
+        current = int(fiscal.max()) if len(fiscal) else None
+        if current is not None:
+            part['offset'] = part['offset'].fillna(current - part['fiscal'])
+        part = part.dropna(subset=['offset'])
+        part.insert(0, 'filing', filing)
+        part.insert(0, 'company', company)
+
+        self._parts.append(part)
+        self._filings.append({'company': company, 'filing': filing, 'fiscal': current,
+                              'year': year if year is not None else filing_year(filing),
+                              'order': len(self._filings)})
+        self._frame = None
+        return len(part)
+
+    def _table_part(self, df, table, statement):
+        """테이블의 (계정 행 x 기간 열) 값을 열 배열로 (기간 열이 없으면 None)"""
+        columns, values = numeric_matrix(df)
+        periods = [column_period(column) for column in columns]
+        period_columns = [j for j, period in enumerate(periods) if period is not None]
+        if not period_columns or not len(df):
+            return None
+
+        labels = np.asarray([str(label).strip() if label == label and label is not None else ''
+                             for label in df.iloc[:, 0].tolist()], dtype=object)
+        accounts = np.asarray([canonical_account(label) if label else '' for label in labels],
+                              dtype=object)
+        valid = np.fromiter((len(account) >= 2 for account in accounts), dtype=bool, count=len(accounts))
+
+        block = values[:, period_columns]
+        rows, cols = np.nonzero(valid[:, None] & ~np.isnan(block))
+        kinds = np.asarray([periods[j][0] == 'fiscal' for j in period_columns])[cols]
+        numbers = np.asarray([periods[j][1] for j in period_columns], dtype=float)[cols]
+        names = np.asarray([str(columns[j]) for j in period_columns], dtype=object)[cols]
+        return {
+            'statement': np.full(len(rows), statement, dtype=object),
+            'table': np.full(len(rows), table, dtype=object),
+            'row': rows,
+            'column': names,
+            'label': labels[rows],
+            'account': accounts[rows],
+            'fiscal': np.where(kinds, numbers, np.nan),
+            'offset': np.where(kinds, np.nan, numbers),
+            'value': block[rows, cols],
+        }
+
+    def extend(self, other):
+        """다른 색인(프로세스 풀 작업자가 만든 공시별 색인 등)의 공시를 이어 붙임"""
+        for filing in other._filings:
+            self._filings.append({**filing, 'order': len(self._filings)})
+        self._parts.extend(other._parts)
+        self._frame = None
+        return self
+
+    @property
+    def filings(self):
+        """공시 목록과 기간 기준 (기수/사업연도/입력 순서)"""
+        return pd.DataFrame(self._filings, columns=['company', 'filing', 'fiscal', 'year', 'order'])
+
+    @property
+    def frame(self):
+        """기간 기준까지 붙인 색인 전체 (계정 x 기간 값 하나당 한 행)"""
+        if self._frame is None:
+            if not self._parts:
+                return pd.DataFrame(columns=PERIOD_COLUMNS + ['period'])
+            frame = pd.concat(self._parts, ignore_index=True)
+            frame['offset'] = frame['offset'].astype(np.int64)
+            # 회사가 다르면 파일 이름이 같을 수 있으므로 (회사, 공시)로 기준 연결
+            base = self.filings.set_index(['company', 'filing'])[self._period_basis()]
+            keys = pd.MultiIndex.from_arrays([frame['company'], frame['filing']])
+            frame['period'] = base.reindex(keys).to_numpy().astype(np.int64) - frame['offset'].to_numpy()
+            self._frame = frame
+        return self._frame
+
+    def _period_basis(self):
+        """공시 간 기간을 맞출 기준: 모든 공시에 기수가 있으면 기수, 사업연도가 있으면 연도, 아니면 입력 순서"""
+        filings = self.filings
+        for basis in ('fiscal', 'year'):
+            if filings[basis].notna().all():
+                return basis
+        return 'order'
+
+    def compare(self, tolerance=DEFAULT_TOLERANCE):
+        """모든 공시의 이전 기간 값을 해당 기간이 당기인 공시 값과 한 번에 조인 비교 → (비교 수, Finding 목록)"""
+        frame = self.frame
+        if frame.empty:
+            return 0, []
+
+        keys = ['company', 'statement', 'account', 'period']
+        current = frame.loc[frame['offset'] == 0, keys + ['filing', 'value']]
+        current = current.rename(columns={'filing': 'reference', 'value': 'expected'})
+        prior = frame[frame['offset'] > 0]
+        pairs = prior.merge(current, on=keys)
+        pairs = pairs[pairs['filing'] != pairs['reference']]
+        if pairs.empty:
+            return 0, []
+
+        mismatched = pairs[(pairs['value'] - pairs['expected']).abs() > tolerance]
+        findings = [Finding(row.table, int(row.row), row.label, row.column, float(row.expected),
+                            float(row.value), RULE_PERIOD, row.filing, row.reference)
+                    for row in mismatched.itertuples(index=False)]
+        findings.sort(key=lambda finding: (finding.filing, finding.table, finding.row, finding.column))
+        return len(pairs), findings
+
+    def history(self, label, company=''):
+        """계정 하나의 기간별 보고 값 (행: 기간, 열: 공시) - 재작성 여부를 한눈에 확인"""
+        frame = self.frame
+        if frame.empty:
+            return pd.DataFrame()
+        selected = frame[(frame['account'] == canonical_account(label)) & (frame['company'] == company)]
+        return selected.pivot_table(index='period', columns='filing', values='value', aggfunc='first')
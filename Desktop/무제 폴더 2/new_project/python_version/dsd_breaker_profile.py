@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+⏱️ DSD Breaker 변환 단계별 측정
+파일 읽기/파싱/격자/분류/DataFrame/숫자 정규화/기록 단계의 시간과 처리량을 집계하고 프로파일러 연결
+"""
+
+import cProfile
+import json
+import time
+from contextlib import contextmanager
+
+# pyinstrument가 있으면 .html 결과 파일에 호출 트리 저장
+try:
+    from pyinstrument import Profiler as InstrumentProfiler
+    HAS_PYINSTRUMENT = True
+except ImportError:
+    HAS_PYINSTRUMENT = False
+
+# 보고서에 표시하는 단계 순서
+STAGES = ('read', 'parse', 'grid', 'classify', 'dataframe', 'numbers', 'write', 'cache')
+
+# 테이블 단위로 측정하는 추출 단계 (나머지 파싱 시간은 lxml 파싱으로 집계)
+TABLE_STAGES = ('grid', 'classify', 'dataframe', 'numbers')
+
+REPORT_VERSION = 2
+
+_MB = 1024 * 1024
+
+
+class StageClock:
+    """직전 lap 이후 경과 시간을 stats.stages에 누적 (stats가 None이면 측정하지 않음)"""
+    __slots__ = ('stages', 'last')
+
+    def __init__(self, stats):
+        self.stages = stats.stages if stats is not None else None
+        self.last = time.perf_counter()
+
+    def lap(self, stage):
+        """단계 하나 종료"""
+        if self.stages is None:
+            return
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self.last)
+        self.last = now
+
+
+def add_stage(stats, stage, seconds):
+    """stats.stages에 단계 시간 추가"""
+    stats.stages[stage] = stats.stages.get(stage, 0.0) + seconds
+
+
+def finish_parse_stage(stats):
+    """파싱 시간 중 테이블 단계와 캐시 저장을 제외한 나머지를 lxml 파싱 시간으로 기록"""
+    table_seconds = sum(stats.stages.get(stage, 0.0) for stage in TABLE_STAGES + ('cache',))
+    stats.stages['parse'] = max(stats.parse_seconds - table_seconds, 0.0)
+
+
+def throughput(num_bytes, seconds):
+    """처리량(MB/s, 측정 시간이 0이면 0)"""
+    return num_bytes / _MB / seconds if seconds > 0 else 0.0
+
+
+def run_report(file_stats, wall_seconds):
+    """파일별 측정값(SourceStats dict 목록)을 실행 보고서로 집계"""
+    stages = dict.fromkeys(STAGES, 0.0)
+    for stats in file_stats:
+        for stage, seconds in stats.get('stages', {}).items():
+            stages[stage] = stages.get(stage, 0.0) + seconds
+
+    total_bytes = sum(stats['bytes'] for stats in file_stats)
+    tables = sum(stats.get('tables', 0) for stats in file_stats)
+    cells = sum(stats.get('cells', 0) for stats in file_stats)
+
+    return {
+        'version': REPORT_VERSION,
+        'wall_seconds': wall_seconds,
+        'files': len(file_stats),
+        'cached_files': sum(1 for stats in file_stats if stats.get('cached')),
+        'bytes': total_bytes,
+        'tables': tables,
+        'cells': cells,
+        'mb_per_second': throughput(total_bytes, wall_seconds),
+        'tables_per_second': tables / wall_seconds if wall_seconds > 0 else 0.0,
+        # 파일별 메모리 증가분 중 최대 (프로세스 전체 최대 메모리가 아님)
+        'max_file_memory_mb': max((stats.get('file_memory_mb', 0.0) for stats in file_stats), default=0.0),
+        'stages': stages,
+        'per_file': file_stats,
+    }
+
+
+def describe_report(report):
+    """로그 표시용 실행 요약 (처리량과 단계별 시간 비중)"""
+    busy = sum(report['stages'].values())
+    parts = [f"{stage} {seconds:.2f}초 ({seconds / busy:.0%})"
+             for stage, seconds in report['stages'].items() if seconds > 0 and busy > 0]
+    return (f"{report['bytes'] / _MB:,.1f}MB, 테이블 {report['tables']:,}개, 셀 {report['cells']:,}개 / "
+            f"{report['wall_seconds']:.2f}초 = {report['mb_per_second']:.1f}MB/s, "
+            f"{report['tables_per_second']:,.0f}테이블/s\n  단계별: {', '.join(parts)}")
+
+
+def save_report(report, path):
+    """실행 보고서를 JSON으로 저장"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def load_report(path):
+    """저장된 실행 보고서 읽기"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@contextmanager
+def profiled(path):
+    """블록 실행을 프로파일링하여 path에 저장 (.html은 pyinstrument, 그 외는 cProfile .prof)
+
+    프로세스 풀 작업자의 실행은 포함되지 않으므로 전체 호출 트리는 작업 수 1로 측정한다.
+    """
+    if not path:
+        yield
+        return
+
+    if str(path).endswith('.html'):
+        if not HAS_PYINSTRUMENT:
+            raise ImportError("HTML 프로파일 결과를 만들려면 pyinstrument가 필요합니다: pip install pyinstrument")
+        profiler = InstrumentProfiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(str(path))
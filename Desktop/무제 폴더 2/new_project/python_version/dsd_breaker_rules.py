@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+📐 DSD Breaker 감사 규칙 엔진
+데코레이터로 등록한 테이블 규칙과 선언형 회계 등식을 한 번 읽은 테이블 행렬에서 일괄 평가
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+
+from dsd_breaker_accounts import canonical_account
+from dsd_breaker_verify import (DEFAULT_TOLERANCE, RULE_DUPLICATE, RULE_EMPTY, RULE_IDENTITY,
+                                RULE_NEGATIVE, Finding, TableVerification, numeric_matrix,
+                                table_levels, verify_hierarchy)
+
+# YAML 규칙 파일을 선택적으로 지원
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+# 규칙 이름 (등록 순서 = 평가 순서)
+RULE_HIERARCHY = 'hierarchy'
+
+# 기본 회계 등식 (계정명은 표준 계정 키로 비교하므로 표기 차이 무관)
+DEFAULT_IDENTITIES = (
+    '자산총계 = 유동자산 + 비유동자산',
+    '부채총계 = 유동부채 + 비유동부채',
+    '자산총계 = 부채총계 + 자본총계',
+    '부채와자본총계 = 부채총계 + 자본총계',
+    '매출총이익 = 매출액 - 매출원가',
+    '영업이익 = 매출총이익 - 판매비와관리비',
+    '당기순이익 = 법인세비용차감전순이익 - 법인세비용',
+)
+
+# 등식 우변 항: 부호와 계정명
+_RE_TERM = re.compile(r'([+-]?)\s*([^+-]+)')
+
+
+@dataclass(frozen=True)
+class Identity:
+    """회계 등식 하나 (target = Σ sign x account)"""
+    target: str
+    terms: tuple        # ((+1/-1, 계정명), ...)
+    expression: str
+
+    @classmethod
+    def parse(cls, text):
+        """'자산총계 = 부채총계 + 자본총계' 형식의 등식 해석"""
+        left, sep, right = str(text).partition('=')
+        terms = tuple((-1 if sign == '-' else 1, account.strip())
+                      for sign, account in _RE_TERM.findall(right) if account.strip())
+        if not sep or not left.strip() or not terms:
+            raise ValueError(f"회계 등식 형식이 아닙니다: {text!r} (예: 자산총계 = 부채총계 + 자본총계)")
+        return cls(left.strip(), terms, right.strip())
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    """등록된 테이블 규칙"""
+    name: str
+    func: object
+    defaults: dict
+
+
+_TABLE_RULES = {}
+
+
+def table_rule(name, **defaults):
+    """테이블 규칙 등록 데코레이터 (func(context, params, engine) → (비교 수, Finding 목록))
+
+    키워드 인자는 규칙 파일의 parameters에서 바꿀 수 있는 기본값.
+    """
+    def register(func):
+        _TABLE_RULES[name] = RuleSpec(name, func, defaults)
+        return func
+    return register
+
+
+def registered_rules():
+    """등록된 규칙 이름 (평가 순서)"""
+    return list(_TABLE_RULES)
+
+
+class TableContext:
+    """규칙 평가용 테이블 정보 (숫자 행렬/라벨/계정 키/레벨을 한 번만 계산)"""
+
+    def __init__(self, df, table='', filing='', levels=None):
+        self.df = df
+        self.table = table
+        self.filing = filing
+        self.columns, self.values = numeric_matrix(df)
+        self._levels = levels
+
+    @cached_property
+    def all_numeric(self):
+        """비율/주당 열까지 포함한 (숫자 열 이름, 행렬)"""
+        return numeric_matrix(self.df, additive_only=False)
+
+    @cached_property
+    def labels(self):
+        """첫 열 라벨 (앞뒤 공백 제거)"""
+        if not len(self.df.columns):
+            return []
+        return [str(label).strip() for label in self.df.iloc[:, 0].tolist()]
+
+    @cached_property
+    def accounts(self):
+        """행별 표준 계정 키"""
+        return [canonical_account(label) for label in self.labels]
+
+    @cached_property
+    def levels(self):
+        """행별 레벨 (넘겨받은 값 우선)"""
+        return table_levels(self.df) if self._levels is None else self._levels
+
+
+class CompiledIdentities:
+    """회계 등식 목록을 계수 행렬로 변환 (테이블마다 행렬 곱 한 번으로 모든 등식 평가)"""
+
+    def __init__(self, identities):
+        self.identities = [identity if isinstance(identity, Identity) else Identity.parse(identity)
+                           for identity in identities]
+        self.vocabulary = {}
+        for identity in self.identities:
+            for account in (identity.target, *(account for _, account in identity.terms)):
+                self.vocabulary.setdefault(canonical_account(account), len(self.vocabulary))
+
+        shape = (len(self.identities), len(self.vocabulary))
+        self.coefficients = np.zeros(shape)
+        self.targets = np.zeros(len(self.identities), dtype=np.int64)
+        for i, identity in enumerate(self.identities):
+            self.targets[i] = self.vocabulary[canonical_account(identity.target)]
+            for sign, account in identity.terms:
+                self.coefficients[i, self.vocabulary[canonical_account(account)]] += sign
+        self.required = (self.coefficients != 0).astype(np.int64)
+        self.term_counts = self.required.sum(axis=1)
+
+    def evaluate(self, context, tolerance):
+        """테이블의 모든 등식 평가 → (비교 셀 수, Finding 목록)"""
+        if not self.identities or not context.columns:
+            return 0, []
+
+        # 등식에 나오는 계정의 테이블 내 첫 행
+        rows = np.full(len(self.vocabulary), -1, dtype=np.int64)
+        for row, account in enumerate(context.accounts):
+            index = self.vocabulary.get(account)
+            if index is not None and rows[index] < 0:
+                rows[index] = row
+        found = rows >= 0
+        if not found[self.targets].any():
+            return 0, []
+
+        values = np.full((len(self.vocabulary), len(context.columns)), np.nan)
+        values[found] = context.values[rows[found]]
+        present = ~np.isnan(values)
+
+        expected = self.coefficients @ np.nan_to_num(values)
+        actual = values[self.targets]
+        # 좌변과 우변의 모든 항이 있는 셀만 비교
+        compared = (self.required @ present == self.term_counts[:, None]) & present[self.targets]
+        mismatched = compared & (np.abs(actual - expected) > tolerance)
+
+        findings = []
+        for i, col in zip(*np.nonzero(mismatched)):
+            row = int(rows[self.targets[i]])
+            findings.append(Finding(context.table, row, context.labels[row], str(context.columns[col]),
+                                    float(expected[i, col]), float(actual[i, col]), RULE_IDENTITY,
+                                    context.filing, self.identities[i].expression))
+        return int(compared.sum()), findings
+
+
+@table_rule(RULE_HIERARCHY)
+def check_hierarchy(context, params, engine):
+    """레벨 기반 소계/합계"""
+    result = verify_hierarchy(context.df, context.table, context.levels, engine.tolerance,
+                              context.filing, matrix=(context.columns, context.values))
+    return result.checked, result.findings
+
+
+@table_rule(RULE_IDENTITY)
+def check_identities(context, params, engine):
+    """회계 등식"""
+    return engine.identities.evaluate(context, engine.tolerance)
+
+
+@table_rule(RULE_NEGATIVE, ratio=0.5, non_additive=False)
+def check_negative(context, params, engine):
+    """음수 개수가 양수 개수 x ratio를 넘는 열
+
+    기본값은 금액 열만 검사하고 비율/%/주당 열(증감률, 주당손실 등 음수가 정상인 열)은 제외한다.
+    non_additive=True이면 이 열들도 검사한다.
+    """
+    columns, values = context.all_numeric if params['non_additive'] else (context.columns, context.values)
+    negative = (values < 0).sum(axis=0)
+    positive = (values > 0).sum(axis=0)
+    flagged = (negative > 0) & (negative > positive * params['ratio'])
+    findings = [Finding(context.table, -1, '', str(columns[col]),
+                        float(positive[col] * params['ratio']), float(negative[col]), RULE_NEGATIVE,
+                        context.filing)
+                for col in np.flatnonzero(flagged)]
+    return len(columns), findings
+
+
+@table_rule(RULE_DUPLICATE)
+def check_duplicates(context, params, engine):
+    """같은 계정과목 라벨이 반복된 행 (라벨마다 처음 반복된 행 하나)"""
+    seen = set()
+    repeated = set()
+    findings = []
+    for row, label in enumerate(context.labels):
+        if label in seen and label not in repeated:
+            repeated.add(label)
+            findings.append(Finding(context.table, row, label, '', np.nan, np.nan, RULE_DUPLICATE,
+                                    context.filing))
+        seen.add(label)
+    return len(context.labels), findings
+
+
+@table_rule(RULE_EMPTY, ratio=0.5)
+def check_empty(context, params, engine):
+    """빈 셀 비율이 ratio를 넘는 열"""
+    df = context.df
+    if not len(df):
+        return 0, []
+    ratios = df.isnull().mean()
+    findings = [Finding(context.table, -1, '', str(column), params['ratio'], float(ratio), RULE_EMPTY,
+                        context.filing)
+                for column, ratio in ratios[ratios > params['ratio']].items()]
+    return len(df.columns), findings
+
+
+class RuleEngine:
+    """등록된 규칙 중 선택한 규칙을 테이블마다 한 번에 평가"""
+
+    def __init__(self, rules=None, parameters=None, identities=DEFAULT_IDENTITIES,
+                 tolerance=DEFAULT_TOLERANCE):
+        names = registered_rules() if rules is None else list(rules)
+        unknown = [name for name in names if name not in _TABLE_RULES]
+        if unknown:
+            raise ValueError(f"알 수 없는 규칙: {', '.join(unknown)} "
+                             f"(사용 가능: {', '.join(registered_rules())})")
+        parameters = parameters or {}
+        self.rules = [_TABLE_RULES[name] for name in names]
+        self.parameters = {spec.name: {**spec.defaults, **parameters.get(spec.name, {})}
+                           for spec in self.rules}
+        self.identities = CompiledIdentities(identities)
+        self.tolerance = tolerance
+
+    @classmethod
+    def from_config(cls, config, rules=None, tolerance=DEFAULT_TOLERANCE):
+        """규칙 설정 dict로 엔진 생성
+
+        {'identities': [...], 'extend_identities': true, 'parameters': {'negative': {'ratio': 0.5}},
+         'disabled': ['duplicate'], 'tolerance': 1}
+        """
+        identities = list(config.get('identities', ()))
+        if config.get('extend_identities', True):
+            identities = [*DEFAULT_IDENTITIES, *identities]
+        names = registered_rules() if rules is None else list(rules)
+        disabled = set(config.get('disabled', ()))
+        return cls([name for name in names if name not in disabled], config.get('parameters'),
+                   identities, config.get('tolerance', tolerance))
+
+    def evaluate(self, df, table='', filing='', levels=None):
+        """테이블 하나에 모든 규칙 적용 (숫자 행렬/계정 키는 규칙 간 공유)"""
+        context = TableContext(df, table, filing, levels)
+        checked = 0
+        findings = []
+        for spec in self.rules:
+            count, rule_findings = spec.func(context, self.parameters[spec.name], self)
+            checked += count
+            findings.extend(rule_findings)
+        return TableVerification(table, checked, findings)
+
+
+def load_rules(path, rules=None, tolerance=DEFAULT_TOLERANCE):
+    """규칙 파일(.json, .yaml/.yml)로 엔진 생성 (path가 None이면 기본 규칙)"""
+    if path is None:
+        return RuleEngine(rules, tolerance=tolerance)
+
+    text = Path(path).read_text(encoding='utf-8')
+    if Path(path).suffix.lower() in ('.yaml', '.yml'):
+        if not HAS_YAML:
+            raise ImportError("YAML 규칙 파일을 읽으려면 PyYAML이 필요합니다: pip install pyyaml")
+        config = yaml.safe_load(text) or {}
+    else:
+        config = json.loads(text)
+    return RuleEngine.from_config(config, rules, tolerance)
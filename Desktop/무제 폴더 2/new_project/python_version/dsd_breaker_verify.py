@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+➕ DSD Breaker 계층 합계 검증 엔진
+들여쓰기 레벨로 계정 트리를 만들고 모든 숫자 열의 소계/합계를 하위 항목 합과 한 번에 비교
+"""
+
+import re
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+from dsd_breaker_levels import label_levels
+
+# 합계 행 라벨 ('자산총계', '유동자산 합계', '소계', '계', 'Total')
+_RE_TOTAL_LABEL = re.compile(r'합\s*계|총\s*계|소\s*계|^\s*계\s*$|\btotal\b|\bsum\b', re.IGNORECASE)
+
+# 더할 수 없는 열(비율/주당 금액)과 행(주당이익 등)
+_RE_NON_ADDITIVE_COLUMN = re.compile(r'비\s*율|%|구성비|증감률|주당')
+_RE_NON_ADDITIVE_ROW = re.compile(r'주당|비\s*율|%')
+
+# 반올림 차이로 보고 허용하는 절대 오차 (보고 단위 1)
+DEFAULT_TOLERANCE = 1.0
+
+# 규칙 이름
+RULE_SUBTOTAL = 'subtotal'   # 상위 항목 = 바로 아래 레벨 항목의 합
+RULE_TOTAL = 'total'         # 합계 행 = 앞 블록 항목의 합
+RULE_XREF = 'xref'           # 같은 계정 = 다른 표(재무제표 본문)의 값
+RULE_NEGATIVE = 'negative'   # 음수가 양수에 비해 많은 열
+RULE_DUPLICATE = 'duplicate' # 같은 계정과목이 반복된 행
+RULE_EMPTY = 'empty'         # 빈 셀이 많은 열
+RULE_IDENTITY = 'identity'   # 회계 등식 (자산총계 = 부채총계 + 자본총계), reference에 우변 식
+
+# 레벨별 합계 집계 열
+LEVEL_SUM_COLUMNS = ['level', 'column', 'rows', 'count', 'sum', 'checked', 'mismatches', 'difference']
+
+_RULE_KINDS = {RULE_SUBTOTAL: "하위 항목 합계", RULE_TOTAL: "앞 항목 합계"}
+
+
+@dataclass
+class Finding:
+    """검증 결과 하나 (불일치 셀)"""
+    table: str
+    row: int            # 테이블 내 행 위치 (0부터)
+    label: str          # 계정과목
+    column: str
+    expected: float     # 하위 항목으로 계산한 값
+    actual: float       # 보고된 값
+    rule: str
+    filing: str = ''
+    reference: str = ''  # 교차 참조 기준 테이블
+
+    @property
+    def difference(self):
+        return self.actual - self.expected
+
+    def describe(self):
+        """로그/리포트 표시용 문자열"""
+        if self.rule == RULE_NEGATIVE:
+            return f"{self.table}.{self.column}: 비정상적으로 많은 음수 값 ({self.actual:,.0f}개)"
+        if self.rule == RULE_DUPLICATE:
+            return f"{self.table}: 중복 항목 '{self.label}'"
+        if self.rule == RULE_EMPTY:
+            return f"{self.table}.{self.column}: 빈 셀 비율 {self.actual:.1%}"
+        kind = _RULE_KINDS.get(self.rule) or f"{self.reference} 값"
+        return (f"{self.table} '{self.label}' ({self.column}): {kind} {self.expected:,.0f} "
+                f"≠ 보고값 {self.actual:,.0f} (차이 {self.difference:,.0f})")
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class TableVerification:
+    """테이블 하나의 합계 검증 결과"""
+    table: str
+    checked: int        # 비교한 셀 수
+    findings: list
+
+
+def indent_levels(indents):
+    """들여쓰기 폭 목록을 0부터 시작하는 레벨로 변환 (서로 다른 폭의 순위)"""
+    indents = np.asarray(indents, dtype=np.int64)
+    if not len(indents):
+        return np.zeros(0, dtype=np.int8)
+    _, levels = np.unique(indents, return_inverse=True)
+    return levels.astype(np.int8)
+
+
+def table_levels(df):
+    """테이블 행별 레벨 (파싱 시 계산한 레벨 우선, 없으면 저장된 들여쓰기 → 첫 열 공백/번호 체계)"""
+    levels = df.attrs.get('levels')
+    if levels is not None and len(levels) == len(df):
+        return np.asarray(levels, dtype=np.int8)
+
+    indents = df.attrs.get('indents')
+    if indents is not None and len(indents) == len(df):
+        return indent_levels(indents)
+
+    if not len(df.columns):
+        return np.zeros(len(df), dtype=np.int8)
+    return label_levels(df.iloc[:, 0].tolist())
+
+
+def numeric_matrix(df, additive_only=True):
+    """더할 수 있는 숫자 열 이름과 (행 x 열) float 행렬 (additive_only=False이면 비율/주당 열 포함)"""
+    # select_dtypes/df[columns]는 작은 표가 많을 때 표마다 수 ms가 들어 열 단위로 직접 변환
+    positions = [i for i, (column, dtype) in enumerate(df.dtypes.items())
+                 if is_numeric_dtype(dtype) and not is_bool_dtype(dtype)
+                 and not (additive_only and _RE_NON_ADDITIVE_COLUMN.search(str(column)))]
+    if not positions:
+        return [], np.empty((len(df), 0))
+    columns = [df.columns[i] for i in positions]
+    values = np.empty((len(df), len(positions)))
+    for j, i in enumerate(positions):
+        values[:, j] = df.iloc[:, i].to_numpy(dtype=float, na_value=np.nan)
+    return columns, values
+
+
+def _header_parents(levels):
+    """각 행의 상위 항목 (앞쪽에서 가장 가까운 더 얕은 레벨 행, 없으면 -1)"""
+    parents = np.full(len(levels), -1, dtype=np.int64)
+    stack = []
+    for row, level in enumerate(levels.tolist()):
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        if stack:
+            parents[row] = stack[-1][1]
+        stack.append((level, row))
+    return parents
+
+
+def _total_root(label):
+    """합계 라벨의 대상 이름 ('유동자산 합계' → '유동자산', '자산총계' → '자산')"""
+    return re.sub(r'\s+', '', _RE_TOTAL_LABEL.sub('', label))
+
+
+def _total_parents(levels, labels, is_total, has_value):
+    """각 행이 속한 합계 행 (합계 행 바로 앞 블록의 최상위 항목, 없으면 -1)
+
+    합계 행 앞에 더 깊은 레벨 행이 있으면 그 블록의 가장 얕은 레벨 항목을 더하고, 블록의 상위 항목이
+    값을 가진 제목이면 같은 레벨 제목들을 더한다. 들여쓰기가 없으면
+    합계 라벨과 이름이 같은 제목 행('자산' ↔ '자산총계') 이후 블록을, 제목 행이 없으면 앞쪽 같은
+    레벨 항목들을 더한다. 블록에 소계가 있으면 소계가 하위 항목을 대신한다.
+    """
+    n = len(levels)
+    parents = np.full(n, -1, dtype=np.int64)
+    level_list = levels.tolist()
+    # 바로 다음 행이 더 깊으면 하위 항목을 가진 제목 행
+    has_children = np.zeros(n, dtype=bool)
+    has_children[:-1] = levels[1:] > levels[:-1]
+
+    # 값이 없는 제목 행 위치 (공백 제거한 라벨 → 행 목록)
+    headings = {}
+    for row in np.flatnonzero(~has_value & ~is_total).tolist():
+        headings.setdefault(re.sub(r'\s+', '', labels[row]), []).append(row)
+
+    for row in np.flatnonzero(is_total).tolist():
+        level = level_list[row]
+        members = []
+        j = row - 1
+        while j >= 0 and level_list[j] > level:
+            members.append(j)
+            j -= 1
+
+        if members and j >= 0 and has_value[j] and not is_total[j]:
+            # 앞 블록의 상위 항목이 값을 가진 소계 제목이면 ('Ⅱ. 비유동자산' 아래 항목 뒤 '자산총계')
+            # 합계는 같은 레벨 제목들의 합
+            members = []
+            k = row - 1
+            while k >= 0 and level_list[k] >= level:
+                if level_list[k] == level:
+                    if is_total[k]:
+                        break
+                    members.append(k)
+                k -= 1
+        elif not members:
+            heading = max((h for h in headings.get(_total_root(labels[row]), ()) if h < row),
+                          default=None)
+            if heading is not None:
+                members = [m for m in range(heading + 1, row) if level_list[m] == level]
+            else:
+                while j >= 0 and level_list[j] == level and not is_total[j]:
+                    members.append(j)
+                    j -= 1
+
+        members = [m for m in members if has_value[m]]
+        if not members:
+            continue
+        top = min(level_list[m] for m in members)
+        members = [m for m in members if level_list[m] == top]
+        if any(is_total[m] for m in members):
+            # 소계가 있으면 소계로 요약된 항목은 중복이므로 제외
+            members = [m for m in members if is_total[m] or (not has_children[m] and top > level)]
+        parents[members] = row
+
+    return parents
+
+
+def _check_groups(values, parents, candidates, tolerance):
+    """상위 행 값과 하위 행 합을 모든 열에 대해 한 번에 비교 → (비교 마스크, 불일치 마스크, 합)"""
+    n, k = values.shape
+    sums = np.zeros((n, k))
+    counts = np.zeros((n, k), dtype=np.int64)
+
+    child = parents >= 0
+    if child.any():
+        child_values = values[child]
+        np.add.at(sums, parents[child], np.nan_to_num(child_values))
+        np.add.at(counts, parents[child], ~np.isnan(child_values))
+
+    # DART의 '금액 | 합계' 2열 배치: 하위 항목은 왼쪽 열, 소계는 오른쪽 열에 기재
+    if k > 1:
+        use_left = np.zeros((n, k), dtype=bool)
+        use_left[:, 1:] = (counts[:, 1:] == 0) & (counts[:, :-1] > 0) & np.isnan(values[:, :-1])
+        sums[:, 1:] = np.where(use_left[:, 1:], sums[:, :-1], sums[:, 1:])
+        counts[:, 1:] = np.where(use_left[:, 1:], counts[:, :-1], counts[:, 1:])
+
+    compared = candidates[:, None] & (counts > 0) & ~np.isnan(values)
+    mismatched = compared & (np.abs(values - sums) > tolerance)
+    return compared, mismatched, sums
+
+
+def _hierarchy_checks(df, levels, tolerance, matrix):
+    """계정 트리의 소계/합계 비교 행렬 → (열 이름, 합산 대상 값 행렬, 라벨, [(규칙, 비교, 불일치, 하위 합)])"""
+    columns, values = numeric_matrix(df) if matrix is None else matrix
+    labels = df.iloc[:, 0].astype(str).str.strip()
+
+    # 주당이익/비율 행은 합산 대상이 아님
+    values = values.copy()
+    values[labels.str.contains(_RE_NON_ADDITIVE_ROW).to_numpy()] = np.nan
+    if len(df) < 2:
+        return columns, values, labels, []
+
+    is_total = labels.str.contains(_RE_TOTAL_LABEL).to_numpy()
+    has_value = ~np.isnan(values).all(axis=1)
+
+    # 1) 제목 행(값 있음) = 직계 하위 항목의 합 (손자 행은 자식 소계에 포함), 합계 행은 제목이 아님
+    header_parents = _header_parents(levels)
+    linked = header_parents >= 0
+    header_parents[linked] = np.where(is_total[header_parents[linked]], -1, header_parents[linked])
+
+    # 2) 합계 행 = 앞 블록 항목의 합
+    total_parents = _total_parents(levels, labels.tolist(), is_total, has_value)
+
+    checks = [(rule, *_check_groups(values, parents, candidates, tolerance))
+              for rule, parents, candidates in ((RULE_SUBTOTAL, header_parents, ~is_total),
+                                                (RULE_TOTAL, total_parents, is_total))]
+    return columns, values, labels, checks
+
+
+def verify_hierarchy(df, table='', levels=None, tolerance=DEFAULT_TOLERANCE, filing='', matrix=None):
+    """레벨 기반 계정 트리로 소계/합계 검증 (모든 숫자 열을 NumPy 그룹 합으로 한 번에 처리)
+
+    matrix에 numeric_matrix(df) 결과를 넘기면 숫자 열 변환을 다시 하지 않는다.
+    """
+    if matrix is None:
+        matrix = numeric_matrix(df)
+    if not matrix[0] or len(df) < 2:
+        return TableVerification(table, 0, [])
+
+    levels = np.asarray(table_levels(df) if levels is None else levels, dtype=np.int64)
+    columns, values, labels, checks = _hierarchy_checks(df, levels, tolerance, matrix)
+
+    findings = []
+    checked = 0
+    for rule, compared, mismatched, sums in checks:
+        checked += int(compared.sum())
+        for row, col in zip(*np.nonzero(mismatched)):
+            findings.append(Finding(table, int(row), labels.iat[row], str(columns[col]),
+                                    float(sums[row, col]), float(values[row, col]), rule, filing))
+
+    findings.sort(key=lambda finding: (finding.row, finding.column))
+    return TableVerification(table, checked, findings)
+
+
+def _level_totals(levels, depth, cells):
+    """(행 x 열) 값을 레벨별로 합산한 (레벨 x 열) 행렬 (모든 열을 bincount 한 번으로)"""
+    k = cells.shape[1]
+    bins = (levels[:, None] * k + np.arange(k)).ravel()
+    return np.bincount(bins, weights=cells.ravel(), minlength=depth * k).reshape(depth, k)
+
+
+def level_sums(df, levels=None, tolerance=DEFAULT_TOLERANCE, matrix=None):
+    """레벨 x 숫자 열별 항목 수/값 개수/합계와 소계·합계 검증 불일치를 한 번에 집계한 DataFrame
+
+    mismatches는 그 레벨 행이 상위(제목/합계) 값으로서 하위 항목 합과 다른 셀 수, difference는
+    불일치 셀의 (보고값 - 하위 항목 합) 합계.
+    """
+    if matrix is None:
+        matrix = numeric_matrix(df)
+    if not matrix[0] or not len(df):
+        return pd.DataFrame(columns=LEVEL_SUM_COLUMNS)
+
+    levels = np.asarray(table_levels(df) if levels is None else levels, dtype=np.int64)
+    columns, values, _, checks = _hierarchy_checks(df, levels, tolerance, matrix)
+    depth = int(levels.max()) + 1
+    present = ~np.isnan(values)
+
+    checked = np.zeros(values.shape)
+    mismatched = np.zeros(values.shape)
+    difference = np.zeros(values.shape)
+    for _, compared, mismatch, sums in checks:
+        checked += compared
+        mismatched += mismatch
+        difference += np.where(mismatch, values - sums, 0.0)
+
+    totals = [_level_totals(levels, depth, cells)
+              for cells in (present, np.nan_to_num(values), checked, mismatched, difference)]
+    rows = np.bincount(levels, minlength=depth)
+
+    frame = pd.DataFrame({
+        'level': np.repeat(np.arange(depth), len(columns)),
+        'column': [str(column) for column in columns] * depth,
+        'rows': np.repeat(rows, len(columns)),
+        'count': totals[0].ravel().astype(np.int64),
+        'sum': totals[1].ravel(),
+        'checked': totals[2].ravel().astype(np.int64),
+        'mismatches': totals[3].ravel().astype(np.int64),
+        'difference': totals[4].ravel(),
+    }, columns=LEVEL_SUM_COLUMNS)
+    # 레벨 번호를 건너뛴 경우(외부에서 받은 레벨) 빈 레벨은 제외
+    return frame[frame['rows'] > 0].reset_index(drop=True)
+
+
+def findings_frame(findings):
+    """검증 결과 목록을 DataFrame으로 변환"""
+    columns = ['filing', 'table', 'row', 'label', 'column', 'expected', 'actual', 'rule',
+               'reference']
+    return pd.DataFrame([finding.to_dict() for finding in findings], columns=columns)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+📡 DSD Breaker 증분 변환 / 폴더 감시
+처리한 공시 파일의 매니페스트(경로, 크기, 수정 시각, 내용 해시, 출력 파일)를 유지하여
+새 파일이나 내용이 바뀐 파일만 파싱하고, 다운로드 폴더를 주기적으로 확인하여 자동 변환
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field, fields, replace
+from datetime import datetime
+from pathlib import Path
+
+from dsd_breaker_cache import file_digest
+from dsd_breaker_engine import ConversionOptions, ProgressEvent, collect_html_files, convert_batch
+from dsd_breaker_export import COLUMNAR_FORMATS
+from dsd_breaker_io import open_html_source
+
+# 출력 폴더에 저장하는 매니페스트 파일명
+MANIFEST_NAME = '.dsd_manifest.json'
+
+# 폴더 감시 기본 확인 주기와, 다운로드 중인 파일로 보고 건너뛸 최근 수정 시간(초)
+DEFAULT_INTERVAL = 5.0
+DEFAULT_SETTLE_SECONDS = 2.0
+
+
+@dataclass
+class ManifestEntry:
+    """처리한 HTML 파일 하나의 기록"""
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    output: str = ''
+    sheets: list = field(default_factory=list)
+    error: str = ''
+    converted_at: str = ''
+
+
+class Manifest:
+    """처리한 파일 매니페스트 (JSON 파일)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            names = {f.name for f in fields(ManifestEntry)}
+            for item in data.get('files', []):
+                entry = ManifestEntry(**{k: v for k, v in item.items() if k in names})
+                self.entries[entry.path] = entry
+
+    def get(self, path):
+        """파일 기록 (없으면 None)"""
+        return self.entries.get(path)
+
+    def update(self, entry):
+        """파일 기록 추가/갱신"""
+        self.entries[entry.path] = entry
+
+    def remove(self, path):
+        """파일 기록 삭제"""
+        self.entries.pop(path, None)
+
+    def outputs(self):
+        """기록된 출력 파일 경로 → 원본 경로"""
+        return {entry.output: entry.path for entry in self.entries.values() if entry.output}
+
+    def save(self):
+        """매니페스트 저장 (임시 파일에 쓴 뒤 교체하여 중간에 중단되어도 손상되지 않음)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'version': 1, 'files': [asdict(entry) for entry in self.entries.values()]}
+        fd, temp_path = tempfile.mkstemp(prefix='.manifest-', dir=self.path.parent)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def open_manifest(output_dir):
+    """출력 폴더의 매니페스트 열기"""
+    return Manifest(Path(output_dir) / MANIFEST_NAME)
+
+
+def content_hash(path):
+    """파일 내용 sha256 (mmap으로 읽음)"""
+    with open_html_source(path) as source:
+        return file_digest(source)
+
+
+def find_changed_files(html_files, manifest, settle_seconds=0.0):
+    """새 파일/변경된 파일의 (경로, 크기, 수정 시각, 해시) 목록
+
+    크기와 수정 시각이 기록과 같으면 해시를 계산하지 않는다. 시각만 바뀌고 내용이 같은 파일은
+    매니페스트만 갱신한다. settle_seconds 이내에 수정된 파일은 다운로드 중으로 보고 건너뛴다.
+    변환에 실패한 기록(error)이 있는 파일은 바뀌지 않았어도 다시 변환한다 (일시적인 실패 재시도).
+    """
+    changed = []
+    now = time.time()
+
+    for path in html_files:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+
+        if settle_seconds and now - stat.st_mtime < settle_seconds:
+            continue
+
+        entry = manifest.get(path)
+        if entry is not None and entry.error:
+            changed.append((path, stat.st_size, stat.st_mtime_ns, content_hash(path)))
+            continue
+        if entry is not None and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+            continue
+
+        sha256 = content_hash(path)
+        if entry is not None and entry.sha256 == sha256:
+            entry.size, entry.mtime_ns = stat.st_size, stat.st_mtime_ns
+            continue
+
+        changed.append((path, stat.st_size, stat.st_mtime_ns, sha256))
+
+    return changed
+
+
+def output_path_for(html_file, sha256, output_dir, manifest, output_format='xlsx'):
+    """원본 파일의 출력 경로: Excel은 이름.xlsx, 열 형식은 공시별 폴더 (다른 원본과 이름이 겹치면 해시 일부를 붙임)"""
+    suffix = '.xlsx' if output_format not in COLUMNAR_FORMATS else ''
+    entry = manifest.get(html_file)
+    # 출력 형식을 바꿔 다시 실행하면 기록된 경로 대신 새 형식의 경로 사용
+    if entry is not None and entry.output and Path(entry.output).suffix == suffix:
+        return entry.output
+
+    output = str(Path(output_dir) / f"{Path(html_file).stem}{suffix}")
+    owner = manifest.outputs().get(output)
+    if owner is not None and owner != html_file:
+        output = str(Path(output_dir) / f"{Path(html_file).stem}_{sha256[:8]}{suffix}")
+    return output
+
+
+def convert_incremental(paths, output_dir, options=None, on_event=None, cancel=None,
+                        manifest=None, settle_seconds=0.0):
+    """새 파일/변경된 파일만 파일별 출력(Excel 파일 또는 열 형식 폴더)으로 변환하고 매니페스트 갱신"""
+    # 증분 변환은 이미 공시별 출력이므로 파일별 분할(per_file)은 적용하지 않음
+    options = replace(options or ConversionOptions(), per_file=False)
+    notify = on_event or (lambda event: None)
+    manifest = manifest or open_manifest(output_dir)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    html_files = [os.path.abspath(path) for path in collect_html_files(paths)]
+    changed = find_changed_files(html_files, manifest, settle_seconds)
+
+    summary = {'scanned': len(html_files), 'changed': len(changed), 'converted': 0, 'failed': 0,
+               'outputs': [], 'cancelled': False}
+
+    if not changed:
+        manifest.save()
+        return summary
+
+    notify(ProgressEvent('start', f"📡 새 파일/변경된 파일 {len(changed)}개 "
+                                  f"(전체 {len(html_files)}개 중)", 0))
+
+    for i, (html_file, size, mtime_ns, sha256) in enumerate(changed):
+        if cancel is not None and cancel.is_set():
+            summary['cancelled'] = True
+            break
+
+        output = output_path_for(html_file, sha256, output_dir, manifest, options.output_format)
+        errors = []
+
+        def forward(event):
+            if event.kind == 'error':
+                errors.append(event.message.strip())
+            if event.kind not in ('start', 'done'):
+                notify(event)
+
+        result = convert_batch([html_file], output, options, on_event=forward, cancel=cancel)
+        if result['cancelled']:
+            # 일부만 기록된 파일은 매니페스트에 남기지 않아 다음 실행에서 다시 변환
+            summary['cancelled'] = True
+            break
+
+        manifest.update(ManifestEntry(
+            path=html_file, size=size, mtime_ns=mtime_ns, sha256=sha256, output=output,
+            sheets=result['sheets'], error=errors[0] if errors else '',
+            converted_at=datetime.now().isoformat(timespec='seconds')
+        ))
+        # 중단되어도 처리한 파일은 다시 변환하지 않도록 파일마다 저장
+        manifest.save()
+
+        if errors:
+            summary['failed'] += 1
+        else:
+            summary['converted'] += 1
+            summary['outputs'].append(output)
+            notify(ProgressEvent('sheet', f"  💾 {os.path.basename(output)}",
+                                 (i + 1) / len(changed) * 100, os.path.basename(html_file)))
+
+    notify(ProgressEvent('done', f"✅ 증분 변환 완료: 변환 {summary['converted']}개 / "
+                                 f"실패 {summary['failed']}개", 100))
+    return summary
+
+
+def watch(paths, output_dir, options=None, on_event=None, stop=None,
+          interval=DEFAULT_INTERVAL, settle_seconds=DEFAULT_SETTLE_SECONDS):
+    """폴더를 주기적으로 확인하여 새로 받은 공시를 자동 변환 (stop이 설정될 때까지 실행)
+
+    파일 시스템 알림 대신 크기/수정 시각 폴링을 사용하므로 네트워크 드라이브에서도 동작한다.
+    """
+    stop = stop or threading.Event()
+    notify = on_event or (lambda event: None)
+    manifest = open_manifest(output_dir)
+    totals = {'converted': 0, 'failed': 0, 'outputs': []}
+
+    notify(ProgressEvent('start', f"👀 폴더 감시 시작 ({interval:g}초 간격), 출력: {output_dir}", 0))
+
+    while not stop.is_set():
+        summary = convert_incremental(paths, output_dir, options, on_event, cancel=stop,
+                                      manifest=manifest, settle_seconds=settle_seconds)
+        totals['converted'] += summary['converted']
+        totals['failed'] += summary['failed']
+        totals['outputs'].extend(summary['outputs'])
+        stop.wait(interval)
+
+    notify(ProgressEvent('done', "⏹️ 폴더 감시 종료", 100))
+    return totals
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+🧾 DSD Breaker DART XML 입력
+DART 공시 원문 XML(DOCUMENT/TABLE/TR/TD/TE/TU)을 HTML 렌더링 없이 직접 읽어 격자 엔진에 전달
+"""
+
+import re
+
+from lxml import etree
+
+# DART XML 판별: XML 선언 뒤 DOCUMENT 루트 (대소문자 구분)
+_RE_DART_XML = re.compile(rb'^(?:\xef\xbb\xbf)?\s*(?:<\?xml[^>]*\?>\s*)?(?:<!--.*?-->\s*)*<DOCUMENT\b', re.DOTALL)
+
+# DART XML 요소 → 격자 엔진이 사용하는 HTML 요소 (TE: 일반 셀, TU: 단위/회사명 등 사용자 입력 셀)
+_XML_TAGS = {
+    'TABLE': 'table',
+    'THEAD': 'thead',
+    'TBODY': 'tbody',
+    'TR': 'tr',
+    'TH': 'th',
+    'TD': 'td',
+    'TE': 'td',
+    'TU': 'td',
+}
+
+_SPAN_ATTRIBUTES = ('ROWSPAN', 'COLSPAN')
+
+# DART XML의 줄바꿈 엔티티 (DTD 선언이 없어 복구 파서가 '&cr;' 글자로 남기므로 파싱 전에 줄바꿈으로 치환)
+_ENTITY = b'&cr;'
+_ENTITY_TEXT = b'\n'
+
+# 스트리밍 중 아직 변환 전인 바깥 표까지 포함한 테이블 태그
+TABLE_TAGS = ('table', 'TABLE')
+
+
+def is_dart_xml(head):
+    """파일 앞부분 바이트가 DART XML 문서인지 여부"""
+    return _RE_DART_XML.match(head) is not None
+
+
+def normalize_table(table):
+    """TABLE 하위 요소의 태그와 span 속성을 HTML 이름으로 변경 (격자 엔진/분류기 그대로 사용)"""
+    for element in table.iter():
+        tag = _XML_TAGS.get(element.tag)
+        if tag is None:
+            continue
+        element.tag = tag
+        for name in _SPAN_ATTRIBUTES:
+            value = element.get(name)
+            if value is not None:
+                element.set(name.lower(), value)
+    return table
+
+
+def _xml_parser():
+    """DART XML 파서 (그 밖의 정의되지 않은 엔티티와 깨진 태그는 복구)"""
+    return etree.XMLParser(recover=True, huge_tree=True, resolve_entities=False)
+
+
+def _replace_entities(chunks):
+    """바이트 조각의 &cr;을 줄바꿈으로 치환 (조각 경계에 걸친 엔티티는 다음 조각과 합쳐 처리)"""
+    tail = b''
+    for chunk in chunks:
+        data = tail + chunk
+        # 끝부분의 '&', '&c', '&cr'은 다음 조각에서 엔티티가 완성될 수 있음
+        cut = data.find(b'&', max(len(data) - len(_ENTITY) + 1, 0))
+        data, tail = (data[:cut], data[cut:]) if cut >= 0 else (data, b'')
+        yield data.replace(_ENTITY, _ENTITY_TEXT)
+    if tail:
+        yield tail
+
+
+def _source_chunks(source):
+    """파서에 전달할 바이트 조각 (&cr;이 있는 문서만 치환하고 없으면 그대로)"""
+    if source.buffer.find(_ENTITY) < 0:
+        return source.chunks()
+    return _replace_entities(source.chunks())
+
+
+class _ChunkReader:
+    """바이트 조각 iterator를 iterparse용 파일 객체로 (조각 경계에서는 요청보다 짧게 반환)"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._data = b''
+        self._offset = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = self._data[self._offset:] + b''.join(self._chunks)
+            self._data, self._offset = b'', 0
+            return data
+        while self._offset >= len(self._data):
+            self._data, self._offset = next(self._chunks, None), 0
+            if self._data is None:
+                self._data = b''
+                return b''
+        data = self._data[self._offset:self._offset + size]
+        self._offset += len(data)
+        return data
+
+
+def parse_xml_source(source):
+    """mmap 바이트를 조각 단위로 XML 파서에 전달하고 모든 TABLE을 HTML 이름으로 변환"""
+    if not source.size:
+        return None
+
+    parser = _xml_parser()
+    try:
+        for chunk in _source_chunks(source):
+            parser.feed(chunk)
+        document = parser.close()
+    except (etree.XMLSyntaxError, ValueError):
+        return None
+
+    if document is None:
+        return None
+    for table in list(document.iter('TABLE')):
+        normalize_table(table)
+    return document
+
+
+def iter_xml_tables(source):
+    """TABLE 요소를 닫히는 순서대로 반환 (중첩 표는 안쪽부터, 해제는 호출자가 담당)"""
+    reader = (source.reader() if source.buffer.find(_ENTITY) < 0
+              else _ChunkReader(_replace_entities(source.chunks())))
+    context = etree.iterparse(reader, events=('end',), tag='TABLE',
+                              recover=True, huge_tree=True, resolve_entities=False)
+    for _, table in context:
+        yield normalize_table(table)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+🔄 DSD Breaker 계정 교차 참조 색인
+모든 테이블(여러 공시 포함)의 계정과목을 정규화된 이름 → 등장 위치/값 역색인으로 모아 한 번에 일관성 검사
+"""
+
+import numpy as np
+import pandas as pd
+
+from dsd_breaker_accounts import DEFAULT_THRESHOLD, AccountMatcher, canonical_account
+from dsd_breaker_classify import BALANCE_SHEET, CASH_FLOW, INCOME_STATEMENT
+from dsd_breaker_verify import DEFAULT_TOLERANCE, RULE_XREF, Finding, numeric_matrix
+
+# 기준 값으로 우선하는 재무제표 본문 종류
+_STATEMENTS = (BALANCE_SHEET, INCOME_STATEMENT, CASH_FLOW)
+
+# 여러 표에 반복되지만 같은 계정이 아닌 일반 라벨 (교차 참조 대상에서 제외)
+_GENERIC_ACCOUNTS = frozenset({'합계', '총계', '소계', '계', '기초', '기말', '기타', '증가', '감소',
+                               '대체', '당기', '전기', '구분', '과목', 'total', 'sum'})
+
+# 색인 열: 공시/테이블/행/숫자 열 순번(slot)/열 이름/원래 라벨/정규화 계정명/값
+INDEX_COLUMNS = ['filing', 'table', 'order', 'statement', 'slots', 'row', 'slot', 'column',
+                 'label', 'account', 'value']
+
+
+class AccountIndex:
+    """정규화된 계정명 → 등장 위치(공시/테이블/행/열)와 값 역색인"""
+
+    def __init__(self, normalize=canonical_account):
+        self.normalize = normalize
+        self._parts = []
+        self._tables = 0
+        self._frame = None
+        self._positions = None
+
+    def add_table(self, df, table, filing=''):
+        """테이블 하나의 계정 행을 색인에 추가하고 추가된 행 수 반환"""
+        columns, values = numeric_matrix(df)
+        if not columns or not len(df):
+            return 0
+
+        # 표마다 DataFrame을 만들면 작은 표가 많을 때 느리므로 열 배열만 모아 두고 한 번에 결합
+        labels = [str(label).strip() if label == label and label is not None else ''
+                  for label in df.iloc[:, 0].tolist()]
+        accounts = [self.normalize(label) if label else '' for label in labels]
+        seen = set()
+        keep = np.zeros(len(labels), dtype=bool)
+        for i, account in enumerate(accounts):
+            # 표 안에서 같은 계정이 반복되면 (기초/기말 블록 등) 첫 행만 사용
+            if len(account) >= 2 and account not in _GENERIC_ACCOUNTS and account not in seen:
+                seen.add(account)
+                keep[i] = True
+        keep &= ~np.isnan(values).all(axis=1)
+
+        rows = np.flatnonzero(keep)
+        if not len(rows):
+            return 0
+        block = values[rows]
+        row_idx, col_idx = np.nonzero(~np.isnan(block))
+        count = len(row_idx)
+
+        self._parts.append({
+            'filing': np.full(count, filing, dtype=object),
+            'table': np.full(count, table, dtype=object),
+            'order': np.full(count, self._tables),
+            'statement': np.full(count, df.attrs.get('statement_type') in _STATEMENTS),
+            'slots': np.full(count, len(columns)),
+            'row': rows[row_idx],
+            'slot': col_idx,
+            'column': np.asarray([str(column) for column in columns], dtype=object)[col_idx],
+            'label': np.asarray(labels, dtype=object)[rows][row_idx],
+            'account': np.asarray(accounts, dtype=object)[rows][row_idx],
+            'value': block[row_idx, col_idx],
+        })
+        self._tables += 1
+        self._frame = None
+        self._positions = None
+        return len(rows)
+
+    def add_tables(self, tables, filing=''):
+        """(테이블 이름, DataFrame) 목록을 색인에 추가"""
+        for table, df in tables:
+            self.add_table(df, table, filing)
+        return self
+
+    @property
+    def frame(self):
+        """색인 전체 (계정 셀 하나당 한 행)"""
+        if self._frame is None:
+            self._frame = pd.DataFrame({column: np.concatenate([part[column] for part in self._parts])
+                                        if self._parts else [] for column in INDEX_COLUMNS},
+                                       columns=INDEX_COLUMNS)
+        return self._frame
+
+    def __len__(self):
+        return len(self.frame)
+
+    def lookup(self, label):
+        """계정명(정규화 전 라벨도 가능)의 모든 등장 위치와 값"""
+        if self._positions is None:
+            self._positions = self.frame.groupby('account', sort=False).indices
+        positions = self._positions.get(self.normalize(label))
+        if positions is None:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[positions]
+
+    def shared_accounts(self, min_tables=2):
+        """공시별로 min_tables개 이상의 테이블에 등장하는 계정과 테이블 수"""
+        frame = self.frame
+        counts = frame.groupby(['filing', 'account'], sort=False)['order'].nunique()
+        return counts[counts >= min_tables].rename('tables').reset_index()
+
+    def check_consistency(self, tolerance=DEFAULT_TOLERANCE):
+        """같은 공시 안에서 같은 계정의 값을 기준 테이블 값과 열 순번별로 비교 → (비교 셀 수, Finding 목록)
+
+        기준 테이블은 재무제표 본문 중 먼저 나온 표, 없으면 먼저 나온 표. 열 구성이 다른 주석 표는
+        열 수가 같거나 한 열 이상 값이 일치할 때만 비교한다 (위치가 다른 열끼리의 거짓 불일치 방지).
+        """
+        frame = self.frame
+        if frame.empty:
+            return 0, []
+
+        keys = ['filing', 'account']
+        ranked = frame.assign(secondary=~frame['statement'].astype(bool))
+        ranked = ranked.sort_values(['secondary', 'order'], kind='stable')
+        reference = ranked.drop_duplicates(keys)[keys + ['order']]
+
+        merged = frame.merge(reference, on=keys, suffixes=('', '_ref'))
+        is_reference = (merged['order'] == merged['order_ref']).to_numpy()
+        base = merged.loc[is_reference, keys + ['slot', 'table', 'slots', 'value']]
+        base = base.rename(columns={'table': 'reference', 'slots': 'reference_slots',
+                                    'value': 'expected'})
+        pairs = merged.loc[~is_reference].merge(base, on=keys + ['slot'])
+        if pairs.empty:
+            return 0, []
+
+        matched = (pairs['value'] - pairs['expected']).abs() <= tolerance
+        any_match = matched.groupby([pairs['filing'], pairs['account'], pairs['order']]).transform('any')
+        comparable = any_match | (pairs['slots'] == pairs['reference_slots'])
+
+        findings = [Finding(row.table, int(row.row), row.label, row.column, float(row.expected),
+                            float(row.value), RULE_XREF, row.filing, row.reference)
+                    for row in pairs[comparable & ~matched].itertuples(index=False)]
+        findings.sort(key=lambda finding: (finding.filing, finding.table, finding.row, finding.column))
+        return int(comparable.sum()), findings
+
+    def suggest_matches(self, threshold=DEFAULT_THRESHOLD):
+        """다른 표에 정확히 같은 계정이 없는 주석 계정 → 같은 공시 재무제표 본문의 유사 계정 후보"""
+        frame = self.frame
+        columns = ['filing', 'table', 'label', 'account', 'candidate', 'score']
+        if frame.empty:
+            return pd.DataFrame(columns=columns)
+
+        accounts = frame.drop_duplicates(['filing', 'order', 'account'])
+        tables = accounts.groupby(['filing', 'account'])['order'].transform('size')
+        suggestions = []
+        for filing, group in accounts.groupby('filing', sort=False):
+            statement = group['statement'].astype(bool)
+            matcher = AccountMatcher(group.loc[statement, 'label'])
+            if not len(matcher):
+                continue
+            single = group[~statement & (tables[group.index] == 1)]
+            for row in single.itertuples(index=False):
+                best = matcher.best(row.label, threshold)
+                if best is not None and best[1] != row.account:
+                    suggestions.append((filing, row.table, row.label, row.account, best[0], best[2]))
+        return pd.DataFrame(suggestions, columns=columns)
+
+
+def build_index(tables, filing='', normalize=canonical_account):
+    """(테이블 이름, DataFrame) 목록으로 계정 색인 생성"""
+    return AccountIndex(normalize).add_tables(tables, filing)
@@ -290,6 +290,392 @@ def test_audit_dependencies():
     
     return True
 
+def test_account_matcher_add_after_match():
+    """질의 후에도 라벨을 추가할 수 있고 추가한 라벨이 다음 질의에 반영됨"""
+    from dsd_breaker_accounts import AccountMatcher
+
+    matcher = AccountMatcher(['현금및현금성자산'])
+    assert matcher.best('현금 및 현금성자산')[0] == '현금및현금성자산'
+
+    matcher.add('매출채권')
+    assert matcher.best('외상매출금')[1] == '매출채권'
+    assert matcher.best('재고자산') is None
+
+    matcher.add('재고자산')
+    assert matcher.best('Ⅲ. 재고자산')[0] == '재고자산'
+    assert len(matcher) == 3
+
+def test_canonical_account_exact_aliases():
+    """다른 표기는 정규화 문자열이 정확히 같을 때만 표준 계정으로, 부호/범위가 다른 계정은 합치지 않음"""
+    from dsd_breaker_accounts import AccountMatcher, canonical_account
+
+    assert canonical_account('Ⅴ. 이익잉여금(결손금)') == canonical_account('이익잉여금')
+    assert canonical_account('영업수익') == canonical_account('매출액')
+    assert canonical_account('(주석 3) 외상 매출금') == canonical_account('매출채권')
+
+    # 결손금은 이익잉여금과 부호가 반대, 수익/매출은 매출액 외 항목도 포함하는 상위 항목
+    for label in ('결손금', '수익', '매출', '기타수익', '매출총이익'):
+        assert canonical_account(label) != canonical_account('매출액')
+    assert canonical_account('결손금') != canonical_account('이익잉여금')
+
+    matcher = AccountMatcher(['수익', '매출', '매출액', '이익잉여금', '결손금'])
+    assert len(matcher) == 5
+    assert matcher.best('결손금')[0] == '결손금'
+    assert matcher.best('수익')[0] == '수익'
+
+def _hierarchy_sample():
+    """레벨이 있는 작은 재무상태표 (유동/비유동 소계와 자산총계가 모두 맞음)"""
+    df = pd.DataFrame({
+        '과목': ['유동자산', '현금및현금성자산', '매출채권', '비유동자산', '유형자산', '무형자산', '자산총계'],
+        '당기': [300.0, 100.0, 200.0, 500.0, 450.0, 50.0, 800.0],
+        '전기': [250.0, 90.0, 160.0, 400.0, 380.0, 20.0, 650.0],
+    })
+    levels = [0, 1, 1, 0, 1, 1, 0]
+    return df, levels
+
+def test_verify_hierarchy_consistent_table():
+    """합계가 모두 맞는 표는 불일치 없이 소계/합계 셀을 비교함"""
+    from dsd_breaker_verify import verify_hierarchy
+
+    df, levels = _hierarchy_sample()
+    result = verify_hierarchy(df, 'BS', levels=levels)
+
+    assert result.findings == []
+    # 소계 2행 x 2열 + 자산총계 1행 x 2열
+    assert result.checked == 6
+
+def test_verify_hierarchy_total_mismatch():
+    """자산총계 한 셀을 바꾸면 그 행/열의 total 불일치 하나만 보고됨"""
+    from dsd_breaker_verify import RULE_TOTAL, verify_hierarchy
+
+    df, levels = _hierarchy_sample()
+    df.loc[6, '당기'] = 900.0
+    result = verify_hierarchy(df, 'BS', levels=levels, filing='2023.html')
+
+    assert len(result.findings) == 1
+    finding = result.findings[0]
+    assert (finding.rule, finding.row, finding.label, finding.column) == (RULE_TOTAL, 6, '자산총계', '당기')
+    assert (finding.expected, finding.actual) == (800.0, 900.0)
+    assert finding.filing == '2023.html'
+
+def test_verify_hierarchy_amount_total_columns():
+    """DART '금액 | 합계' 2열 배치: 하위 항목은 왼쪽 열, 소계는 오른쪽 열에서 비교"""
+    from dsd_breaker_verify import RULE_SUBTOTAL, verify_hierarchy
+
+    nan = float('nan')
+    df = pd.DataFrame({
+        '과목': ['유동자산', '현금및현금성자산', '매출채권', '비유동자산', '유형자산', '무형자산'],
+        '금액': [nan, 100.0, 200.0, nan, 450.0, 50.0],
+        '합계': [300.0, nan, nan, 500.0, nan, nan],
+    })
+    levels = [0, 1, 1, 0, 1, 1]
+
+    result = verify_hierarchy(df, 'BS', levels=levels)
+    assert result.findings == []
+    assert result.checked == 2
+
+    df.loc[3, '합계'] = 550.0
+    result = verify_hierarchy(df, 'BS', levels=levels)
+    assert [(f.rule, f.row, f.column, f.expected, f.actual) for f in result.findings] == \
+        [(RULE_SUBTOTAL, 3, '합계', 500.0, 550.0)]
+
+def test_compiled_identities_on_balance_sheet():
+    """회계 등식 두 개 중 맞는 등식은 통과하고 틀린 등식 하나만 보고됨"""
+    from dsd_breaker_rules import CompiledIdentities, TableContext
+    from dsd_breaker_verify import RULE_IDENTITY
+
+    df = pd.DataFrame({
+        '과목': ['유동자산', '비유동자산', '자산총계', '부채총계', '자본총계'],
+        '당기': [300.0, 600.0, 1000.0, 400.0, 600.0],
+    })
+    identities = CompiledIdentities(['자산총계 = 부채총계 + 자본총계',
+                                     '자산 총계 = 유동자산 + 비유동자산'])
+    checked, findings = identities.evaluate(TableContext(df, 'BS', '2023.html'), tolerance=1.0)
+
+    assert checked == 2
+    assert len(findings) == 1
+    finding = findings[0]
+    assert (finding.rule, finding.row, finding.label, finding.column) == (RULE_IDENTITY, 2, '자산총계', '당기')
+    assert (finding.expected, finding.actual) == (900.0, 1000.0)
+    assert finding.reference == '유동자산 + 비유동자산'
+
+def test_identity_parse_rejects_malformed():
+    """등호나 좌변/우변이 없는 등식은 ValueError"""
+    import pytest
+    from dsd_breaker_rules import Identity
+
+    identity = Identity.parse('매출총이익 = 매출액 - 매출원가')
+    assert identity.target == '매출총이익'
+    assert identity.terms == ((1, '매출액'), (-1, '매출원가'))
+
+    for text in ('자산총계', '자산총계 부채총계 + 자본총계', '= 부채총계 + 자본총계', '자산총계 = ', '자산총계 = +'):
+        with pytest.raises(ValueError):
+            Identity.parse(text)
+
+def test_rule_engine_from_config():
+    """설정의 disabled 규칙은 빠지고 parameters는 기본값을 덮어씀"""
+    from dsd_breaker_rules import RuleEngine
+    from dsd_breaker_verify import RULE_DUPLICATE, RULE_NEGATIVE
+
+    df = pd.DataFrame({
+        '과목': ['대손충당금', '대손충당금', '현금'],
+        '당기': [-10.0, -20.0, 30.0],
+    })
+    default = RuleEngine().evaluate(df, 'T')
+    assert {RULE_DUPLICATE, RULE_NEGATIVE} <= {finding.rule for finding in default.findings}
+
+    engine = RuleEngine.from_config({'disabled': [RULE_DUPLICATE],
+                                     'parameters': {RULE_NEGATIVE: {'ratio': 2.0}}})
+    assert RULE_DUPLICATE not in [spec.name for spec in engine.rules]
+    assert engine.parameters[RULE_NEGATIVE] == {'ratio': 2.0, 'non_additive': False}
+    assert engine.parameters['empty'] == {'ratio': 0.5}
+    assert not any(finding.rule in (RULE_DUPLICATE, RULE_NEGATIVE)
+                   for finding in engine.evaluate(df, 'T').findings)
+
+def test_negative_rule_skips_non_additive_columns():
+    """음수 규칙은 기본적으로 비율/%/주당 열을 제외하고, non_additive=True이면 검사"""
+    from dsd_breaker_rules import RuleEngine
+    from dsd_breaker_verify import RULE_NEGATIVE
+
+    df = pd.DataFrame({
+        '과목': ['매출액', '영업이익', '당기순이익'],
+        '당기': [100.0, -5.0, 20.0],
+        '증감률': [-0.1, -0.3, 0.2],
+        '구성비(%)': [-1.0, -2.0, 3.0],
+        '주당 금액': [-50.0, -10.0, 5.0],
+        '전기': [-10.0, -20.0, 5.0],
+    })
+    default = RuleEngine(rules=[RULE_NEGATIVE]).evaluate(df, 'IS')
+    assert [finding.column for finding in default.findings] == ['전기']
+    assert default.checked == 2
+
+    engine = RuleEngine(rules=[RULE_NEGATIVE], parameters={RULE_NEGATIVE: {'non_additive': True}})
+    result = engine.evaluate(df, 'IS')
+    assert [finding.column for finding in result.findings] == ['증감률', '구성비(%)', '주당 금액', '전기']
+    assert result.checked == 5
+
+def test_load_rules_json(tmp_path):
+    """JSON 규칙 파일의 등식/허용 오차로 엔진 생성"""
+    import json
+    from dsd_breaker_rules import load_rules
+    from dsd_breaker_verify import RULE_IDENTITY
+
+    path = tmp_path / 'rules.json'
+    path.write_text(json.dumps({'identities': ['자본총계 = 자본금 + 이익잉여금'],
+                                'extend_identities': False, 'tolerance': 5},
+                               ensure_ascii=False), encoding='utf-8')
+    engine = load_rules(path, rules=[RULE_IDENTITY])
+    assert [identity.target for identity in engine.identities.identities] == ['자본총계']
+    assert engine.tolerance == 5
+
+    df = pd.DataFrame({'과목': ['자본금', '이익잉여금', '자본총계'], '당기': [100.0, 200.0, 303.0]})
+    assert engine.evaluate(df, 'BS').findings == []
+    df.loc[2, '당기'] = 310.0
+    assert [(f.row, f.expected, f.actual) for f in engine.evaluate(df, 'BS').findings] == [(2, 300.0, 310.0)]
+
+def test_level_sums_matches_groupby():
+    """level_sums의 행 수/값 개수/합계가 pandas groupby와 같고 불일치 수는 verify_hierarchy 결과와 같음"""
+    from dsd_breaker_verify import level_sums, verify_hierarchy
+
+    df, levels = _hierarchy_sample()
+    df['구성비(%)'] = [30.0, 10.0, 20.0, 50.0, 45.0, 5.0, 100.0]
+    df.loc[2, '전기'] = float('nan')
+    df.loc[4, '당기'] = float('nan')
+    df.loc[6, '당기'] = 900.0
+
+    sums = level_sums(df, levels=levels).set_index(['level', 'column'])
+
+    # 비율 열은 더할 수 없는 열이라 제외
+    assert sorted(sums.index.get_level_values('column').unique()) == ['당기', '전기']
+
+    grouped = df[['당기', '전기']].groupby(pd.Series(levels, name='level'))
+    expected = pd.concat({'count': grouped.count().stack(), 'sum': grouped.sum().stack(),
+                          'rows': grouped.size().reindex(grouped.count().stack().index, level=0)},
+                         axis=1)
+    expected.index.names = ['level', 'column']
+    for column in ('rows', 'count', 'sum'):
+        pd.testing.assert_series_equal(sums[column].sort_index(), expected[column].sort_index(),
+                                       check_dtype=False, check_names=False)
+
+    findings = verify_hierarchy(df, 'BS', levels=levels).findings
+    for (level, column), row in sums.iterrows():
+        matched = [f for f in findings if levels[f.row] == level and f.column == column]
+        assert row['mismatches'] == len(matched)
+        assert row['difference'] == sum(f.actual - f.expected for f in matched)
+    assert sums['mismatches'].sum() == len(findings) > 0
+
+def _xref_tables():
+    """재무상태표 본문과 열 구성이 같은/다른 주석 표"""
+    from dsd_breaker_classify import BALANCE_SHEET
+
+    statement = pd.DataFrame({
+        '과목': ['현금및현금성자산', '매출채권', '재고자산'],
+        '당기': [100.0, 200.0, 300.0],
+        '전기': [90.0, 150.0, 250.0],
+    })
+    statement.attrs['statement_type'] = BALANCE_SHEET
+    # 본문과 같은 '당기 | 전기' 배치: 매출채권 당기 값만 다름
+    note = pd.DataFrame({
+        '과목': ['현금 및 현금성자산', '외상매출금', '단기매출채권'],
+        '당기': [100.0, 210.0, 30.0],
+        '전기': [90.0, 150.0, 20.0],
+    })
+    # '기초 | 증가 | 감소 | 기말' 배치: 같은 위치에 일치하는 값이 없으면 비교하지 않음
+    movement = pd.DataFrame({
+        '과목': ['재고자산'],
+        '기초': [250.0], '증가': [100.0], '감소': [50.0], '기말': [300.0],
+    })
+    # 열 수는 다르지만 첫 열이 일치하면 같은 위치 열끼리 비교
+    detail = pd.DataFrame({
+        '과목': ['현금및현금성자산'],
+        '당기말': [100.0], '전기말': [95.0], '비고': [0.0],
+    })
+    return [('재무상태표', statement), ('주석1', note), ('주석2', movement), ('주석3', detail)]
+
+def test_account_index_consistency():
+    """본문 대비 주석 값 일치/불일치와 열 구성이 다른 표의 비교 규칙 (한 열 이상 일치 | 열 수 같음)"""
+    from dsd_breaker_verify import RULE_XREF
+    from dsd_breaker_xref import build_index
+
+    index = build_index(_xref_tables(), filing='2023.html')
+    checked, findings = index.check_consistency()
+
+    # 주석1 2계정 x 2열 + 주석3 현금 2열 (주석2 재고자산은 비교 제외)
+    assert checked == 6
+    assert [(f.table, f.row, f.label, f.column, f.expected, f.actual) for f in findings] == [
+        ('주석1', 1, '외상매출금', '당기', 200.0, 210.0),
+        ('주석3', 0, '현금및현금성자산', '전기말', 90.0, 95.0),
+    ]
+    assert all(f.rule == RULE_XREF and f.reference == '재무상태표' and f.filing == '2023.html'
+               for f in findings)
+
+    # 다른 공시의 같은 계정과는 비교하지 않음
+    other = pd.DataFrame({'과목': ['매출채권'], '당기': [999.0], '전기': [999.0]})
+    index.add_table(other, '주석1', filing='2022.html')
+    assert index.check_consistency() == (checked, findings)
+
+def test_account_index_suggest_matches():
+    """다른 표에 같은 계정이 없는 주석 라벨은 본문의 유사 계정을 후보로 제안"""
+    from dsd_breaker_xref import build_index
+
+    suggestions = build_index(_xref_tables()).suggest_matches()
+    assert suggestions[['table', 'label', 'candidate']].values.tolist() == [['주석1', '단기매출채권', '매출채권']]
+
+def test_period_index_compare_restatement():
+    """올해 공시의 전기 값이 작년 당기 값과 같으면 통과하고 재작성된 값만 보고됨"""
+    from dsd_breaker_classify import BALANCE_SHEET
+    from dsd_breaker_periods import RULE_PERIOD, PeriodIndex
+
+    def balance_sheet(current, prior, values):
+        df = pd.DataFrame({'과목': ['현금및현금성자산', '매출채권', '자산총계']})
+        df[f'제 {current} 기'] = [v[0] for v in values]
+        df[f'제 {prior} 기'] = [v[1] for v in values]
+        df.attrs['statement_type'] = BALANCE_SHEET
+        return df
+
+    index = PeriodIndex()
+    index.add_filing('감사보고서_2022.html', [balance_sheet(53, 52, [(100.0, 80.0), (200.0, 150.0), (300.0, 230.0)])],
+                     company='ACME')
+    # 2023년 공시의 제 53 기: 현금은 그대로, 매출채권과 자산총계는 재작성
+    index.add_filing('감사보고서_2023.html', [balance_sheet(54, 53, [(120.0, 100.0), (260.0, 210.0), (380.0, 310.0)])],
+                     company='ACME')
+
+    checked, findings = index.compare()
+    assert checked == 3
+    assert [(f.table, f.row, f.label, f.column, f.expected, f.actual) for f in findings] == [
+        ('Table_1', 1, '매출채권', '제 53 기', 200.0, 210.0),
+        ('Table_1', 2, '자산총계', '제 53 기', 300.0, 310.0),
+    ]
+    assert all(f.rule == RULE_PERIOD and f.filing == '감사보고서_2023.html'
+               and f.reference == '감사보고서_2022.html' for f in findings)
+
+    history = index.history('매출 채권', company='ACME')
+    assert history.loc[53].tolist() == [200.0, 210.0]
+
+    # 다른 회사의 공시와는 비교하지 않음
+    index.add_filing('감사보고서_2022.html', [balance_sheet(53, 52, [(1.0, 1.0), (1.0, 1.0), (1.0, 1.0)])],
+                     company='OTHER')
+    assert index.compare() == (checked, findings)
+
+def _balance_sheet_filing(total, cash):
+    """일괄 감사 테스트용 재무상태표 공시 (현금 100, 자산총계 1000이면 모두 맞음)"""
+    indent = '&nbsp;' * 4
+    return ('<html><body><p>재무상태표</p><table><thead><tr><th>과목</th><th>당기</th><th>전기</th></tr>'
+            '</thead><tbody>'
+            '<tr><td>유동자산</td><td>300</td><td>250</td></tr>'
+            f'<tr><td>{indent}현금및현금성자산</td><td>{cash}</td><td>50</td></tr>'
+            f'<tr><td>{indent}매출채권</td><td>200</td><td>200</td></tr>'
+            '<tr><td>비유동자산</td><td>700</td><td>650</td></tr>'
+            f'<tr><td>{indent}유형자산</td><td>700</td><td>650</td></tr>'
+            f'<tr><td>자산총계</td><td>{total}</td><td>900</td></tr>'
+            '</tbody></table></body></html>')
+
+def test_run_batch_audit_sqlite_store(tmp_path):
+    """작업자 2개로 두 공시를 감사해 SQLite 저장소에 공시/표/행/열/기대값/보고값/규칙을 기록"""
+    import sqlite3
+    from dsd_breaker_audit_batch import AuditOptions, load_findings, run_batch_audit
+
+    filings = tmp_path / 'filings'
+    filings.mkdir()
+    (filings / 'a_ok.html').write_text(_balance_sheet_filing(1000, 100), encoding='utf-8')
+    (filings / 'b_errors.html').write_text(_balance_sheet_filing(1100, 90), encoding='utf-8')
+    store = tmp_path / 'findings.sqlite'
+
+    events = []
+    summary = run_batch_audit([str(filings)], str(store), AuditOptions(workers=2), on_event=events.append)
+
+    assert (summary['files'], summary['audited'], summary['failed']) == (2, 2, 0)
+    assert summary['findings'] == 3
+    assert summary['rules'] == {'subtotal': 1, 'total': 1, 'identity': 1}
+    assert [event.file_name for event in events if event.kind == 'file'] == ['a_ok.html', 'b_errors.html']
+
+    with sqlite3.connect(str(store)) as connection:
+        rows = connection.execute(
+            'SELECT filing, "table", "row", label, "column", expected, actual, rule, reference '
+            'FROM findings WHERE run_id = ? ORDER BY rowid', (summary['run_id'],)).fetchall()
+        filing_rows = connection.execute(
+            'SELECT filing, tables, findings, error FROM filings WHERE run_id = ? ORDER BY rowid',
+            (summary['run_id'],)).fetchall()
+    connection.close()
+
+    assert rows == [
+        ('b_errors.html', 'Table_1', 0, '유동자산', '당기', 290.0, 300.0, 'subtotal', ''),
+        ('b_errors.html', 'Table_1', 5, '자산총계', '당기', 1000.0, 1100.0, 'total', ''),
+        ('b_errors.html', 'Table_1', 5, '자산총계', '당기', 1000.0, 1100.0, 'identity', '유동자산 + 비유동자산'),
+    ]
+    assert filing_rows == [('a_ok.html', 1, 0, None), ('b_errors.html', 1, 3, None)]
+
+    # 같은 저장소에 다시 실행하면 새 run_id로 기록되고 결과는 작업자 수와 무관
+    again = run_batch_audit([str(filings)], str(store), AuditOptions(workers=1))
+    assert again['run_id'] == summary['run_id'] + 1
+    latest = load_findings(store)
+    assert latest[['filing', 'table', 'row', 'column', 'expected', 'actual', 'rule']].values.tolist() == \
+        [list(row[:3]) + list(row[4:8]) for row in rows]
+    assert len(load_findings(store, summary['run_id'])) == 3
+
+def test_run_batch_audit_generated_filings(tmp_path):
+    """합성 공시 두 개: 병렬 감사 결과가 파일별 직렬 감사(audit_file)와 같음"""
+    from benchmark_corpus import CorpusSpec, generate_filing
+    from dsd_breaker_audit_batch import AuditOptions, audit_file, load_findings, run_batch_audit
+
+    paths = []
+    for seed in (1, 2):
+        path = tmp_path / f'filing_{seed}.html'
+        generate_filing(path, CorpusSpec(tables=3, rows=8), seed=seed)
+        paths.append(str(path))
+
+    options = AuditOptions(workers=2)
+    summary = run_batch_audit(paths, str(tmp_path / 'generated.sqlite'), options)
+    stored = load_findings(tmp_path / 'generated.sqlite')
+
+    expected = [finding for path in paths for finding in audit_file(path, options).findings]
+    assert expected and {f.filing for f in expected} == {'filing_1.html', 'filing_2.html'}
+    assert summary['audited'] == 2 and summary['findings'] == len(expected) == len(stored)
+    assert stored[['filing', 'table', 'row', 'column', 'rule']].values.tolist() == \
+        [[f.filing, f.table, f.row, f.column, f.rule] for f in expected]
+    np.testing.assert_array_equal(stored['expected'], [f.expected for f in expected])
+    np.testing.assert_array_equal(stored['actual'], [f.actual for f in expected])
+
 def main():
     """메인 테스트 함수"""
     
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+⏱️ DSD Breaker 코퍼스 벤치마크 (pytest-benchmark)
+합성 코퍼스로 추출/숫자 정규화/기록 단계의 처리량과 최대 메모리를 측정
+
+    pytest test_benchmark_corpus.py --benchmark-autosave          # 결과 저장
+    pytest test_benchmark_corpus.py --benchmark-compare            # 직전 결과와 비교
+    DSD_BENCH_LARGE_MB=300 pytest test_benchmark_corpus.py -k large  # 대용량 파일 포함
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from benchmark_corpus import CorpusSpec, generate_filing, measure_peak_rss
+from dsd_breaker_engine import ConversionOptions, ExcelBookWriter, convert
+from dsd_breaker_extractor import (convert_numbers, extract_tables_from_file,
+                                   iter_tables_from_file)
+
+# 측정할 코퍼스 종류
+CORPORA = {
+    'plain': CorpusSpec(tables=60, rows=30, span_density=0.0),
+    'spans': CorpusSpec(tables=60, rows=30, span_density=0.6),
+    'wide': CorpusSpec(tables=20, rows=200, periods=6),
+    'cp949': CorpusSpec(tables=60, rows=30, encoding='cp949'),
+}
+
+_MB = 1024 * 1024
+
+
+def consume_stream(path):
+    """스트리밍 추출을 끝까지 소비 (메모리 측정용 최상위 함수)"""
+    for _ in iter_tables_from_file(path):
+        pass
+
+
+def record_throughput(benchmark, path, tables, peak_func=None):
+    """처리량과 최대 메모리를 벤치마크 결과(extra_info)에 기록"""
+    size = os.path.getsize(path)
+    mean = benchmark.stats.stats.mean
+    benchmark.extra_info['mb'] = size / _MB
+    benchmark.extra_info['tables'] = tables
+    benchmark.extra_info['mb_per_second'] = size / _MB / mean if mean else 0.0
+    if peak_func is not None:
+        benchmark.extra_info['peak_rss_mb'] = measure_peak_rss(peak_func, path)
+
+
+@pytest.fixture(scope='module', params=sorted(CORPORA))
+def corpus_file(request, tmp_path_factory):
+    """코퍼스 종류별 합성 공시 파일"""
+    path = tmp_path_factory.mktemp('corpus') / f'{request.param}.html'
+    generate_filing(path, CORPORA[request.param], seed=1)
+    return str(path)
+
+
+@pytest.fixture(scope='module')
+def large_file(tmp_path_factory):
+    """DSD_BENCH_LARGE_MB 크기의 대용량 파일 (환경 변수가 없으면 건너뜀)"""
+    size_mb = float(os.environ.get('DSD_BENCH_LARGE_MB', 0))
+    if not size_mb:
+        pytest.skip("DSD_BENCH_LARGE_MB가 설정되지 않음")
+    path = tmp_path_factory.mktemp('large') / 'large.html'
+    generate_filing(path, CorpusSpec(target_mb=size_mb, span_density=0.3), seed=2)
+    return str(path)
+
+
+def test_extract(benchmark, corpus_file):
+    """문서 전체 파싱 + 테이블 추출"""
+    tables, _ = benchmark(extract_tables_from_file, corpus_file)
+    assert tables
+    record_throughput(benchmark, corpus_file, len(tables), extract_tables_from_file)
+
+
+def test_extract_streaming(benchmark, corpus_file):
+    """스트리밍 추출 (테이블을 하나씩 파싱 후 해제)"""
+    benchmark(consume_stream, corpus_file)
+    record_throughput(benchmark, corpus_file, None, consume_stream)
+
+
+def test_normalize_numbers(benchmark, corpus_file):
+    """숫자 정규화만 측정 (라운드마다 정규화 전 테이블 복사본 사용)"""
+    raw_tables, _ = extract_tables_from_file(corpus_file, detect_numbers=False)
+
+    def normalize(tables):
+        for df in tables:
+            convert_numbers(df, '천원', scale_units=True)
+
+    benchmark.pedantic(normalize, setup=lambda: (([df.copy() for df in raw_tables],), {}),
+                       rounds=5)
+    record_throughput(benchmark, corpus_file, len(raw_tables))
+
+
+def test_write_xlsx(benchmark, corpus_file, tmp_path):
+    """추출된 테이블을 xlsx로 기록"""
+    tables, _ = extract_tables_from_file(corpus_file)
+
+    def write():
+        writer = ExcelBookWriter(tmp_path / 'out.xlsx')
+        writer.write_file_tables(os.path.basename(corpus_file), tables, True)
+        writer.close()
+
+    benchmark.pedantic(write, rounds=3)
+    record_throughput(benchmark, corpus_file, len(tables))
+
+
+def test_convert_end_to_end(benchmark, corpus_file, tmp_path):
+    """HTML → xlsx 변환 전체 (단일 프로세스)"""
+    options = ConversionOptions(workers=1)
+    summary = benchmark.pedantic(convert, args=(corpus_file, tmp_path / 'out.xlsx', options),
+                                 rounds=3)
+    assert summary['converted'] == 1
+    benchmark.extra_info['stages'] = summary['profile']['stages']
+    record_throughput(benchmark, corpus_file, summary['profile']['tables'])
+
+
+def test_large_streaming(benchmark, large_file):
+    """대용량 파일 스트리밍 추출"""
+    benchmark.pedantic(consume_stream, args=(large_file,), rounds=1)
+    record_throughput(benchmark, large_file, None, consume_stream)
@@ -7,6 +7,8 @@ DART 스타일 HTML 감사보고서 샘플 생성
 import os
 from pathlib import Path
 
+import pytest
+
 def create_sample_dart_html():
     """DART 스타일 감사보고서 HTML 샘플 생성"""
     
@@ -510,6 +512,1076 @@ def test_converter_dependencies():
     
     return True
 
+def test_incremental_columnar_output(tmp_path):
+    """증분 변환 + 열 형식 출력은 공시별 폴더에 기록 (이름.xlsx 폴더를 만들지 않음)"""
+    from dsd_breaker_engine import ConversionOptions
+    from dsd_breaker_watch import convert_incremental
+
+    source = tmp_path / 'k.html'
+    source.write_text(create_simple_html(), encoding='utf-8')
+    output_dir = tmp_path / 'out'
+
+    summary = convert_incremental([str(source)], str(output_dir),
+                                  ConversionOptions(output_format='csv', workers=1))
+
+    assert summary['outputs'] == [str(output_dir / 'k')]
+    assert not (output_dir / 'k.xlsx').exists()
+    assert list((output_dir / 'k').glob('*.csv.gz'))
+
+def test_incremental_ignores_per_file(tmp_path):
+    """증분 변환에서 --per-file은 무시하고 공시별 워크북 하나만 기록"""
+    from dsd_breaker_engine import ConversionOptions
+    from dsd_breaker_watch import convert_incremental
+
+    source = tmp_path / 'k.html'
+    source.write_text(create_simple_html(), encoding='utf-8')
+    output_dir = tmp_path / 'out'
+
+    summary = convert_incremental([str(source)], str(output_dir),
+                                  ConversionOptions(per_file=True, workers=1))
+
+    assert summary['outputs'] == [str(output_dir / 'k.xlsx')]
+    assert (output_dir / 'k.xlsx').is_file()
+    assert not (output_dir / 'index.json').exists()
+
+def create_dart_xml():
+    """DART 공시 원문 XML 샘플 (셀 텍스트에 선언되지 않은 &cr; 엔티티 포함)"""
+    return '''<?xml version="1.0" encoding="utf-8"?>
+<DOCUMENT>
+<BODY>
+<TABLE>
+<THEAD><TR><TH>과목</TH><TH>제 10 기</TH></TR></THEAD>
+<TBODY>
+<TR><TE>&cr;현금및현금성자산</TE><TE>1,000</TE></TR>
+<TR><TE>매출채권&cr;및기타채권</TE><TE>2,000</TE></TR>
+<TR><TE>자산총계</TE><TE>3,000</TE></TR>
+</TBODY>
+</TABLE>
+</BODY>
+</DOCUMENT>
+'''
+
+
+def test_dart_xml_cr_entity(tmp_path):
+    """DART XML의 &cr; 엔티티는 줄바꿈으로 읽어 라벨에 남지 않음 (전체/스트리밍 추출 모두)"""
+    from dsd_breaker_accounts import canonical_account
+    from dsd_breaker_extractor import extract_tables_from_file, iter_tables_from_file
+    from dsd_breaker_xml import _replace_entities
+
+    path = tmp_path / 'dart.xml'
+    path.write_text(create_dart_xml(), encoding='utf-8')
+
+    tables, _ = extract_tables_from_file(str(path))
+    streamed = list(iter_tables_from_file(str(path)))
+    for df in (tables[0], streamed[0]):
+        labels = df.iloc[:, 0].tolist()
+        assert labels == ['현금및현금성자산', '매출채권 및기타채권', '자산총계']
+        assert canonical_account(labels[1]) == '매출채권'
+
+    # 조각 경계에 걸친 엔티티도 치환
+    chunks = [b'<TE>a&c', b'r;b&', b'cr;</TE>&']
+    assert b''.join(_replace_entities(chunks)) == b'<TE>a\nb\n</TE>&'
+
+def _first_table_levels(html_body):
+    """HTML 조각의 첫 테이블 행별 레벨"""
+    from dsd_breaker_extractor import extract_tables
+
+    html = f'<html><head><style>.indent1 {{ padding-left: 20px; }}</style></head><body>{html_body}</body></html>'
+    df = extract_tables(html, skip_layout=False)[0]
+    return list(df.attrs['levels'])
+
+
+def test_levels_from_css_nbsp_and_numbering():
+    """파싱 단계 레벨 감지: CSS 들여쓰기(style 속성/클래스 규칙), &nbsp;, 번호 체계"""
+    header = '<tr><th>과목</th><th>당기</th></tr>'
+
+    css = _first_table_levels(f'''<table>{header}
+        <tr><td>자산</td><td>300</td></tr>
+        <tr><td class="indent1">유동자산</td><td>300</td></tr>
+        <tr><td style="padding-left: 40px">현금</td><td>300</td></tr>
+        <tr><td><p style="text-indent: 2.5em">예금</p></td><td>300</td></tr></table>''')
+    assert css == [0, 1, 2, 2]
+
+    nbsp = _first_table_levels(f'''<table>{header}
+        <tr><td>자산</td><td>1</td></tr>
+        <tr><td>&nbsp;&nbsp;유동자산</td><td>1</td></tr>
+        <tr><td>&nbsp;&nbsp;&nbsp;&nbsp;현금</td><td>1</td></tr>
+        <tr><td>자산총계</td><td>1</td></tr></table>''')
+    assert nbsp == [0, 1, 2, 0]
+
+    numbered = _first_table_levels(f'''<table>{header}
+        <tr><td>자산</td><td>1</td></tr>
+        <tr><td>1. 유동자산</td><td>1</td></tr>
+        <tr><td>(1) 현금</td><td>1</td></tr>
+        <tr><td>가. 보통예금</td><td>1</td></tr>
+        <tr><td>(2) 매출채권</td><td>1</td></tr>
+        <tr><td>2. 비유동자산</td><td>1</td></tr>
+        <tr><td>자산총계</td><td>1</td></tr></table>''')
+    assert numbered == [0, 1, 2, 3, 2, 1, 0]
+
+
+def test_levels_from_sample_style_classes(tmp_path):
+    """샘플 감사보고서의 <style> 클래스 들여쓰기(.indent1/.indent2)가 레벨에 반영 (전체/스트리밍)"""
+    from dsd_breaker_extractor import extract_tables, iter_tables_from_file
+    from dsd_breaker_verify import table_levels
+
+    html = create_sample_dart_html()
+    balance_sheet = extract_tables(html)[0]
+    assert table_levels(balance_sheet).tolist()[:7] == [0, 1, 2, 2, 2, 2, 1]
+
+    path = tmp_path / 'sample.html'
+    path.write_text(html, encoding='utf-8')
+    streamed = next(iter(iter_tables_from_file(str(path))))
+    assert table_levels(streamed).tolist() == table_levels(balance_sheet).tolist()
+
+def test_cache_evict_removes_stale_temp(tmp_path):
+    """evict 시 중단된 저장이 남긴 오래된 임시 폴더만 삭제하고 저장 중인 폴더와 캐시 항목은 유지"""
+    import time
+    import pandas as pd
+    from dsd_breaker_cache import STALE_TEMP_SECONDS, open_table_cache
+
+    cache = open_table_cache(tmp_path / 'cache')
+    cache.store('entry', [pd.DataFrame({'과목': ['현금'], '금액': [100]})])
+
+    stale = cache.writer('stale')
+    stale.add(pd.DataFrame({'a': [1]}))
+    old = time.time() - STALE_TEMP_SECONDS - 60
+    os.utime(stale.temp_dir, (old, old))
+    active = cache.writer('active')
+
+    cache.evict()
+
+    assert not stale.temp_dir.exists()
+    assert active.temp_dir.exists()
+    assert len(list(cache.load('entry'))) == 1
+
+    active.commit()
+    assert cache.load('active') is not None
+
+def test_constant_memory_multi_sheet_roundtrip(tmp_path):
+    """constant_memory 워크북에서 시트마다 임시 파일을 닫아도 모든 시트가 그대로 저장됨"""
+    import pandas as pd
+    from openpyxl import load_workbook
+    from dsd_breaker_engine import ExcelBookWriter
+
+    tables = [pd.DataFrame({'과목': [f'계정{i}', f'계정{i}_2'], '당기': [i * 100, i * 100 + 1],
+                            '비고': ['가', None]})
+              for i in range(1, 41)]
+    output = tmp_path / 'tables.xlsx'
+    writer = ExcelBookWriter(output)
+    sheets, count = writer.write_file_tables('report.html', iter(tables), split_by_table=True)
+    writer.write_file_tables('other.html', tables[:3], split_by_table=False)
+    writer.close()
+
+    assert count == 40
+    book = load_workbook(output, read_only=True)
+    assert book.sheetnames[:40] == sheets
+    for i, name in enumerate(sheets, 1):
+        rows = list(book[name].iter_rows(values_only=True))
+        assert rows == [('과목', '당기', '비고'), (f'계정{i}', i * 100, '가'), (f'계정{i}_2', i * 100 + 1, None)]
+    combined = list(book[book.sheetnames[-1]].iter_rows(values_only=True))
+    assert combined[0] == ('과목', '당기', '비고')
+    assert len([row for row in combined if row and row[0] == '과목']) == 3
+    book.close()
+
+def _write_sample_files(directory):
+    """일괄 변환 테스트용 HTML 파일 두 개 (입력 순서: a_sample, b_simple)"""
+    directory.mkdir(parents=True, exist_ok=True)
+    first = directory / 'a_sample.html'
+    second = directory / 'b_simple.html'
+    first.write_text(create_sample_dart_html(), encoding='utf-8')
+    second.write_text(create_simple_html(), encoding='utf-8')
+    return [str(first), str(second)]
+
+def test_convert_batch_process_pool_order(tmp_path):
+    """작업자 2개로 병렬 파싱해도 시트 순서는 입력 파일 순서로 항상 같음"""
+    from openpyxl import load_workbook
+    from dsd_breaker_engine import ConversionOptions, convert_batch
+
+    html_files = _write_sample_files(tmp_path / 'in')
+    runs = []
+    for run in range(2):
+        output = tmp_path / f'out_{run}.xlsx'
+        summary = convert_batch(html_files, str(output), ConversionOptions(workers=2))
+        assert (summary['converted'], summary['failed'], summary['cancelled']) == (2, 0, False)
+        book = load_workbook(output, read_only=True)
+        assert book.sheetnames == summary['sheets']
+        book.close()
+        runs.append(summary['sheets'])
+
+    assert runs[0] == runs[1]
+    prefixes = [name.split('_Table')[0] for name in runs[0]]
+    first = [name for name in prefixes if name.startswith('a_sample')]
+    assert first and prefixes[:len(first)] == first
+    assert all(name.startswith('b_simple') for name in prefixes[len(first):])
+
+def test_convert_batch_cancel(tmp_path):
+    """첫 파일 기록 후 취소하면 남은 파일은 처리하지 않고 cancelled로 보고"""
+    import threading
+    from dsd_breaker_engine import ConversionOptions, convert_batch
+
+    html_files = _write_sample_files(tmp_path / 'in')
+    cancel = threading.Event()
+    events = []
+
+    def on_event(event):
+        events.append(event)
+        if event.kind == 'tables':
+            cancel.set()
+
+    summary = convert_batch(html_files, str(tmp_path / 'out.xlsx'), ConversionOptions(workers=2),
+                            on_event=on_event, cancel=cancel)
+
+    kinds = [event.kind for event in events]
+    assert summary['cancelled'] is True
+    assert summary['converted'] == 1
+    assert all(name.startswith('a_sample') for name in summary['sheets'])
+    assert 'cancelled' in kinds and 'done' not in kinds
+    assert [event.file_name for event in events if event.kind == 'file'] == ['a_sample.html']
+    assert (tmp_path / 'out.xlsx').is_file()
+
+def test_convert_api(tmp_path):
+    """convert(): 폴더 입력과 dict 옵션으로 Excel 변환 (GUI 없이)"""
+    import pytest
+    from openpyxl import load_workbook
+    from dsd_breaker_engine import convert
+
+    source_dir = tmp_path / 'in'
+    source_dir.mkdir()
+    (source_dir / 'simple.html').write_text(create_simple_html(), encoding='utf-8')
+    output = tmp_path / 'simple.xlsx'
+
+    summary = convert(source_dir, output, {'workers': 1, 'write_index': True})
+
+    assert (summary['converted'], summary['failed']) == (1, 0)
+    assert summary['outputs'] == [str(output)]
+    book = load_workbook(output, read_only=True)
+    assert book.sheetnames == summary['sheets'] and len(book.sheetnames) >= 1
+    book.close()
+    assert Path(summary['index']).is_file()
+
+    (tmp_path / 'empty').mkdir()
+    with pytest.raises(ValueError):
+        convert(tmp_path / 'empty', output)
+    with pytest.raises(ValueError):
+        convert(source_dir, output, {'unknown_option': True})
+
+def test_cli_main(tmp_path, capsys):
+    """dsd-convert 명령줄 종료 코드: 성공 0 (출력 파일 생성), 실패한 파일이 있으면 2, 변환할 파일이 없으면 1"""
+    from openpyxl import load_workbook
+    from dsd_breaker_cli import main
+
+    source = tmp_path / 'simple.html'
+    source.write_text(create_simple_html(), encoding='utf-8')
+    output = tmp_path / 'out.xlsx'
+
+    assert main([str(source), '-o', str(output), '-j', '1', '--single-sheet']) == 0
+    assert '변환 1개 / 실패 0개' in capsys.readouterr().out
+    book = load_workbook(output, read_only=True)
+    assert book.sheetnames == ['simple']
+    book.close()
+
+    assert main([str(source), str(tmp_path / 'missing.html'), '-o', str(tmp_path / 'partial.xlsx'),
+                 '-j', '1']) == 2
+    assert '변환 1개 / 실패 1개' in capsys.readouterr().out
+
+    (tmp_path / 'empty').mkdir()
+    assert main([str(tmp_path / 'empty'), '-o', str(tmp_path / 'none.xlsx'), '-q']) == 1
+    assert '변환 실패' in capsys.readouterr().err
+    assert not (tmp_path / 'none.xlsx').exists()
+
+def test_normalize_numbers_dart_notation():
+    """DART 금액 표기: (1,234)/△/▲ 음수, '-' = 0, 셀/캡션 단위(천원/백만원) 환산, 빈 셀 제외 변환 비율"""
+    import pandas as pd
+    from dsd_breaker_numbers import normalize_numbers
+
+    def table():
+        return pd.DataFrame({
+            '과목': ['현금', '대손충당금', '감가상각누계액', '기타', '합계'],
+            '당기': ['1,234', '(1,234)', '△500', '-', '2,000'],
+            '전기': ['▲ 12', '', '3 백만원', '—', '7천원'],
+            '비고': ['주석 3', '', '1', '', ''],
+        }, dtype=object)
+
+    df = normalize_numbers(table())
+    assert df['당기'].tolist() == [1234, -1234, -500, 0, 2000]
+    assert df['전기'].tolist()[0] == -12 and df['전기'].tolist()[2:] == [3, 0, 7]
+    assert pd.isna(df['전기'].iloc[1])
+    assert df['과목'].tolist()[0] == '현금'
+    # 빈 셀은 분모에서 제외: 비고는 숫자 1개 / 값 2개
+    assert df.attrs['parse_ratios'] == {'과목': 0.0, '당기': 1.0, '전기': 1.0, '비고': 0.5}
+    assert df['비고'].tolist()[0] == '주석 3'
+
+    scaled = normalize_numbers(table(), unit='천원', scale_units=True)
+    assert scaled['당기'].tolist() == [1_234_000, -1_234_000, -500_000, 0, 2_000_000]
+    # 셀에 적힌 단위가 캡션 단위보다 우선
+    assert scaled['전기'].tolist()[2:] == [3_000_000, 0, 7_000]
+    assert scaled.attrs['unit'] == '천원'
+
+def test_parse_ratio_warnings_in_log_and_index(tmp_path):
+    """일부 셀만 숫자로 읽은 열은 변환 로그 경고와 색인 메타데이터로 보고"""
+    import json
+    from dsd_breaker_engine import ConversionOptions, convert_batch
+
+    rows = ''.join(f'<tr><td>계정{i}</td><td>{i},000</td></tr>' for i in range(1, 9))
+    html = (f'<html><body><table><tr><th>과목</th><th>당기</th></tr>{rows}'
+            f'<tr><td>기타</td><td>해당없음</td></tr></table></body></html>')
+    source = tmp_path / 'partial.html'
+    source.write_text(html, encoding='utf-8')
+    events = []
+
+    summary = convert_batch([str(source)], str(tmp_path / 'out.xlsx'),
+                            ConversionOptions(workers=1, write_index=True), on_event=events.append)
+
+    warnings = [event.message for event in events if event.kind == 'warning']
+    assert any('Table1' in message and '당기 89%' in message for message in warnings)
+    with open(summary['index'], encoding='utf-8') as f:
+        record = json.load(f)['tables'][0]
+    assert record['parse_ratios'] == {'과목': 0.0, '당기': 0.8889}
+
+def test_html_source_encodings(tmp_path):
+    """인코딩 감지: BOM, meta charset, 앞부분이 ASCII뿐인 CP949 파일, meta 없는 UTF-8"""
+    import codecs
+    from dsd_breaker_io import open_html_source, read_html_text
+
+    body = '<table><tr><td>현금및현금성자산</td><td>1,000</td></tr></table>'
+    padding = '<!-- ' + 'x' * 9000 + ' -->'
+    cases = {
+        'bom.html': (codecs.BOM_UTF8 + f'<html><body>{body}</body></html>'.encode('utf-8'), 'utf-8-sig'),
+        'meta.html': (f'<html><head><meta charset="euc-kr"></head><body>{body}</body></html>'.encode('cp949'),
+                      'cp949'),
+        'late_cp949.html': (f'<html><body>{padding}{body}</body></html>'.encode('cp949'), 'cp949'),
+        'late_utf8.html': (f'<html><body>{padding}{body}</body></html>'.encode('utf-8'), 'utf-8'),
+    }
+    for name, (data, encoding) in cases.items():
+        path = tmp_path / name
+        path.write_bytes(data)
+        with open_html_source(path) as source:
+            assert source.encoding == encoding, name
+        assert '현금및현금성자산' in read_html_text(path), name
+
+def test_file_memory_is_per_file(tmp_path):
+    """파일별 메모리는 파일을 여는 시점 대비 증가분 (큰 파일 뒤의 작은 파일이 큰 파일 값을 물려받지 않음)"""
+    import pytest
+    from dsd_breaker_io import file_memory_mb, memory_baseline, open_html_source, reset_peak_rss
+
+    if not reset_peak_rss():
+        pytest.skip("최대 메모리 기록을 초기화할 수 없는 플랫폼")
+
+    baseline = memory_baseline()
+    block = bytearray(200 * 1024 * 1024)
+    block[::4096] = b'x' * len(block[::4096])
+    del block
+    assert file_memory_mb(baseline) >= 150
+
+    path = tmp_path / 'small.html'
+    path.write_text(create_simple_html(), encoding='utf-8')
+    with open_html_source(path) as source:
+        with source.measure() as stats:
+            source.text()
+    assert stats.file_memory_mb < 50
+    assert '파일 처리 메모리' in stats.describe()
+
+def test_manual_parse_fallback(tmp_path, monkeypatch):
+    """격자 변환에 실패한 테이블은 단순 행/열 파싱으로 대체하고 변환 로그에 경고"""
+    import pytest
+    import dsd_breaker_extractor
+    from dsd_breaker_engine import ConversionOptions, convert_batch
+    from dsd_breaker_extractor import extract_tables
+
+    build_grid = dsd_breaker_extractor.build_grid
+
+    def failing_build_grid(table, *args, **kwargs):
+        if table.get('id') == 'broken':
+            raise IndexError("span 계산 오류")
+        return build_grid(table, *args, **kwargs)
+
+    monkeypatch.setattr(dsd_breaker_extractor, 'build_grid', failing_build_grid)
+    html = '''<html><body>
+    <table><tr><th>과목</th><th>당기</th></tr><tr><td>현금</td><td>1,000</td></tr></table>
+    <table id="broken"><tr><th>과목</th><th>당기</th></tr><tr><td> 매출채권 </td><td>2,000</td></tr>
+    <tr><td>재고자산</td></tr></table>
+    </body></html>'''
+
+    with pytest.warns(RuntimeWarning, match='단순 행/열 파싱으로 대체'):
+        tables = extract_tables(html)
+    assert len(tables) == 2
+    fallback = tables[1]
+    assert fallback.columns.tolist() == ['과목', '당기']
+    assert fallback.values.tolist() == [['매출채권', '2,000'], ['재고자산', '']]
+
+    source = tmp_path / 'broken.html'
+    source.write_text(html, encoding='utf-8')
+    events = []
+    summary = convert_batch([str(source)], str(tmp_path / 'out.xlsx'), ConversionOptions(workers=1),
+                            on_event=events.append)
+    assert len(summary['sheets']) == 2
+    assert any(event.kind == 'warning' and 'IndexError' in event.message and '대체' in event.message
+               for event in events)
+
+def test_find_changed_files_and_retry(tmp_path):
+    """새 파일/수정된 파일은 다시 변환 대상, 변환에 실패한 기록은 파일이 그대로여도 재시도"""
+    import os
+    from dsd_breaker_watch import ManifestEntry, convert_incremental, find_changed_files, open_manifest
+
+    source = tmp_path / 'in' / 'k.html'
+    source.parent.mkdir()
+    source.write_text(create_simple_html(), encoding='utf-8')
+    path = str(source)
+    output_dir = tmp_path / 'out'
+    manifest = open_manifest(output_dir)
+
+    assert [item[0] for item in find_changed_files([path], manifest)] == [path]
+    summary = convert_incremental([path], output_dir, manifest=manifest)
+    assert summary['converted'] == 1
+    assert find_changed_files([path], manifest) == []
+
+    # 시각만 바뀐 파일은 해시가 같아 변환하지 않음
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert find_changed_files([path], manifest) == []
+
+    source.write_text(create_simple_html().replace('</body>', '<p>추가</p></body>'), encoding='utf-8')
+    assert [item[0] for item in find_changed_files([path], manifest)] == [path]
+    convert_incremental([path], output_dir, manifest=manifest)
+
+    entry = manifest.get(path)
+    manifest.update(ManifestEntry(entry.path, entry.size, entry.mtime_ns, entry.sha256, entry.output,
+                                  error='❌ 일시적인 오류'))
+    assert [item[0] for item in find_changed_files([path], manifest)] == [path]
+    assert convert_incremental([path], output_dir, manifest=manifest)['converted'] == 1
+    assert manifest.get(path).error == ''
+    assert find_changed_files([path], open_manifest(output_dir)) == []
+
+def test_watch_picks_up_modified_file(tmp_path):
+    """폴더 감시: 새 파일을 변환하고, 내용이 바뀌면 다시 변환"""
+    import threading
+    import time
+    from dsd_breaker_engine import ConversionOptions
+    from dsd_breaker_watch import watch
+
+    input_dir = tmp_path / 'in'
+    input_dir.mkdir()
+    output_dir = tmp_path / 'out'
+    source = input_dir / 'k.html'
+    source.write_text(create_simple_html(), encoding='utf-8')
+
+    stop = threading.Event()
+    converted = []
+    result = {}
+
+    def on_event(event):
+        if event.kind == 'sheet' and event.message.strip().startswith('💾'):
+            converted.append(event.file_name)
+
+    def wait_for(count):
+        deadline = time.time() + 20
+        while len(converted) < count and time.time() < deadline:
+            time.sleep(0.02)
+        return len(converted) >= count
+
+    thread = threading.Thread(target=lambda: result.update(
+        watch([str(input_dir)], str(output_dir), ConversionOptions(workers=1), on_event=on_event,
+              stop=stop, interval=0.05, settle_seconds=0)))
+    thread.start()
+    try:
+        assert wait_for(1)
+        source.write_text(create_simple_html().replace('</body>', '<p>수정</p></body>'), encoding='utf-8')
+        assert wait_for(2)
+        time.sleep(0.2)
+    finally:
+        stop.set()
+        thread.join(20)
+
+    assert converted == ['k.html', 'k.html']
+    assert result['converted'] == 2 and result['failed'] == 0
+    assert (output_dir / 'k.xlsx').is_file()
+
+def test_worksheet_release_fallback(tmp_path, monkeypatch):
+    """내부 API가 없는 xlsxwriter 버전처럼 시트를 닫지 않아도 같은 결과로 저장됨"""
+    import pandas as pd
+    from openpyxl import load_workbook
+    import dsd_breaker_engine
+    from dsd_breaker_engine import ExcelBookWriter
+
+    monkeypatch.setattr(dsd_breaker_engine, 'CAN_RELEASE_WORKSHEETS', False)
+    tables = [pd.DataFrame({'과목': [f'계정{i}'], '당기': [i]}) for i in range(1, 6)]
+    output = tmp_path / 'fallback.xlsx'
+    writer = ExcelBookWriter(output)
+    sheets, _ = writer.write_file_tables('report.html', tables, split_by_table=True)
+    writer.close()
+
+    book = load_workbook(output, read_only=True)
+    for i, name in enumerate(sheets, 1):
+        assert list(book[name].iter_rows(values_only=True)) == [('과목', '당기'), (f'계정{i}', i)]
+    book.close()
+
+def test_mixed_column_numpy_numbers(tmp_path):
+    """문자열과 numpy 숫자가 섞인 object 컬럼도 숫자 셀은 숫자로 기록"""
+    import numpy as np
+    import pandas as pd
+    from openpyxl import load_workbook
+    from dsd_breaker_engine import ExcelBookWriter, classify_columns
+
+    df = pd.DataFrame({'값': pd.Series(['-', np.int64(1200), np.float64(3.5), True], dtype=object)})
+    assert [kind for kind, _, _ in classify_columns(df)] == ['mixed']
+
+    output = tmp_path / 'mixed.xlsx'
+    writer = ExcelBookWriter(output)
+    sheets, _ = writer.write_file_tables('report.html', [df], split_by_table=True)
+    writer.close()
+
+    book = load_workbook(output, read_only=True)
+    assert list(book[sheets[0]].iter_rows(values_only=True)) == [('값',), ('-',), (1200,), (3.5,), ('True',)]
+    book.close()
+
+def _multi_table_html(count=12):
+    """스트리밍 테스트용: 레이아웃 중첩 표와 여러 재무 표가 있는 문서"""
+    tables = ['<table><tr><td>회사명</td><td><table><tr><td>과목</td><td>당기</td></tr>'
+              '<tr><td>자산</td><td>1,000</td></tr></table></td></tr></table>']
+    for i in range(1, count + 1):
+        tables.append(f'<p>주석 {i}</p><table><tr><th>과목</th><th>당기</th><th>전기</th></tr>'
+                      f'<tr><td>계정{i}</td><td>{i},000</td><td>({i})</td></tr>'
+                      f'<tr><td>&nbsp;&nbsp;세부{i}</td><td>{i}00</td><td>-</td></tr></table>')
+    return ('<html><head><style>.p2 { padding-left: 20pt; }</style></head><body>'
+            + ''.join(tables) + '</body></html>')
+
+def test_streaming_matches_full_parse(tmp_path, monkeypatch):
+    """스트리밍 파싱 결과가 문서 전체 파싱과 같고, 처리한 표는 트리에서 해제됨"""
+    import pandas as pd
+    import dsd_breaker_extractor
+    from dsd_breaker_extractor import extract_tables_from_file, iter_tables_from_file
+
+    html_file = tmp_path / 'multi.html'
+    html_file.write_text(_multi_table_html(), encoding='utf-8')
+    full, _ = extract_tables_from_file(str(html_file))
+
+    # 각 표를 처리할 때 트리에 남아 있는 앞선 표 (해제되지 않으면 계속 쌓임, 직전 표는 비운 채 남음)
+    preceding = []
+    filled = []
+    process_table = dsd_breaker_extractor.process_table
+
+    def counting_process_table(table, *args, **kwargs):
+        before = table.xpath('preceding::table')
+        preceding.append(len(before))
+        filled.append(sum(1 for element in before if len(element)))
+        return process_table(table, *args, **kwargs)
+
+    monkeypatch.setattr(dsd_breaker_extractor, 'process_table', counting_process_table)
+    streamed = list(iter_tables_from_file(str(html_file)))
+
+    assert len(streamed) == len(full) == 13
+    for expected, actual in zip(full, streamed):
+        pd.testing.assert_frame_equal(actual, expected)
+        assert actual.attrs.keys() == expected.attrs.keys()
+    assert len(preceding) == 14
+    assert max(preceding) <= 1
+    assert filled == [0] * 14
+
+def test_release_parsed_removes_previous_siblings():
+    """_release_parsed: 처리한 요소는 비우고 앞선 형제와 조상의 앞선 형제는 제거"""
+    import lxml.html
+    from dsd_breaker_extractor import _release_parsed
+
+    root = lxml.html.fromstring('<html><body><div><table id="a"></table><p>x</p>'
+                                '<table id="b"><tr><td>1</td></tr></table>tail</div>'
+                                '<table id="c"></table></body></html>')
+    div = root.find('body/div')
+    table = div.find('table[@id="b"]')
+    _release_parsed(table)
+
+    assert list(div) == [table]
+    assert len(table) == 0 and table.tail == 'tail'
+    assert [el.get('id') for el in root.iter('table')] == [None, 'c']
+
+@pytest.mark.parametrize('html, rows, header_depth', [
+    # rowspan은 아래 행의 같은 열을 채움
+    ('<tr><td rowspan="2">A</td><td>1</td></tr><tr><td>2</td></tr>', [['A', '1'], ['A', '2']], 0),
+    # rowspan과 colspan을 함께 쓴 셀은 사각형 영역 전체를 채움
+    ('<tr><td rowspan="2" colspan="2">A</td><td>1</td></tr><tr><td>2</td></tr>',
+     [['A', 'A', '1'], ['A', 'A', '2']], 0),
+    # 행 끝 뒤쪽의 rowspan 칸 앞 빈 칸은 ''
+    ('<tr><td>a</td><td>b</td><td rowspan="2">c</td></tr><tr><td>d</td></tr>',
+     [['a', 'b', 'c'], ['d', '', 'c']], 0),
+    # 겹치는 span: colspan 셀이 그 행의 rowspan 칸을 차지해도 아래 행은 계속 rowspan 셀이 차지
+    ('<tr><td>a</td><td rowspan="3">R</td><td>c</td></tr><tr><td colspan="2">X</td><td>y</td></tr>'
+     '<tr><td>p</td><td>q</td></tr>', [['a', 'R', 'c'], ['X', 'X', 'y'], ['p', 'R', 'q']], 0),
+    # 표 끝을 넘는 rowspan은 행을 만들지 않음
+    ('<tr><td rowspan="5">A</td><td>1</td></tr>', [['A', '1']], 0),
+    # rowspan은 thead 밖으로 넘어가지 않음
+    ('<thead><tr><td rowspan="3">H</td></tr></thead><tbody><tr><td>b</td><td>1</td></tr></tbody>',
+     [['H', ''], ['b', '1']], 1),
+    # thead가 없으면 상단의 th 전용 행이 헤더
+    ('<tr><th>과목</th><th>당기</th></tr><tr><th colspan="2">단위</th></tr><tr><td>자산</td><td>1</td></tr>',
+     [['과목', '당기'], ['단위', '단위'], ['자산', '1']], 2),
+    # 잘못된 span 값은 1로 처리
+    ('<tr><td colspan="0">a</td><td colspan="-2">b</td><td rowspan="x" colspan="2.5">c</td></tr>',
+     [['a', 'b', 'c']], 0),
+])
+def test_build_grid_spans(html, rows, header_depth):
+    """build_grid: rowspan/colspan 배치, 겹치는 span, 행 그룹 경계, 헤더 깊이"""
+    import lxml.html
+    from dsd_breaker_grid import build_grid
+
+    grid = build_grid(lxml.html.fromstring(f'<table>{html}</table>'))
+    assert grid.rows == rows
+    assert grid.header_depth == header_depth
+    assert grid.width == len(rows[0])
+
+@pytest.mark.parametrize('colspan, width', [('999', 1000), ('1000', 1001), ('5000', 1001), ('100000', 1001)])
+def test_build_grid_colspan_limit(colspan, width):
+    """build_grid: MAX_COLSPAN을 넘는 colspan은 잘라서 격자가 폭주하지 않음"""
+    import lxml.html
+    from dsd_breaker_grid import MAX_COLSPAN, build_grid
+
+    grid = build_grid(lxml.html.fromstring(
+        f'<table><tr><td>과목</td><td colspan="{colspan}">금액</td></tr><tr><td>자산</td></tr></table>'))
+    assert MAX_COLSPAN == 1000
+    assert grid.width == width
+    assert grid.rows[0][1:] == ['금액'] * (width - 1)
+    assert grid.rows[1] == ['자산'] + [''] * (width - 1)
+
+def test_place_rows_indents():
+    """_place_rows: 첫 열 들여쓰기는 rowspan으로 채운 행에도 이어짐"""
+    import lxml.html
+    from dsd_breaker_grid import _place_rows
+
+    table = lxml.html.fromstring('<table><tr><td rowspan="2" style="padding-left:20pt">A</td><td>1</td></tr>'
+                                 '<tr><td>2</td></tr><tr><td>B</td><td>3</td></tr></table>')
+    rows, indents = [], []
+    _place_rows(table.findall('.//tr'), rows, indents)
+    assert rows == [['A', '1'], ['A', '2'], ['B', '3']]
+    assert indents[0] == indents[1] > indents[2] == 0
+
+@pytest.mark.parametrize('header_rows, labels', [
+    ([['과목', '당기', '전기']], ['과목', '당기', '전기']),
+    # 다단 헤더는 위에서 아래로 합침, rowspan/colspan으로 반복된 텍스트는 한 번만
+    ([['과목', '당기', '당기', '전기', '전기'], ['과목', '금액', '비율', '금액', '비율']],
+     ['과목', '당기 금액', '당기 비율', '전기 금액', '전기 비율']),
+    ([['구분', '제10기', '제10기'], ['', '3개월', '누적'], ['', '금액', '금액']],
+     ['구분', '제10기 3개월 금액', '제10기 누적 금액']),
+    # 빈 라벨은 pandas와 같은 'Unnamed: n', 중복 라벨은 .1, .2 접미사
+    ([['', '금액', '금액', '금액']], ['Unnamed: 0', '금액', '금액.1', '금액.2']),
+    ([['과목', ''], ['', '']], ['과목', 'Unnamed: 1']),
+])
+def test_flatten_header(header_rows, labels):
+    """flatten_header: 다단 헤더를 열별 단일 라벨로 합침"""
+    from dsd_breaker_grid import flatten_header
+
+    assert flatten_header(header_rows, len(labels)) == labels
+
+def _grid(rows, header_depth=0):
+    """분류 테스트용 격자"""
+    from dsd_breaker_grid import TableGrid
+    return TableGrid(rows, header_depth, [0] * len(rows), max((len(row) for row in rows), default=0))
+
+@pytest.mark.parametrize('rows, header_depth, context, expected', [
+    # 대표 계정으로 판별
+    ([['과목', '당기', '전기'], ['유동자산', '1,000', '900'], ['자산총계', '3,000', '2,800'],
+      ['부채총계', '1,000', '1,100'], ['자본총계', '2,000', '1,700']], 1, '', 'BS'),
+    ([['과목', '당기'], ['매출액', '5,000'], ['매출원가', '(3,000)'], ['영업이익', '800'],
+      ['당기순이익', '600']], 1, '', 'IS'),
+    ([['과목', '당기'], ['영업활동 현금흐름', '1,200'], ['투자활동 현금흐름', '(400)'],
+      ['재무활동 현금흐름', '(100)']], 1, '', 'CF'),
+    # 표 제목 키워드는 계정 키워드보다 강함
+    ([['과목', '당기'], ['현금', '1,000'], ['합계', '1,000']], 0, '재 무 상 태 표 재무상태표', 'BS'),
+    ([['과목', '당기'], ['수수료', '100'], ['합계', '100']], 0, '포괄손익계산서', 'IS'),
+    # 숫자 표지만 재무제표 키워드가 없으면 주석
+    ([['구분', '취득원가', '감가상각누계액'], ['건물', '1,000', '(200)'], ['기계장치', '500', '(100)']],
+     1, '', 'notes'),
+    # 숫자가 거의 없는 문장형 표는 주석, 표지/서명 항목이 있으면 레이아웃
+    ([['회사의 개요', '회사는 1990년 설립되었습니다.'], ['주요 영업', '전자부품 제조']], 0, '', 'notes'),
+    ([['대표이사', '홍길동'], ['본점소재지', '서울특별시'], ['전화번호', '02-000-0000']], 0, '', 'layout'),
+    ([['삼일회계법인', ''], ['대표이사 김감사', '']], 0, '', 'layout'),
+    # 단일 열 표도 여러 행이면 주석으로 남기고, 한 행이거나 서명 블록이면 레이아웃
+    ([['1. 일반사항'], ['회사는 전자부품을 제조합니다.'], ['2. 회계정책']], 0, '', 'notes'),
+    ([['(단위: 원)']], 0, '', 'layout'),
+    ([['감사인'], ['삼일회계법인'], ['대표이사 김감사']], 0, '', 'layout'),
+    # 내용이 없는 표
+    ([['', ''], ['', '']], 0, '', 'layout'),
+])
+def test_classify_grid(rows, header_depth, context, expected):
+    """classify_grid: BS/IS/CF/주석 판별과 레이아웃 키워드"""
+    from dsd_breaker_classify import classify_grid
+
+    table_class = classify_grid(_grid(rows, header_depth), context)
+    assert table_class.statement_type == expected
+    assert table_class.is_layout == (expected == 'layout')
+
+def test_single_column_tables_kept_and_skips_reported(tmp_path):
+    """단일 열 주석 표는 추출하고, 제외한 레이아웃 표는 수를 기록해 로그에 표시"""
+    from dsd_breaker_extractor import extract_tables_from_file
+
+    html_file = tmp_path / 'single.html'
+    html_file.write_text(
+        '<html><body>'
+        '<table><tr><td>대표이사</td><td>홍길동</td></tr><tr><td>본점소재지</td><td>서울</td></tr></table>'
+        '<table><tr><td>1. 일반사항</td></tr><tr><td>회사는 전자부품을 제조합니다.</td></tr></table>'
+        '<table><tr><td>(단위: 원)</td></tr></table>'
+        '</body></html>', encoding='utf-8')
+
+    tables, stats = extract_tables_from_file(str(html_file))
+    assert len(tables) == 1
+    assert tables[0].iloc[:, 0].tolist() == ['1. 일반사항', '회사는 전자부품을 제조합니다.']
+    assert tables[0].attrs['statement_type'] == 'notes'
+    assert stats.skipped_layout == 2
+    assert '레이아웃 표 2개 제외' in stats.describe()
+
+    kept, stats = extract_tables_from_file(str(html_file), skip_layout=False)
+    assert len(kept) == 3 and stats.skipped_layout == 0
+
+class _OutputViewer:
+    """Tk 없이 출력 열기 메서드를 호출하기 위한 대역"""
+
+    def __init__(self, output_path):
+        self.output_path = str(output_path)
+        self.logs = []
+
+    def log_message(self, message):
+        self.logs.append(message)
+
+    def open_output_folder(self):
+        from dsd_breaker_converter import DSDHTMLToExcelConverter
+        DSDHTMLToExcelConverter.open_output_folder(self)
+
+
+def _opened_paths(monkeypatch, viewer, method):
+    """출력 열기 메서드가 운영체제 명령으로 연 경로"""
+    import subprocess
+    from dsd_breaker_converter import DSDHTMLToExcelConverter
+
+    opened = []
+    monkeypatch.setattr(subprocess, 'run', lambda command, **kwargs: opened.append(command[-1]))
+    getattr(DSDHTMLToExcelConverter, method)(viewer)
+    return opened
+
+def test_open_output_per_file_folder(tmp_path, monkeypatch):
+    """파일별 변환은 출력 경로가 폴더이므로 그 폴더를 그대로 엶 (상위 폴더가 아님)"""
+    from dsd_breaker_converter import output_folder
+    from dsd_breaker_engine import convert
+
+    output_dir = tmp_path / 'out'
+    summary = convert(_write_sample_files(tmp_path / 'in'), output_dir, {'workers': 1, 'per_file': True})
+    assert len(summary['outputs']) == 2
+    assert output_folder(str(output_dir)) == str(output_dir)
+
+    viewer = _OutputViewer(output_dir)
+    assert _opened_paths(monkeypatch, viewer, 'open_output_folder') == [str(output_dir)]
+    assert _opened_paths(monkeypatch, viewer, 'open_output_file') == [str(output_dir)]
+
+    workbook = tmp_path / 'merged.xlsx'
+    convert(_write_sample_files(tmp_path / 'in'), workbook, {'workers': 1})
+    viewer = _OutputViewer(workbook)
+    assert output_folder(str(workbook)) == str(tmp_path)
+    assert _opened_paths(monkeypatch, viewer, 'open_output_folder') == [str(tmp_path)]
+    assert _opened_paths(monkeypatch, viewer, 'open_output_file') == [str(workbook)]
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_table_file_metadata_roundtrip(tmp_path, fmt):
+    """Parquet/Arrow 파일의 스키마 메타데이터가 df.attrs로 그대로 복원됨"""
+    pytest.importorskip('pyarrow')
+    import pandas as pd
+    from dsd_breaker_export import TableFileWriter, read_table_file
+
+    df = pd.DataFrame({'과목': ['자산', '부채'], '당기': [1000.0, None], '비고': ['-', 12]})
+    df.attrs.update({'statement_type': 'BS', 'unit': 1000, 'header_depth': 2,
+                     'header_rows': (('과목', '당기', '비고'), ('', '금액', '')),
+                     'parse_ratios': {'당기': 1.0, '비고': 0.5}})
+
+    writer = TableFileWriter(tmp_path / fmt, fmt)
+    names, count = writer.write_file_tables('report.html', [df], source='in/report.html')
+    writer.close()
+    assert count == 1 and names == [f'report_Table1_BS.{fmt}']
+
+    loaded = read_table_file(writer.paths[0])
+    assert list(loaded.columns) == ['과목', '당기', '비고']
+    assert loaded['과목'].tolist() == ['자산', '부채']
+    assert loaded['당기'].iloc[0] == 1000.0 and pd.isna(loaded['당기'].iloc[1])
+    assert loaded['비고'].tolist() == ['-', '12']
+    assert loaded.attrs == {
+        'source': 'in/report.html', 'table': 1, 'statement_type': 'BS', 'unit': 1000,
+        'header_depth': 2, 'header_rows': [['과목', '당기', '비고'], ['', '금액', '']],
+        'columns': ['과목', '당기', '비고'], 'parse_ratios': {'당기': 1.0, '비고': 0.5},
+    }
+    record = writer.records[0]
+    assert record['file'] == writer.paths[0] and record['format'] == fmt and record['rows'] == 2
+
+def test_open_output_columnar_folder(tmp_path, monkeypatch):
+    """열 형식 변환도 출력 경로가 폴더이므로 그 폴더를 엶"""
+    from dsd_breaker_converter import output_folder
+    from dsd_breaker_engine import convert
+
+    output_dir = tmp_path / 'csv'
+    summary = convert(_write_sample_files(tmp_path / 'in'), output_dir, {'workers': 1, 'output_format': 'csv'})
+    assert summary['outputs'] and all(path.endswith('.csv.gz') for path in summary['outputs'])
+    assert output_folder(str(output_dir)) == str(output_dir)
+
+    viewer = _OutputViewer(output_dir)
+    assert _opened_paths(monkeypatch, viewer, 'open_output_folder') == [str(output_dir)]
+    assert _opened_paths(monkeypatch, viewer, 'open_output_file') == [str(output_dir)]
+
+def test_levels_attr_is_plain_tuple():
+    """df.attrs['levels']는 정수 튜플: 복사/피클/concat에서 그대로 유지되고 table_levels는 int8 배열 반환"""
+    import pickle
+    import numpy as np
+    import pandas as pd
+    from dsd_breaker_extractor import extract_tables
+    from dsd_breaker_verify import table_levels
+
+    df = extract_tables('<table><tr><th>과목</th><th>당기</th></tr>'
+                        '<tr><td>자산</td><td>3</td></tr>'
+                        '<tr><td>&nbsp;&nbsp;현금</td><td>1</td></tr>'
+                        '<tr><td>&nbsp;&nbsp;재고</td><td>2</td></tr></table>')[0]
+    levels = df.attrs['levels']
+    assert isinstance(levels, tuple) and levels == (0, 1, 1)
+    assert all(type(level) is int for level in levels)
+
+    assert df.copy().attrs['levels'] == levels
+    assert pickle.loads(pickle.dumps(df)).attrs['levels'] == levels
+    assert pd.concat([df, df.copy()]).attrs['levels'] == levels
+
+    array = table_levels(df)
+    assert array.dtype == np.int8 and array.tolist() == [0, 1, 1]
+
+def test_stage_clock_and_parse_stage(monkeypatch):
+    """StageClock은 직전 lap 이후 시간을 단계별로 누적하고, 나머지 파싱 시간은 parse 단계로 기록"""
+    from types import SimpleNamespace
+    import dsd_breaker_profile
+    from dsd_breaker_io import SourceStats
+    from dsd_breaker_profile import StageClock, add_stage, finish_parse_stage
+
+    ticks = iter([10.0, 10.5, 10.75, 11.5, 12.0, 13.0])
+    monkeypatch.setattr(dsd_breaker_profile, 'time', SimpleNamespace(perf_counter=lambda: next(ticks)))
+
+    stats = SourceStats('a.html')
+    clock = StageClock(stats)
+    clock.lap('grid')
+    clock.lap('classify')
+    clock.lap('grid')
+    clock.lap('numbers')
+    assert stats.stages == {'grid': 1.25, 'classify': 0.25, 'numbers': 0.5}
+
+    # stats가 없으면 기록하지 않음
+    StageClock(None).lap('grid')
+
+    add_stage(stats, 'cache', 0.5)
+    stats.parse_seconds = 4.0
+    finish_parse_stage(stats)
+    assert stats.stages['parse'] == 1.5
+
+    stats.parse_seconds = 1.0
+    finish_parse_stage(stats)
+    assert stats.stages['parse'] == 0.0
+
+def test_run_report_aggregates_stages(tmp_path):
+    """run_report: 파일별 단계 시간 합계, 처리량, 파일별 최대 메모리 증가분"""
+    from dsd_breaker_profile import REPORT_VERSION, STAGES, describe_report, load_report, run_report, save_report
+
+    mb = 1024 * 1024
+    file_stats = [
+        {'bytes': 3 * mb, 'tables': 10, 'cells': 400, 'file_memory_mb': 12.0, 'cached': False,
+         'stages': {'read': 0.25, 'parse': 1.0, 'grid': 0.5, 'numbers': 0.25}},
+        {'bytes': mb, 'tables': 2, 'cells': 50, 'file_memory_mb': 30.0, 'cached': True,
+         'stages': {'cache': 0.5, 'write': 0.5}},
+    ]
+    report = run_report(file_stats, 2.0)
+
+    assert report['version'] == REPORT_VERSION
+    assert list(report['stages'])[:len(STAGES)] == list(STAGES)
+    assert report['stages'] == {'read': 0.25, 'parse': 1.0, 'grid': 0.5, 'classify': 0.0, 'dataframe': 0.0,
+                                'numbers': 0.25, 'write': 0.5, 'cache': 0.5}
+    assert (report['files'], report['cached_files'], report['tables'], report['cells']) == (2, 1, 12, 450)
+    assert report['mb_per_second'] == 2.0 and report['tables_per_second'] == 6.0
+    assert report['max_file_memory_mb'] == 30.0
+    assert report['per_file'] is file_stats
+
+    text = describe_report(report)
+    assert '4.0MB' in text and 'parse 1.00초 (33%)' in text and 'classify' not in text
+
+    path = tmp_path / 'report.json'
+    save_report(report, path)
+    assert load_report(path) == report
+
+    empty = run_report([], 0.0)
+    assert empty['mb_per_second'] == 0.0 and empty['max_file_memory_mb'] == 0.0
+
+def test_conversion_report_stage_timings(tmp_path):
+    """실제 변환의 단계별 시간: 테이블 단계가 기록되고 합이 파일별 파싱 시간과 맞음"""
+    import json
+    from dsd_breaker_engine import convert
+    from dsd_breaker_profile import TABLE_STAGES
+
+    report_file = tmp_path / 'report.json'
+    summary = convert(_write_sample_files(tmp_path / 'in'), tmp_path / 'out.xlsx',
+                      {'workers': 1, 'report_file': str(report_file)})
+    report = json.loads(report_file.read_text(encoding='utf-8'))
+    assert report == json.loads(json.dumps(summary['profile']))
+
+    for stats in report['per_file']:
+        stages = stats['stages']
+        assert all(stages.get(stage, 0.0) > 0 for stage in ('grid', 'classify', 'dataframe', 'write'))
+        # 파싱 시간 = lxml 파싱 + 테이블 단계 (+ 캐시 저장)
+        parsed = stages['parse'] + sum(stages.get(stage, 0.0) for stage in TABLE_STAGES + ('cache',))
+        assert abs(parsed - stats['parse_seconds']) < 1e-6
+
+    totals = report['stages']
+    for stage in totals:
+        assert abs(totals[stage] - sum(stats['stages'].get(stage, 0.0) for stats in report['per_file'])) < 1e-9
+    assert report['tables'] == sum(stats['tables'] for stats in report['per_file']) > 0
+
+def test_profiled_writes_cprofile(tmp_path):
+    """profiled: 경로가 없으면 측정하지 않고, .prof는 pstats로 읽을 수 있는 cProfile 결과"""
+    import pstats
+    from dsd_breaker_profile import HAS_PYINSTRUMENT, profiled
+
+    with profiled(None):
+        pass
+
+    path = tmp_path / 'run.prof'
+    with profiled(str(path)):
+        sum(range(1000))
+    assert pstats.Stats(str(path)).total_calls > 0
+
+    if not HAS_PYINSTRUMENT:
+        with pytest.raises(ImportError):
+            with profiled(str(tmp_path / 'run.html')):
+                pass
+
+class _FakeTkRoot:
+    """Tk 없이 after 예약을 모아 두었다가 테스트에서 직접 실행"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append((ms, callback))
+
+    def run_pending(self):
+        """예약된 콜백을 예약 순서대로 실행 (실행 중 새로 예약된 콜백 포함)"""
+        count = 0
+        while self.scheduled:
+            _, callback = self.scheduled.pop(0)
+            callback()
+            count += 1
+        return count
+
+
+class _FakeWidget:
+    """Tk 위젯/변수 대역 (마지막 값과 입력 텍스트만 기록)"""
+
+    def __init__(self):
+        self.value = None
+        self.text = ''
+        self.inserts = 0
+        self.state = None
+
+    def set(self, value):
+        self.value = value
+
+    def insert(self, index, text):
+        self.text += text
+        self.inserts += 1
+
+    def see(self, index):
+        pass
+
+    def config(self, state=None):
+        self.state = state
+
+
+def _headless_converter(monkeypatch):
+    """setup_ui 없이 작업 스레드/이벤트 큐/로그 메서드만 쓰는 변환기 인스턴스"""
+    import queue
+    import threading
+    import dsd_breaker_converter
+    from dsd_breaker_converter import DSDHTMLToExcelConverter
+
+    dialogs = []
+    monkeypatch.setattr(dsd_breaker_converter.messagebox, 'askyesno',
+                        lambda title, message: dialogs.append((title, message)) and False)
+    monkeypatch.setattr(dsd_breaker_converter.messagebox, 'showinfo',
+                        lambda title, message: dialogs.append((title, message)))
+    monkeypatch.setattr(dsd_breaker_converter.messagebox, 'showerror',
+                        lambda title, message: dialogs.append((title, message)))
+
+    app = DSDHTMLToExcelConverter.__new__(DSDHTMLToExcelConverter)
+    app.root = _FakeTkRoot()
+    app.event_queue = queue.Queue()
+    app.cancel_event = threading.Event()
+    app.worker = None
+    app.close_requested = False
+    app.log_buffer = []
+    app.log_flush_pending = False
+    app.progress_var = _FakeWidget()
+    app.log_text = _FakeWidget()
+    app.convert_button = _FakeWidget()
+    app.cancel_button = _FakeWidget()
+    app.dialogs = dialogs
+    return app
+
+def _run_headless(app, html_files, output_file, options):
+    """convert_to_excel과 같은 순서로 작업 스레드를 시작하고 UI 타이머 콜백을 모두 실행"""
+    import threading
+
+    app.set_converting(True)
+    app.worker = threading.Thread(target=app.run_conversion, args=(html_files, output_file, options),
+                                  daemon=True)
+    app.worker.start()
+    app.root.after(100, app.poll_events)
+    app.worker.join(30)
+    assert not app.worker.is_alive()
+    return app.root.run_pending()
+
+def test_converter_worker_event_flow(tmp_path, monkeypatch):
+    """작업 스레드 → 이벤트 큐 → poll_events → 로그 모아 쓰기 → 종료 처리 (Tk 없이)"""
+    from dsd_breaker_engine import ConversionOptions, ProgressEvent
+
+    app = _headless_converter(monkeypatch)
+    output = tmp_path / 'out.xlsx'
+    _run_headless(app, _write_sample_files(tmp_path / 'in'), str(output), ConversionOptions(workers=1))
+
+    assert output.is_file()
+    assert app.event_queue.empty()
+    assert app.progress_var.value == 100
+    assert app.convert_button.state == 'normal' and app.cancel_button.state == 'disabled'
+
+    log = app.log_text.text
+    assert log.index('a_sample.html') < log.index('b_simple.html') < log.index('📂 저장 위치')
+    assert '변환 2개 / 실패 0개 파일' in log
+    # 'file'/'done' 이벤트는 시각 다음 줄에 표시하여 파일마다 구분
+    assert '] \n📄 처리 중: a_sample.html' in log
+    assert not app.log_buffer and not app.log_flush_pending
+    # 로그는 한 번에 모아서 추가 (이벤트마다 위젯 갱신하지 않음)
+    assert app.log_text.inserts < log.count('\n[') // 2
+    assert app.dialogs == [('변환 완료', app.dialogs[0][1])] and 'out.xlsx' in app.dialogs[0][1]
+
+    # 이벤트를 직접 넣어도 같은 경로로 처리되고, 종료 항목이 올 때까지 다시 예약
+    app.event_queue.put(ProgressEvent('warning', '  ⚠️ 경고', 42))
+    app.poll_events()
+    assert app.progress_var.value == 42
+    assert [callback for _, callback in app.root.scheduled] == [app.flush_log, app.poll_events]
+    app.root.scheduled.clear()
+    app.flush_log()
+    assert app.log_text.text.endswith('⚠️ 경고\n')
+
+def test_converter_worker_cancel_and_error(tmp_path, monkeypatch):
+    """취소 요청은 처리한 파일까지 저장 후 취소 안내, 변환 예외는 오류 대화상자로 전달"""
+    from dsd_breaker_engine import ConversionOptions
+
+    app = _headless_converter(monkeypatch)
+    app.cancel_event.set()
+    _run_headless(app, _write_sample_files(tmp_path / 'in'), str(tmp_path / 'out.xlsx'),
+                  ConversionOptions(workers=1))
+    assert [title for title, _ in app.dialogs] == ['변환 취소']
+    assert '⏹️ 변환 취소: 0/2개 파일 처리됨' in app.log_text.text
+
+    app = _headless_converter(monkeypatch)
+    _run_headless(app, [str(tmp_path / 'missing.html')], str(tmp_path / 'bad.xlsx'),
+                  ConversionOptions(workers=1, output_format='unknown'))
+    assert [title for title, _ in app.dialogs] == ['오류']
+    assert '❌ 변환 실패' in app.log_text.text
+    assert app.convert_button.state == 'normal'
+
 def main():
     """메인 테스트 함수"""
     